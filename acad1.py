@@ -5,8 +5,35 @@ import seaborn as sns
 import networkx as nx
 from PIL import Image
 import numpy as np
+import os
 import base64
 from io import BytesIO
+from title_classifier import classify_title, score_title, rank_titles
+from reviewer_triage import triage_reports, plot_triage_matrix, QUADRANTS
+from response_letter import comment_keys, build_letter_blocks, render_letter, LETTER_FORMATS
+from journal_rules import JOURNAL_RULES, GENERAL_GUIDANCE, journal_rule, check_manuscript, split_items
+from regression import fit_ols, results_table, coefficient_table, plot_coefficients, COV_TYPES, SOLVERS
+from collinearity import vif_table, problem_columns, CONDITION_NUMBER_LIMIT
+from multiverse import run_multiverse, control_sets, enumerate_specifications, plot_specification_curve
+from out_of_core import fit_ols_file, file_columns
+from fixed_effects import fit_absorbed, absorption_table, factorize as factorize_fixed_effects
+from bootstrap import bootstrap, bootstrap_table, plot_bootstrap_distribution, BOOTSTRAP_METHODS, WEIGHT_TYPES
+from summary_statistics import summarize, summary_table, panel_table, to_latex, ALL_OBSERVATIONS
+from dataset_cache import WORKED_EXAMPLES, example_data, example_outcome, load as load_dataset
+from ovb import ovb_decomposition, oster_bounds, oster_delta, plot_decomposition, plot_oster_bounds, OSTER_R_MAX_MULTIPLIER
+from power import mde, power, required_clusters, render_surface, simulate_power, GRID_PARAMETERS, PARAMETER_LABELS, \
+	MAX_SIMULATED_UNITS
+from event_study import event_study, event_study_table, plot_event_study, pretrend_test, ESTIMATORS, ESTIMATOR_LABELS
+from submission_cascade import simulate_cascade, cascade_table, time_quantiles, plot_cascade, JOURNAL_PROFILES, JOURNAL_TIERS, DEFAULT_TIMING
+from submission_strategy import optimize_ladder, TIER_WEIGHTS, DEFAULT_DISCOUNT
+from journal_db import search as search_journals, database_tiers, JEL_LETTERS
+from journal_fit import recommend, default_profiles, profiles_from_csv, DEFAULT_TEXT_WEIGHT
+from trend_cube import load_cube, trend_summary, yearly_points, plot_trends, plot_area_series, LEVELS
+from idea_ranking import rank_ideas, render_radar, radar_rows, save_ideas, load_ideas, EXAMPLE_IDEAS, IDEA_CRITERIA
+from workspace import get as get_value, put as put_value, new_workspace_name
+from checklists import CHECKLISTS, TOTAL_ITEMS, item_key, load_progress, set_item, progress_table, overall_completion, plot_progress
+from research_planner import chain_tasks, schedule, critical_path, render_gantt, gantt_rows, gantt_bands, forecast, plot_completion, save_project, load_project, list_projects, \
+	INTERACTIVE_DRAWS
 
 # Set page configuration
 st.set_page_config(
@@ -97,6 +124,23 @@ pages = [
 ]
 selected_page = st.sidebar.radio("Go to", pages)
 
+# Each session starts in its own workspace; its name is kept in the page
+# address, so a refresh (or a bookmark) returns to the same work
+if "session_workspace" not in st.session_state:
+	st.session_state["session_workspace"] = st.query_params.get("workspace") or new_workspace_name()
+	st.session_state["workspace_name"] = st.session_state["session_workspace"]
+workspace_name = st.sidebar.text_input("Workspace:", key="workspace_name",
+									   help="Drafts, idea lists, checklists and plans are saved under this name. "
+											"Bookmark the page, or note the name, to come back to them.") \
+	.strip() or st.session_state["session_workspace"]
+if st.query_params.get("workspace") != workspace_name:
+	st.query_params["workspace"] = workspace_name
+if st.session_state.get("active_workspace") != workspace_name:
+	# Drop the previous workspace's drafts so they are read again
+	for draft_key in st.session_state.get("draft_keys", []):
+		st.session_state.pop(draft_key, None)
+	st.session_state["active_workspace"] = workspace_name
+
 
 # Function to generate a download link for a dataframe
 def get_table_download_link(df, filename, text):
@@ -106,6 +150,50 @@ def get_table_download_link(df, filename, text):
 	return href
 
 
+# Helper function to keep a text widget's value in the workspace: loads the
+# saved draft into the widget's state and returns the key to pass to it
+def workspace_draft(key, default=""):
+	draft_keys = st.session_state.setdefault("draft_keys", set())
+	draft_keys.add(key)
+	if key not in st.session_state:
+		st.session_state[key] = get_value(workspace_name, 'draft', key, default)
+	return key
+
+
+# Helper function to save a draft widget's value (an on_change callback)
+def save_draft(key):
+	put_value(workspace_name, 'draft', key, st.session_state[key])
+
+
+# Helper function to return the workspace's checklist progress, read once
+# per workspace and then updated in place as boxes are ticked
+def checklist_progress():
+	if st.session_state.get("checklists_loaded_for") != workspace_name:
+		# Drop the previous workspace's checkbox states so they are read again
+		for check_key in [key for key in st.session_state if str(key).startswith("check_")]:
+			st.session_state.pop(check_key)
+		st.session_state["checklist_progress"] = load_progress(workspace_name)
+		st.session_state["checklists_loaded_for"] = workspace_name
+	return st.session_state["checklist_progress"]
+
+
+# Helper function to save one checklist item (an on_change callback)
+def save_checklist_item(name, index):
+	set_item(checklist_progress(), workspace_name, name, index, st.session_state[f"check_{item_key(name, index)}"])
+
+
+# Helper function to show a checklist as checkboxes saved in the workspace
+def render_checklist(name):
+	progress = checklist_progress()
+	checklist = CHECKLISTS[name]
+	for index, item in enumerate(checklist.items):
+		key = item_key(name, index)
+		st.checkbox(item, value=key in progress.checked, key=f"check_{key}", on_change=save_checklist_item,
+					args=(name, index))
+	done = progress.counts[name]
+	st.progress(done / len(checklist.items), text=f"{done} of {len(checklist.items)} items done")
+
+
 # Helper function to create two columns with different widths
 def create_columns(left_width=2, right_width=1):
 	return st.columns([left_width, right_width])
@@ -119,28 +207,24 @@ def generate_placeholder_image(width, height, text, bg_color="#f0f0f0", text_col
 
 # For all pages - top journals info in sidebar
 with st.sidebar.expander("Top Economics Journals"):
-	top_journals = pd.DataFrame({
-		'Journal': [
-			'American Economic Review',
-			'Quarterly Journal of Economics',
-			'Journal of Political Economy',
-			'Econometrica',
-			'Review of Economic Studies',
-			'Journal of Economic Literature',
-			'Journal of Finance',
-			'Journal of Monetary Economics',
-			'Journal of Development Economics',
-			'Journal of Economic Perspectives'
-		],
-		'Impact Factor (2024)': [
-			5.24, 8.41, 6.34, 4.87, 5.12,
-			7.32, 6.28, 3.89, 3.45, 5.76
-		]
-	})
+	journal_query = st.text_input("Search journals:", "", key="journal_search",
+								  help="Type part of a name; misspellings are matched too")
+	journal_search_tiers = st.multiselect("Tiers:", database_tiers(), key="journal_search_tiers")
+	journal_field = st.selectbox("JEL area:", ["All"] + list(JEL_LETTERS), key="journal_search_jel")
+	top_journals = search_journals(journal_query, tiers=tuple(journal_search_tiers),
+								   jel=None if journal_field == "All" else journal_field,
+								   limit=50 if journal_query or journal_search_tiers or journal_field != "All" else 10)
 	st.dataframe(top_journals, use_container_width=True)
 	st.markdown(get_table_download_link(top_journals, "top_economics_journals.csv", "Download Journal List"),
 				unsafe_allow_html=True)
 
+# For all pages - checklist completion across chapters
+with st.sidebar.expander("Your Checklist Progress"):
+	sidebar_progress = checklist_progress()
+	st.progress(overall_completion(sidebar_progress),
+				text=f"{sum(sidebar_progress.counts.values())} of {TOTAL_ITEMS} items done")
+	st.dataframe(progress_table(sidebar_progress)[['Checklist', 'Done', 'Items']], use_container_width=True)
+
 # Introduction page
 if selected_page == "Introduction":
 	st.markdown("<div class='sub-header'>Welcome to the Complete Guide to Academic Writing in Economics</div>",
@@ -213,6 +297,20 @@ if selected_page == "Introduction":
     Let's begin the journey of creating impactful economics research papers!
     """)
 
+	st.markdown("<div class='section-header'>Your Progress Across Chapters</div>", unsafe_allow_html=True)
+	dashboard = progress_table(checklist_progress())
+	col1, col2, col3 = st.columns(3)
+	col1.metric("Items Done", f"{dashboard['Done'].sum()} of {TOTAL_ITEMS}")
+	col2.metric("Overall Completion", f"{100 * overall_completion(checklist_progress()):.0f}%")
+	col3.metric("Checklists Complete", f"{(dashboard['Done'] == dashboard['Items']).sum()} of {len(dashboard)}")
+	fig = plot_progress(dashboard)
+	st.pyplot(fig)
+	st.dataframe(dashboard.style.format({'Completion (%)': '{:.0f}'}), use_container_width=True)
+	st.download_button("📥 Download Progress", dashboard.to_csv(index=False), "checklist_progress.csv")
+	st.markdown(
+		f"<div class='tip'>💡 **Tip**: Tick the checklist items at the end of each chapter as you go. They are saved in workspace '{workspace_name}', so your progress is kept between visits.</div>",
+		unsafe_allow_html=True)
+
 # Page 1: Finding Research Ideas
 elif selected_page == "1. Finding Research Ideas":
 	st.markdown("<div class='sub-header'>Finding Promising Research Ideas</div>", unsafe_allow_html=True)
@@ -260,35 +358,78 @@ elif selected_page == "1. Finding Research Ideas":
 			unsafe_allow_html=True)
 
 	with col2:
-		# Create visualization for idea evaluation
-		labels = ['Significance', 'Originality', 'Feasibility', 'Publication Potential', 'Expertise Alignment']
+		# Radar of the two sample ideas, rendered once and cached
+		st.image(render_radar(*radar_rows(EXAMPLE_IDEAS)))
 
-		# Sample data for two different research ideas
-		idea1 = [4, 5, 3, 4, 5]
-		idea2 = [5, 3, 4, 5, 2]
-
-		angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
-		angles += angles[:1]  # Close the polygon
-
-		idea1 += idea1[:1]
-		idea2 += idea2[:1]
-
-		fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
-		ax.plot(angles, idea1, 'b-', linewidth=2, label='Idea 1')
-		ax.fill(angles, idea1, 'b', alpha=0.1)
-		ax.plot(angles, idea2, 'r-', linewidth=2, label='Idea 2')
-		ax.fill(angles, idea2, 'r', alpha=0.1)
-
-		ax.set_xticks(angles[:-1])
-		ax.set_xticklabels(labels)
-		ax.set_yticks([1, 2, 3, 4, 5])
-		ax.set_yticklabels(['1', '2', '3', '4', '5'])
-		ax.set_ylim(0, 5)
-
-		plt.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
-		plt.title('Research Idea Evaluation')
+	with st.expander("Score and Rank Your Research Ideas"):
+		st.markdown("""
+        List your candidate ideas and score each from 1 to 5 on the five criteria, then set how much each 
+        criterion matters to you. Ideas are ranked by their weighted score; ideas on the **Pareto frontier** 
+        are those no other idea beats on every criterion at once - a good shortlist whatever your weights. 
+        Ideas and weights are saved in your workspace.
+        """)
 
-		st.pyplot(fig)
+		if st.session_state.get("ideas_loaded_for") != workspace_name:
+			loaded_ideas, loaded_weights = load_ideas(workspace_name)
+			st.session_state["ideas_base"] = loaded_ideas
+			st.session_state["ideas_version"] = st.session_state.get("ideas_version", 0) + 1
+			for criterion in IDEA_CRITERIA:
+				st.session_state[f"idea_weight_{criterion}"] = float(loaded_weights[criterion])
+			st.session_state["ideas_loaded_for"] = workspace_name
+
+		uploaded_ideas = st.file_uploader("Import ideas (CSV with an Idea column and one column per criterion):",
+										  type=['csv'], key="ideas_upload")
+		if uploaded_ideas is not None and st.session_state.get("ideas_upload_id") != uploaded_ideas.file_id:
+			try:
+				st.session_state["ideas_base"] = pd.read_csv(BytesIO(uploaded_ideas.getvalue()))
+				st.session_state["ideas_version"] += 1
+				st.session_state["ideas_upload_id"] = uploaded_ideas.file_id
+			except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as error:
+				st.error(f"Could not read the idea file: {error}")
+
+		edited_ideas = st.data_editor(
+			st.session_state["ideas_base"],
+			num_rows="dynamic",
+			use_container_width=True,
+			key=f"ideas_editor_{st.session_state['ideas_version']}"
+		)
+
+		weight_columns = st.columns(len(IDEA_CRITERIA))
+		idea_weights = {}
+		for column, criterion in zip(weight_columns, IDEA_CRITERIA):
+			with column:
+				idea_weights[criterion] = st.slider(f"{criterion} weight:", 0.0, 5.0, step=0.5,
+													key=f"idea_weight_{criterion}")
+
+		col1, col2 = create_columns()
+		with col1:
+			idea_top = st.slider("Ideas to compare on the radar:", 1, 10, 3, key="ideas_top")
+		with col2:
+			idea_pareto_only = st.checkbox("Show Pareto frontier only", key="ideas_pareto_only")
+
+		try:
+			ranked_ideas = rank_ideas(edited_ideas, idea_weights)
+		except ValueError as error:
+			st.error(str(error))
+			ranked_ideas = None
+
+		if ranked_ideas is not None and len(ranked_ideas):
+			col1, col2, col3 = st.columns(3)
+			col1.metric("Ideas", f"{len(ranked_ideas):,}")
+			col2.metric("On the Pareto frontier", f"{int(ranked_ideas['Pareto'].sum()):,}")
+			col3.metric("Top idea", ranked_ideas['Idea'].iloc[0])
+
+			st.image(render_radar(*radar_rows(ranked_ideas, idea_top), title='Top Ideas'))
+			shown_ideas = ranked_ideas[ranked_ideas['Pareto']] if idea_pareto_only else ranked_ideas
+			st.dataframe(shown_ideas.head(500), use_container_width=True)
+			st.download_button("📥 Download Ranked Ideas", shown_ideas.to_csv(index=False), "ranked_ideas.csv")
+
+		if st.button("Save ideas", key="ideas_save"):
+			try:
+				saved_ideas = save_ideas(workspace_name, edited_ideas, idea_weights)
+				st.success(f"Saved {len(saved_ideas)} ideas in workspace '{workspace_name}'")
+			except ValueError as error:
+				st.error(f"Ideas not saved: {error}")
 
 	st.markdown("<div class='section-header'>Identifying Promising Research Gaps</div>", unsafe_allow_html=True)
 
@@ -358,6 +499,78 @@ elif selected_page == "1. Finding Research Ideas":
 	plt.tight_layout()
 	st.pyplot(fig)
 
+	with st.expander("Explore Trends in Your Own Publication Data"):
+		st.markdown("""
+        Point the explorer at a publication-metadata file on this machine (CSV or Parquet, one row per paper with 
+        its year, JEL codes and citation count - e.g. an export from RePEc, OpenAlex or Scopus). The file is read 
+        once and summarized by research area and year; after that every chart is drawn from the summary, so 
+        changing the years or the level of detail is instant even for millions of papers.
+        """)
+
+		trend_path = st.text_input("Path to CSV or Parquet file:", key="trend_path")
+
+		if trend_path:
+			try:
+				trend_columns = file_columns(trend_path)
+			except Exception as error:
+				st.error(f"Could not read the file: {error}")
+				trend_columns = []
+
+			if trend_columns:
+				col1, col2 = create_columns()
+
+				with col1:
+					trend_year = st.selectbox("Year column:", trend_columns, key="trend_year",
+											  index=trend_columns.index('Year') if 'Year' in trend_columns else 0)
+					trend_jel = st.selectbox("JEL codes column:", trend_columns, key="trend_jel",
+											 index=trend_columns.index('JEL Codes') if 'JEL Codes' in trend_columns else 0)
+					trend_citations = st.selectbox("Citations column:", trend_columns, key="trend_citations",
+												   index=trend_columns.index('Citations') if 'Citations' in trend_columns else 0)
+
+				with col2:
+					trend_level = st.selectbox("Research areas:", list(LEVELS), index=1, key="trend_level",
+											   help="JEL field (E), category (E5) or code (E52)")
+					trend_by_year = st.checkbox("One point per area and year", key="trend_by_year")
+
+				trend_request = (trend_path, trend_level, trend_year, trend_jel, trend_citations)
+				if st.session_state.get("trend_request") != trend_request:
+					if st.button("Summarize file"):
+						try:
+							with st.spinner("Reading the file (only needed once)..."):
+								st.session_state["trend_cube"] = load_cube(trend_path, trend_level, trend_year,
+																		   trend_jel, trend_citations)
+							st.session_state["trend_request"] = trend_request
+						except Exception as error:
+							st.error(f"Could not summarize the file: {error}")
+
+				if st.session_state.get("trend_request") == trend_request:
+					trend_cube = st.session_state["trend_cube"]
+					first_year, last_year = int(trend_cube.table['Year'].min()), int(trend_cube.table['Year'].max())
+					trend_start, trend_end = st.slider("Years:", first_year, max(last_year, first_year + 1),
+													   (max(first_year, last_year - 9), last_year), key="trend_years")
+					if trend_start >= trend_end:
+						st.info("Choose a window of at least two years to measure growth.")
+					else:
+						trend_table = trend_summary(trend_cube, trend_start, trend_end)
+						trend_points = yearly_points(trend_cube, trend_start, trend_end) if trend_by_year else trend_table
+
+						st.markdown(f"**Papers**: {trend_cube.papers:,} | **Areas**: {len(trend_table):,} | "
+									f"**Years**: {first_year}-{last_year}")
+						fig = plot_trends(trend_points, title=f'Growth and Impact of Research Areas ({trend_start}-{trend_end})')
+						st.pyplot(fig)
+
+						trend_areas = st.multiselect("Papers per year for:", trend_table['Area'].tolist(),
+													 default=trend_table['Area'].head(5).tolist(), key="trend_areas")
+						if trend_areas:
+							fig = plot_area_series(trend_cube, trend_areas, trend_start, trend_end)
+							st.pyplot(fig)
+
+						st.dataframe(trend_table, use_container_width=True)
+						st.download_button("📥 Download Trend Summary", trend_table.to_csv(index=False), "research_trends.csv")
+						st.markdown(
+							"<div class='tip'>Areas in the upper right are growing and well cited. Fast growth with low citation percentiles can signal a crowded field; high citations with slow growth can signal an under-explored one.</div>",
+							unsafe_allow_html=True)
+
 	st.markdown("<div class='section-header'>Practical Exercises for Idea Generation</div>", unsafe_allow_html=True)
 
 	st.markdown("""
@@ -567,24 +780,107 @@ elif selected_page == "2. Preliminary Research":
 		"<div class='highlight'>Economics research often takes longer than initially planned. Build in time buffers for unexpected challenges with data access, analysis complexity, or feedback incorporation. Many successful economics papers evolve significantly during the research process.</div>",
 		unsafe_allow_html=True)
 
-	st.markdown("<div class='section-header'>Preliminary Research Checklist</div>", unsafe_allow_html=True)
+	with st.expander("Plan Your Own Project Timeline"):
+		st.markdown("""
+        Edit the tasks below to plan your own project (or several papers at once, one **Project** name each).
+        List the tasks a task waits for in **Depends On**, separated by commas. The critical path - the chain
+        of tasks with no slack, where any delay moves the finish date - is shown in red; light gray bars show
+        how long a task can slip without delaying its project.
+
+        Give **Optimistic** and **Pessimistic** estimates around each duration to forecast the finish date:
+        thousands of possible schedules are simulated, and black lines show where each task is likely to end
+        (10th to 90th percentile).
+        """)
 
-	checklist = """
-    <ul>
-        <li><input type="checkbox"/> Clearly defined research question with specific scope</li>
-        <li><input type="checkbox"/> Comprehensive literature map with identified gaps</li>
-        <li><input type="checkbox"/> Assessed data availability and quality</li>
-        <li><input type="checkbox"/> Evaluated methodological options and requirements</li>
-        <li><input type="checkbox"/> Articulated specific contribution statement</li>
-        <li><input type="checkbox"/> Identified target journals and their requirements</li>
-        <li><input type="checkbox"/> Created detailed project timeline with milestones</li>
-        <li><input type="checkbox"/> Secured necessary resources (data access, software, etc.)</li>
-        <li><input type="checkbox"/> Obtained feedback on research design from colleagues</li>
-        <li><input type="checkbox"/> Conducted pilot testing of key analytical approaches</li>
-    </ul>
-    """
+		if "planner_base" not in st.session_state:
+			typical_weeks = research_df['Typical Duration (weeks)']
+			st.session_state["planner_base"] = chain_tasks(research_df['Stage'], typical_weeks,
+														   optimistic=typical_weeks * 0.75, pessimistic=typical_weeks * 1.75)
+			st.session_state["planner_version"] = 0
+
+		saved_projects = list_projects(workspace_name)
+		col1, col2 = create_columns()
+		with col1:
+			project_name = st.text_input("Save as:", "My Research Plan", key="planner_name")
+		with col2:
+			load_name = st.selectbox("Saved plans:", ["(none)"] + saved_projects, key="planner_load")
+			if st.button("Load plan", key="planner_load_button") and load_name != "(none)":
+				st.session_state["planner_base"] = load_project(load_name, workspace_name)
+				st.session_state["planner_version"] += 1
+
+		planned_tasks = st.data_editor(
+			st.session_state["planner_base"],
+			num_rows="dynamic",
+			use_container_width=True,
+			key=f"planner_tasks_{st.session_state['planner_version']}"
+		)
+
+		if st.button("Save plan", key="planner_save"):
+			save_project(project_name, planned_tasks, workspace_name)
+			st.success(f"Saved '{project_name}'")
+
+		try:
+			planned_schedule = schedule(planned_tasks)
+		except ValueError as error:
+			st.error(str(error))
+			planned_schedule = None
+
+		planned_forecast = None
+		if planned_schedule is not None and len(planned_schedule):
+			col1, col2 = create_columns()
+			with col1:
+				start_date = st.date_input("Project start date:", key="planner_start")
+			with col2:
+				forecast_samples = st.select_slider("Simulated schedules:", [10_000, 100_000, 1_000_000], 100_000,
+													key="planner_samples")
+			# Large plans get fewer samples so that an edit does not block the page
+			affordable_samples = max(1_000, INTERACTIVE_DRAWS // len(planned_schedule))
+			if forecast_samples > affordable_samples:
+				st.info(f"This plan has {len(planned_schedule):,} tasks, so the forecast uses "
+						f"{affordable_samples:,} simulated schedules.")
+				forecast_samples = affordable_samples
+			try:
+				planned_forecast = forecast(planned_tasks, samples=forecast_samples)
+				planned_schedule = planned_forecast.table
+			except ValueError as error:
+				st.error(str(error))
+
+			def week_date(weeks):
+				return (pd.Timestamp(start_date) + pd.Timedelta(weeks=float(weeks))).strftime('%d %b %Y')
+
+			paths = critical_path(planned_schedule)
+			for project, tasks in paths.items():
+				weeks = planned_schedule.loc[planned_schedule['Project'] == project, 'Earliest Finish'].max()
+				col1, col2, col3 = st.columns(3)
+				col1.metric(f"{project}: weeks to finish", f"{weeks:g}")
+				col2.metric("Planned finish", week_date(weeks))
+				col3.metric("Critical tasks", len(tasks))
+				bands = None
+				if planned_forecast is not None:
+					completion = planned_forecast.completion.set_index('Project').loc[project]
+					col1, col2, col3 = st.columns(3)
+					col1.metric("Finish (P50)", week_date(completion['P50 Finish']), f"{completion['P50 Finish'] - weeks:+.1f} weeks",
+								delta_color="inverse")
+					col2.metric("Finish (P90)", week_date(completion['P90 Finish']), f"{completion['P90 Finish'] - weeks:+.1f} weeks",
+								delta_color="inverse")
+					col3.metric("Chance of finishing on plan", f"{completion['P(On Plan)']:.0%}")
+					bands = gantt_bands(planned_schedule, project)
+				st.image(render_gantt(gantt_rows(planned_schedule, project), project, bands))
+				st.markdown(f"**Critical path:** {' → '.join(tasks)}")
+
+			if planned_forecast is not None:
+				fig = plot_completion(planned_forecast)
+				st.pyplot(fig)
+				st.markdown(
+					"<div class='tip'>The criticality index is the share of simulated schedules in which a task is on the critical path. Tasks with a high index but a wide estimate range are the best places to add buffers or start early.</div>",
+					unsafe_allow_html=True)
 
-	st.markdown(checklist, unsafe_allow_html=True)
+			st.dataframe(planned_schedule, use_container_width=True)
+			st.download_button("📥 Download Schedule", planned_schedule.to_csv(index=False), "project_schedule.csv")
+
+	st.markdown("<div class='section-header'>Preliminary Research Checklist</div>", unsafe_allow_html=True)
+
+	render_checklist("preliminary")
 
 # Page 3: IMRAD Structure
 elif selected_page == "3. IMRAD Structure":
@@ -1077,22 +1373,7 @@ elif selected_page == "4. Title & Abstract":
 
 	st.markdown("<div class='section-header'>Abstract Checklist</div>", unsafe_allow_html=True)
 
-	abstract_checklist = """
-    <ul>
-        <li><input type="checkbox"/> Clearly states the research question or objective</li>
-        <li><input type="checkbox"/> Identifies key variables and relationships studied</li>
-        <li><input type="checkbox"/> Mentions data sources and sample characteristics</li>
-        <li><input type="checkbox"/> Explains methodology and empirical strategy</li>
-        <li><input type="checkbox"/> Reports specific results with magnitudes (not just direction)</li>
-        <li><input type="checkbox"/> Indicates statistical and economic significance</li>
-        <li><input type="checkbox"/> Articulates main contribution or advance over prior work</li>
-        <li><input type="checkbox"/> Notes key implications for theory, policy, or practice</li>
-        <li><input type="checkbox"/> Stays within journal's word limit (typically 150-250 words)</li>
-        <li><input type="checkbox"/> Contains no citations, tables, or figures</li>
-    </ul>
-    """
-
-	st.markdown(abstract_checklist, unsafe_allow_html=True)
+	render_checklist("abstract")
 
 	st.markdown(
 		"<div class='section-header'>Abstract Do's and Don'ts</div>",
@@ -1183,20 +1464,28 @@ elif selected_page == "4. Title & Abstract":
 	with col1:
 		st.markdown("**Analyze your current title or abstract:**")
 	title_input = st.text_input("Enter your current paper title:",
-	"The Impact of Monetary Policy on Household Income Inequality")
+	key=workspace_draft("draft_title", "The Impact of Monetary Policy on Household Income Inequality"),
+	on_change=save_draft, args=("draft_title",))
 	abstract_input = st.text_area("Enter your current abstract:",
-	"This paper examines the distributional effects of monetary policy.", height = 200)
+	key=workspace_draft("draft_abstract", "This paper examines the distributional effects of monetary policy."),
+	on_change=save_draft, args=("draft_abstract",), height = 200)
 
 	with col2:
 		st.markdown("**Analysis Results:**")
+		target_journal = st.selectbox("Target journal:", JOURNAL_RULES['Journal'].tolist())
+
+	# Length limits come from the target journal, falling back to the general
+	# guidance for limits the journal does not set
+	general_rule = journal_rule(GENERAL_GUIDANCE)
+	target_rule = journal_rule(target_journal).fillna(general_rule)
 
 	# Analyze title
 	title_length = len(title_input.split())
 	title_feedback = ""
 
-	if title_length < 6:
+	if title_length < target_rule['Title Min Words']:
 		title_feedback = "Your title may be too short. Consider adding more specificity about variables or methodology."
-	elif title_length > 15:
+	elif title_length > target_rule['Title Max Words']:
 		title_feedback = "Your title may be too long. Consider making it more concise while retaining key information."
 	else:
 		title_feedback = "Your title length is within the typical range for economics papers."
@@ -1207,14 +1496,24 @@ elif selected_page == "4. Title & Abstract":
 	if ":" in title_input:
 		title_feedback += "\n\nYou're using a dual-part title structure, which can be effective for combining conceptual framework with specific application."
 
+	title_pattern, title_confidence = classify_title(title_input)
+	if title_pattern:
+		pattern_row = title_patterns_df[title_patterns_df['Pattern'] == title_pattern].iloc[0]
+		title_feedback += f"\n\nYour title follows the **{title_pattern}** pattern (confidence {title_confidence:.0%}). Typical use: {pattern_row['When to Use'].lower()}."
+	else:
+		title_feedback += "\n\nYour title does not clearly follow any of the common title patterns above. Consider making the relationship, setting or method explicit."
+
 	# Analyze abstract
 	abstract_length = len(abstract_input.split())
 	abstract_feedback = ""
 
-	if abstract_length < 50:
+	if abstract_length < target_rule['Abstract Min Words']:
 		abstract_feedback = "Your abstract is too short. Expand to include methodology, specific findings, and contributions."
-	elif abstract_length > 250:
-		abstract_feedback = "Your abstract exceeds typical length limits. Consider focusing on the most essential elements."
+	elif abstract_length > target_rule['Abstract Max Words']:
+		if target_journal == GENERAL_GUIDANCE:
+			abstract_feedback = "Your abstract exceeds typical length limits. Consider focusing on the most essential elements."
+		else:
+			abstract_feedback = f"Your abstract ({abstract_length} words) exceeds the {target_rule['Abstract Max Words']:.0f}-word limit of {target_journal}. Consider focusing on the most essential elements."
 	else:
 		abstract_feedback = f"Your abstract length ({abstract_length} words) is appropriate."
 
@@ -1230,6 +1529,50 @@ elif selected_page == "4. Title & Abstract":
 
 	st.markdown(f"**Title Analysis:**\n{title_feedback}")
 	st.markdown(f"**Abstract Analysis:**\n{abstract_feedback}")
+
+	with st.expander("Title Pattern Scores and Alternative Phrasings"):
+		pattern_scores = pd.DataFrame({
+			'Pattern': list(score_title(title_input).keys()),
+			'Score': list(score_title(title_input).values())
+		})
+		st.dataframe(pattern_scores, use_container_width=True)
+
+		alternatives_input = st.text_area("Enter alternative phrasings of your title (one per line):",
+			title_input, height=120)
+		ranked_titles = rank_titles(alternatives_input.splitlines())
+		if not ranked_titles.empty:
+			st.dataframe(ranked_titles, use_container_width=True)
+			st.markdown(get_table_download_link(ranked_titles, "ranked_titles.csv", "Download Ranked Titles"),
+						unsafe_allow_html=True)
+
+	st.markdown("<div class='section-header'>Journal Requirements Check</div>", unsafe_allow_html=True)
+
+	col1, col2 = create_columns()
+
+	with col1:
+		keywords_input = st.text_input("Keywords (comma-separated):", "monetary policy, inequality")
+		jel_input = st.text_input("JEL codes (comma-separated):", "E52, D31")
+		pages_input = st.number_input("Manuscript length (pages):", min_value=1, value=40)
+
+	journal_checks = check_manuscript(
+		title_input, abstract_input, split_items(keywords_input), split_items(jel_input), pages_input
+	)
+
+	with col2:
+		compliant_journals = journal_checks.loc[journal_checks['Compliant'], 'Journal']
+		st.metric("Journals your draft complies with", f"{len(compliant_journals)} of {len(journal_checks)}")
+		if target_journal != GENERAL_GUIDANCE:
+			target_check = journal_checks[journal_checks['Journal'] == target_journal].iloc[0]
+			failed = [c for c in ['Abstract', 'Title', 'Keywords', 'JEL Codes', 'Pages'] if not target_check[c]]
+			if failed:
+				st.markdown(f"For **{target_journal}**, revise: {', '.join(failed)}.")
+			else:
+				st.markdown(f"Your draft meets the requirements of **{target_journal}**.")
+
+	st.dataframe(journal_checks, use_container_width=True)
+	st.markdown(
+		"<div class='caution'>⚠️ **Caution**: Journal limits are approximate and change over time. Always verify them against the journal's current author guidelines before submitting.</div>",
+		unsafe_allow_html=True)
 if selected_page == "1. Title":
     # TODO: fill in your Title‐page code here
     pass
@@ -1496,22 +1839,7 @@ st.dataframe(mistakes, use_container_width=True)
 
 st.markdown("<div class='section-header'>Introduction Checklist</div>", unsafe_allow_html=True)
 
-intro_checklist = """
-    <ul>
-        <li><input type="checkbox"/> Research question clearly stated in first or second paragraph</li>
-        <li><input type="checkbox"/> Importance of the question established (theoretical or practical)</li>
-        <li><input type="checkbox"/> Relevant background or context provided</li>
-        <li><input type="checkbox"/> Key literature positioned thematically with specific gaps identified</li>
-        <li><input type="checkbox"/> Data sources and methodological approach previewed</li>
-        <li><input type="checkbox"/> Identification strategy explained (for causal papers)</li>
-        <li><input type="checkbox"/> Key findings presented with specific magnitudes</li>
-        <li><input type="checkbox"/> Contribution statement explicitly articulated</li>
-        <li><input type="checkbox"/> Paper roadmap included in final paragraph</li>
-        <li><input type="checkbox"/> Introduction length appropriate for journal (typically 4-7 pages)</li>
-    </ul>
-    """
-
-st.markdown(intro_checklist, unsafe_allow_html=True)
+render_checklist("introduction")
 
 st.markdown(
 	"<div class='highlight'>Your introduction is your paper's first impression. In the competitive landscape of top economics journals, a clear, compelling introduction that efficiently communicates your research question, approach, findings, and contribution is essential for capturing editors' and reviewers' interest.</div>",
@@ -1849,22 +2177,7 @@ st.dataframe(resources, use_container_width=True)
 
 st.markdown("<div class='section-header'>Literature Review Checklist</div>", unsafe_allow_html=True)
 
-lit_checklist = """
-    <ul>
-        <li><input type="checkbox"/> Covers seminal papers in the field</li>
-        <li><input type="checkbox"/> Includes recent literature (last 5-10 years)</li>
-        <li><input type="checkbox"/> Organized thematically rather than chronologically</li>
-        <li><input type="checkbox"/> Critically engages with methodologies and findings</li>
-        <li><input type="checkbox"/> Identifies specific limitations or gaps in existing research</li>
-        <li><input type="checkbox"/> Connects literature discussion directly to your contribution</li>
-        <li><input type="checkbox"/> Balanced treatment of competing perspectives</li>
-        <li><input type="checkbox"/> Appropriate depth for most relevant papers</li>
-        <li><input type="checkbox"/> Avoids excessive breadth on tangential topics</li>
-        <li><input type="checkbox"/> Synthesizes patterns and trends rather than just summarizing</li>
-    </ul>
-    """
-
-st.markdown(lit_checklist, unsafe_allow_html=True)
+render_checklist("literature")
 
 st.markdown(
 	"<div class='highlight'>A strong literature review does more than demonstrate your knowledge—it strategically positions your work within the ongoing scholarly conversation. By identifying specific gaps or limitations in existing research, you create the intellectual space for your contribution.</div>",
@@ -2063,6 +2376,60 @@ st.markdown(
 	"<div class='caution'>⚠️ **Caution**: Be transparent about data limitations, missing values, and potential selection issues. Acknowledging these upfront strengthens credibility and helps preempt reviewer concerns.</div>",
 	unsafe_allow_html=True)
 
+if selected_page == "7. Methodology":
+	with st.expander("Generate the Summary Statistics Table for Your Data"):
+		st.markdown("""
+        Upload a dataset, or give the path of a CSV or Parquet file on this machine (files larger than memory 
+        are read in chunks), to produce a table in the format of the example above. Optionally split the 
+        table into panels by a grouping variable.
+        """)
+
+		uploaded_summary_data = st.file_uploader("Upload your dataset (CSV):", type=['csv'], key="summary_data")
+		summary_path = st.text_input("...or path to a CSV/Parquet file:", key="summary_path")
+
+		summary_source, summary_columns = None, []
+		try:
+			if uploaded_summary_data is not None:
+				summary_source = pd.read_csv(uploaded_summary_data)
+				summary_columns = summary_source.columns.tolist()
+			elif summary_path:
+				summary_source = summary_path
+				summary_columns = file_columns(summary_path)
+		except Exception as error:
+			st.error(f"Could not read the data: {error}")
+
+		if summary_columns:
+			col1, col2 = create_columns()
+
+			with col1:
+				summary_variables = st.multiselect("Variables:", summary_columns, key="summary_variables")
+
+			with col2:
+				summary_by = st.selectbox("Panels by:", ['None'] + summary_columns, key="summary_by")
+				summary_by = None if summary_by == 'None' else summary_by
+				summary_digits = st.slider("Decimal places:", 0, 4, 2, key="summary_digits")
+
+			if summary_variables:
+				try:
+					summary_panels = summarize(summary_source, [c for c in summary_variables if c != summary_by],
+											   by=summary_by)
+				except Exception as error:
+					st.error(f"Could not compute the summary statistics: {error}")
+				else:
+					user_summary = panel_table(summary_panels, digits=summary_digits) if summary_by \
+						else summary_table(summary_panels[ALL_OBSERVATIONS], digits=summary_digits)
+					st.dataframe(user_summary, use_container_width=True)
+
+					col1, col2 = create_columns()
+
+					with col1:
+						st.markdown(get_table_download_link(user_summary, "summary_statistics.csv",
+															"Download Summary Statistics (CSV)"), unsafe_allow_html=True)
+
+					with col2:
+						st.download_button("📥 Download LaTeX Table", to_latex(user_summary, digits=summary_digits),
+										   "summary_statistics.tex")
+
 st.markdown("<div class='section-header'>Empirical Strategy and Identification</div>", unsafe_allow_html=True)
 
 st.markdown("""
@@ -2255,6 +2622,89 @@ concerns = pd.DataFrame({
 
 st.dataframe(concerns, use_container_width=True)
 
+if selected_page == "7. Methodology":
+	with st.expander("Explore Omitted Variable Bias"):
+		st.markdown("""
+        Compare a short regression (treatment and base controls) with a long regression that adds candidate 
+        omitted variables. The gap between the two treatment coefficients is split into one term per candidate, 
+        delta × beta, generalizing the notebook's `b1_tilde = b["ACT"] + b["hsGPA"] * delta_tilde["ACT"]`. 
+        Oster (2019) bounds then ask how strong selection on unobservables would have to be to explain the 
+        effect away.
+        """)
+
+		uploaded_ovb_data = st.file_uploader("Upload your dataset (CSV):", type=['csv'], key="ovb_data")
+		ovb_example_title = st.selectbox("...or use a worked example:", [example.title for example in WORKED_EXAMPLES],
+										 key="ovb_example")
+
+		ovb_example = None
+		try:
+			if uploaded_ovb_data is not None:
+				ovb_data = pd.read_csv(uploaded_ovb_data)
+			else:
+				ovb_example = WORKED_EXAMPLES[[example.title for example in WORKED_EXAMPLES].index(ovb_example_title)]
+				ovb_data = example_data(ovb_example)
+		except ImportError as error:
+			st.error(str(error))
+			ovb_data = None
+
+		if ovb_data is not None:
+			ovb_numeric = ovb_data.select_dtypes('number').columns.tolist()
+
+			col1, col2 = create_columns()
+
+			with col1:
+				ovb_outcome = st.selectbox("Dependent variable:", ovb_numeric, key="ovb_outcome",
+										   index=ovb_numeric.index(example_outcome(ovb_example)) if ovb_example else 0)
+				ovb_candidates_pool = [c for c in ovb_numeric if c != ovb_outcome]
+				ovb_treatment = st.selectbox("Treatment (key variable):", ovb_candidates_pool, key="ovb_treatment",
+											 index=ovb_candidates_pool.index(ovb_example.regressors[-1])
+											 if ovb_example and ovb_example.regressors[-1] in ovb_candidates_pool else 0)
+				ovb_controls = st.multiselect("Base controls (in both regressions):",
+											  [c for c in ovb_candidates_pool if c != ovb_treatment], key="ovb_controls")
+
+			with col2:
+				ovb_candidate_options = [c for c in ovb_candidates_pool if c != ovb_treatment and c not in ovb_controls]
+				ovb_candidates = st.multiselect(
+					"Candidate omitted variables:", ovb_candidate_options,
+					default=[c for c in (ovb_example.regressors[:-1] if ovb_example else []) if c in ovb_candidate_options],
+					key="ovb_candidates")
+
+			if ovb_candidates:
+				try:
+					ovb_results, ovb_summary = ovb_decomposition(ovb_data, ovb_outcome, ovb_treatment,
+																 ovb_candidates, ovb_controls)
+				except (ValueError, np.linalg.LinAlgError) as error:
+					st.error(f"Could not compute the decomposition: {error}")
+				else:
+					col1, col2, col3 = st.columns(3)
+					col1.metric("Short coefficient", f"{ovb_summary.short_coef:.4f}", f"R² {ovb_summary.short_r2:.3f}",
+								delta_color="off")
+					col2.metric("Long coefficient", f"{ovb_summary.long_coef:.4f}", f"R² {ovb_summary.long_r2:.3f}",
+								delta_color="off")
+					col3.metric("Gap (short − long)", f"{ovb_summary.total_bias:.4f}")
+
+					st.dataframe(ovb_results, use_container_width=True)
+					st.pyplot(plot_decomposition(ovb_results, ovb_summary))
+
+					# R-squared max must lie above the long R-squared, so a perfect fit has no bounds
+					if ovb_summary.short_r2 < ovb_summary.long_r2 < 1.0:
+						st.markdown("**Oster bounds**")
+						default_r_max = min(OSTER_R_MAX_MULTIPLIER * ovb_summary.long_r2, 1.0)
+						ovb_r_max = st.slider("R-squared max:", float(ovb_summary.long_r2), 1.0, float(default_r_max),
+											  key="ovb_r_max")
+						ovb_delta = st.slider("delta:", 0.0, 3.0, 1.0, 0.1, key="ovb_delta")
+						bound = oster_bounds(ovb_summary, [ovb_delta], [ovb_r_max])[0, 0]
+						delta_zero = oster_delta(ovb_summary, ovb_r_max)
+						st.markdown(f"Bias-adjusted coefficient: **{bound:.4f}** (identified set "
+									f"[{min(bound, ovb_summary.long_coef):.4f}, {max(bound, ovb_summary.long_coef):.4f}]). "
+									f"delta needed for a zero effect: **{delta_zero:.2f}** "
+									f"(|delta| > 1 is the usual robustness benchmark).")
+						st.pyplot(plot_oster_bounds(ovb_summary, np.linspace(0, 3, 61),
+													np.linspace(ovb_summary.long_r2, 1.0, 61)))
+					else:
+						st.markdown("<div class='caution'>⚠️ The candidates do not raise the R-squared, or the long regression fits perfectly, so Oster bounds are not defined.</div>",
+									unsafe_allow_html=True)
+
 st.markdown("<div class='section-header'>Common Methodology Mistakes in Economics Papers</div>", unsafe_allow_html=True)
 
 mistakes = pd.DataFrame({
@@ -2291,22 +2741,111 @@ st.dataframe(mistakes, use_container_width=True)
 
 st.markdown("<div class='section-header'>Methodology Checklist</div>", unsafe_allow_html=True)
 
-method_checklist = """
-    <ul>
-        <li><input type="checkbox"/> Theoretical framework clearly articulated</li>
-        <li><input type="checkbox"/> Data sources and sample construction fully described</li>
-        <li><input type="checkbox"/> Key variables precisely defined</li>
-        <li><input type="checkbox"/> Summary statistics for all important variables provided</li>
-        <li><input type="checkbox"/> Econometric specifications presented with clear notation</li>
-        <li><input type="checkbox"/> Identification strategy explicitly discussed</li>
-        <li><input type="checkbox"/> Key identifying assumptions stated and justified</li>
-        <li><input type="checkbox"/> Potential endogeneity concerns addressed</li>
-        <li><input type="checkbox"/> Robustness checks described</li>
-        <li><input type="checkbox"/> Treatment of standard errors and clustering explained</li>
-    </ul>
-    """
+render_checklist("methodology")
+
+if selected_page == "7. Methodology":
+	with st.expander("Check Your Regressors for Multicollinearity"):
+		st.markdown("""
+        Upload your dataset and select the regressors of your main specification. Variance inflation 
+        factors (VIFs) are computed for all regressors at once; VIFs of 5-10 indicate high and VIFs 
+        above 10 serious multicollinearity.
+        """)
+
+		uploaded_method_data = st.file_uploader("Upload your dataset (CSV):", type=['csv'], key="methodology_data")
+
+		if uploaded_method_data is not None:
+			method_data = pd.read_csv(uploaded_method_data)
+			vif_columns = st.multiselect("Regressors:", method_data.select_dtypes('number').columns.tolist())
+
+			if len(vif_columns) >= 2:
+				try:
+					vif_results, design_condition = vif_table(method_data, vif_columns)
+				except ValueError as error:
+					st.error(f"Could not compute the diagnostics: {error}")
+					vif_results = None
+
+				if vif_results is not None:
+					st.dataframe(vif_results, use_container_width=True)
+					st.metric("Condition number (scaled design)", f"{design_condition:,.1f}")
+
+					flagged_columns = problem_columns(vif_results)
+					if flagged_columns:
+						st.markdown(
+							f"<div class='caution'>⚠️ **Multicollinearity**: {', '.join(map(str, flagged_columns))} have high VIFs. Individual coefficients on these variables will be imprecisely estimated; consider whether all of them are needed or report them jointly.</div>",
+							unsafe_allow_html=True)
+					elif design_condition > CONDITION_NUMBER_LIMIT:
+						st.markdown(
+							f"<div class='caution'>⚠️ **Ill-conditioned design**: the condition number exceeds {CONDITION_NUMBER_LIMIT:.0f}. Check the scaling of your variables and any near-dependencies with the intercept.</div>",
+							unsafe_allow_html=True)
+					else:
+						st.markdown(
+							"<div class='tip'>✅ No multicollinearity problems detected among the selected regressors.</div>",
+							unsafe_allow_html=True)
+
+if selected_page == "7. Methodology":
+	with st.expander("Bootstrap Your Standard Errors"):
+		st.markdown("""
+        Ignoring clustering may substantially understate standard errors, and conventional clustered standard 
+        errors are themselves unreliable with few clusters. Compare them with bootstrap inference: the wild 
+        cluster bootstrap (with Rademacher weights, or Webb weights when there are fewer than about 12 clusters), 
+        the wild bootstrap for heteroskedasticity, or the pairs bootstrap. Results are reproducible for a 
+        given seed, whatever the number of worker processes.
+        """)
 
-st.markdown(method_checklist, unsafe_allow_html=True)
+		uploaded_bootstrap_data = st.file_uploader("Upload your dataset (CSV):", type=['csv'], key="bootstrap_data")
+
+		if uploaded_bootstrap_data is not None:
+			bootstrap_data = pd.read_csv(uploaded_bootstrap_data)
+			bootstrap_numeric = bootstrap_data.select_dtypes('number').columns.tolist()
+
+			col1, col2 = create_columns()
+
+			with col1:
+				bootstrap_outcome = st.selectbox("Dependent variable:", bootstrap_numeric, key="bootstrap_outcome")
+				bootstrap_regressors = st.multiselect("Regressors:",
+													  [c for c in bootstrap_numeric if c != bootstrap_outcome],
+													  key="bootstrap_regressors")
+				bootstrap_method = st.selectbox("Bootstrap:", BOOTSTRAP_METHODS,
+												index=BOOTSTRAP_METHODS.index('wild-cluster'))
+				bootstrap_cluster = None
+				if bootstrap_method != 'wild':
+					bootstrap_cluster = st.selectbox(
+						"Cluster variable:",
+						(['None'] if bootstrap_method == 'pairs' else []) +
+						[c for c in bootstrap_data.columns if c != bootstrap_outcome],
+						key="bootstrap_cluster")
+					bootstrap_cluster = None if bootstrap_cluster == 'None' else bootstrap_cluster
+
+			with col2:
+				bootstrap_weights = st.selectbox("Wild weights:", WEIGHT_TYPES, disabled=bootstrap_method == 'pairs')
+				bootstrap_replications = st.number_input("Replications:", min_value=99, max_value=99999, value=999, step=100)
+				bootstrap_seed = st.number_input("Seed:", min_value=0, value=12345, step=1)
+				available_cpus = os.cpu_count() or 1
+				bootstrap_workers = st.slider("Worker processes:", 1, available_cpus, 1, key="bootstrap_workers") \
+					if available_cpus > 1 else 1
+
+			if bootstrap_regressors and st.button("Run bootstrap"):
+				try:
+					with st.spinner("Running bootstrap replications..."):
+						bootstrap_result = bootstrap(
+							bootstrap_data, bootstrap_outcome, bootstrap_regressors, method=bootstrap_method,
+							cluster=bootstrap_cluster, weight_type=bootstrap_weights,
+							replications=int(bootstrap_replications), seed=int(bootstrap_seed), n_jobs=bootstrap_workers
+						)
+						conventional = fit_ols(bootstrap_data, bootstrap_outcome, bootstrap_regressors,
+											   cov_type='cluster' if bootstrap_cluster else 'HC1', cluster=bootstrap_cluster)
+				except (ValueError, np.linalg.LinAlgError) as error:
+					st.error(f"Could not run the bootstrap: {error}")
+				else:
+					comparison = bootstrap_table(bootstrap_result)
+					comparison.insert(2, 'Conventional SE', conventional.bse)
+					st.dataframe(comparison, use_container_width=True)
+					if bootstrap_result.replications < int(bootstrap_replications):
+						st.markdown(f"With {bootstrap_result.n_clusters} clusters all "
+									f"{bootstrap_result.replications} Rademacher sign patterns were enumerated.")
+					st.pyplot(plot_bootstrap_distribution(bootstrap_result, bootstrap_regressors[0]))
+					st.markdown(get_table_download_link(comparison, "bootstrap_results.csv",
+														"Download Bootstrap Results"), unsafe_allow_html=True)
 
 st.markdown(
 	"<div class='highlight'>The methodology section establishes the credibility of your findings. In economics, where causal inference is often a central concern, careful attention to identification strategy and robustness is essential for publication in top journals.</div>",
@@ -2519,6 +3058,261 @@ st.markdown(
 	"<div class='tip'>💡 **Tip**: In top economics journals, key results are typically presented in both tables (for precision) and figures (for visual impact). The same information can be conveyed in both formats to cater to different reader preferences.</div>",
 	unsafe_allow_html=True)
 
+if selected_page == "8. Results":
+	with st.expander("Build an Event Study Plot"):
+		st.markdown("""
+        Upload a long panel (one row per unit and period, with periods numbered consecutively) and choose how 
+        treatment timing is recorded. Two-way fixed effects is the classic specification; with staggered 
+        adoption and effects that differ across cohorts, compare it with the imputation estimator of 
+        Borusyak, Jaravel and Spiess, which only uses untreated observations as controls. The example uses 
+        the job-training grants in `jtrain` (firms receiving grants in 1988 or 1989).
+        """)
+
+		uploaded_event_data = st.file_uploader("Upload your panel (CSV):", type=['csv'], key="event_data")
+
+		try:
+			event_data = pd.read_csv(uploaded_event_data) if uploaded_event_data is not None else load_dataset('jtrain')
+		except ImportError as error:
+			st.error(str(error))
+			event_data = None
+
+		if event_data is not None:
+			event_columns = event_data.columns.tolist()
+			event_numeric = event_data.select_dtypes('number').columns.tolist()
+			example_defaults = uploaded_event_data is None
+
+			col1, col2 = create_columns()
+
+			with col1:
+				event_outcome = st.selectbox("Outcome:", event_numeric, key="event_outcome",
+											 index=event_numeric.index('hrsemp') if example_defaults else 0)
+				event_unit = st.selectbox("Unit identifier:", event_columns, key="event_unit",
+										  index=event_columns.index('fcode') if example_defaults else 0)
+				event_time = st.selectbox("Period:", event_numeric, key="event_time",
+										  index=event_numeric.index('year') if example_defaults else 0)
+				event_timing = st.radio("Treatment timing given as:", ['Treatment indicator', 'Adoption period column'],
+										key="event_timing")
+				event_timing_column = st.selectbox(
+					"Treatment indicator:" if event_timing == 'Treatment indicator' else "Adoption period (blank if never treated):",
+					event_numeric, key="event_timing_column",
+					index=event_numeric.index('grant') if example_defaults and event_timing == 'Treatment indicator' else 0)
+
+			with col2:
+				event_leads = st.number_input("Leads (periods before treatment):", 1, 50, 2, key="event_leads")
+				event_lags = st.number_input("Lags (periods after treatment):", 0, 50, 1, key="event_lags")
+				event_bin = st.checkbox("Bin periods beyond the window into the end points", value=True, key="event_bin")
+				event_estimators = st.multiselect("Estimators:", ESTIMATORS, default=ESTIMATORS,
+												  format_func=ESTIMATOR_LABELS.get, key="event_estimators")
+				event_cluster = st.selectbox("Cluster standard errors by:", event_columns, key="event_cluster",
+											 index=event_columns.index(event_unit))
+
+			if event_estimators and st.button("Estimate event study"):
+				timing = {'treatment': event_timing_column} if event_timing == 'Treatment indicator' else \
+					{'cohort': event_timing_column}
+				try:
+					with st.spinner("Estimating..."):
+						event_results = [event_study(event_data, event_outcome, event_unit, event_time, leads=event_leads,
+													 lags=event_lags, estimator=estimator, cluster=event_cluster,
+													 bin_endpoints=event_bin, **timing)
+										 for estimator in event_estimators]
+				except (ValueError, np.linalg.LinAlgError) as error:
+					st.error(f"Could not estimate the event study: {error}")
+				else:
+					st.pyplot(plot_event_study(event_results, title=f'Event Study: {event_outcome}'))
+
+					for estimator, study in zip(event_estimators, event_results):
+						st.markdown(f"**{ESTIMATOR_LABELS[estimator]}**")
+						st.dataframe(event_study_table(study), use_container_width=True)
+						pretrend_F, pretrend_p = pretrend_test(study)
+						notes = f"{study.n_cohorts} treatment cohorts, {study.result.n_clusters} clusters."
+						if not np.isnan(pretrend_F):
+							notes += f" Joint test that all leads are zero: F = {pretrend_F:.2f}, p = {pretrend_p:.3f}."
+						if study.dropped:
+							notes += f" {study.dropped} treated observations dropped (no untreated observations to impute from)."
+						st.markdown(notes)
+
+					st.download_button("📥 Download Event Study Estimates",
+									   pd.concat([event_study_table(study).assign(Estimator=ESTIMATOR_LABELS[estimator])
+												  for estimator, study in zip(event_estimators, event_results)]).to_csv(index=False),
+									   "event_study.csv")
+
+					st.markdown(
+						"<div class='tip'>💡 **Tip**: Report the normalized period (hollow marker), the estimator, the clustering level and the pre-trend test in the figure notes.</div>",
+						unsafe_allow_html=True)
+
+if selected_page == "8. Results":
+	st.markdown("<div class='section-header'>Build Your Results Table</div>", unsafe_allow_html=True)
+
+	st.markdown("""
+    Upload your dataset to estimate the baseline specification (key variable only) and the specification 
+    with controls, formatted like the sample table above. To try it out, pick one of the worked examples 
+    from the Wooldridge datasets used in the notebooks.
+    """)
+
+	uploaded_results_data = st.file_uploader("Upload your dataset (CSV):", type=['csv'], key="results_data")
+	results_example_title = st.selectbox("...or use a worked example:",
+										 ['None'] + [example.title for example in WORKED_EXAMPLES],
+										 key="results_example")
+
+	results_data, results_example = None, None
+	if uploaded_results_data is not None:
+		results_data = pd.read_csv(uploaded_results_data)
+	elif results_example_title != 'None':
+		results_example = WORKED_EXAMPLES[[example.title for example in WORKED_EXAMPLES].index(results_example_title)]
+		try:
+			results_data = example_data(results_example)
+		except ImportError as error:
+			st.error(str(error))
+
+	if results_data is not None and len(results_data.select_dtypes('number').columns) < 2:
+		st.error("The dataset needs at least two numeric columns: the dependent variable and a key independent "
+				 "variable.")
+		results_data = None
+
+	if results_data is not None:
+		numeric_columns = results_data.select_dtypes('number').columns.tolist()
+
+		col1, col2 = create_columns()
+
+		with col1:
+			outcome_variable = st.selectbox("Dependent variable:", numeric_columns,
+											index=numeric_columns.index(example_outcome(results_example))
+											if results_example else 0)
+			candidate_regressors = [c for c in numeric_columns if c != outcome_variable]
+			key_variable = st.selectbox("Key independent variable:", candidate_regressors,
+										index=candidate_regressors.index(results_example.regressors[0])
+										if results_example and results_example.regressors[0] in candidate_regressors else 0)
+			control_variables = st.multiselect("Control variables:",
+											   [c for c in candidate_regressors if c != key_variable],
+											   default=[c for c in results_example.regressors[1:] if c in candidate_regressors
+														and c != key_variable] if results_example else None)
+			fixed_effect_variables = st.multiselect("Fixed effects to absorb (e.g. County, Year):",
+													[c for c in results_data.columns
+													 if c not in (outcome_variable, key_variable)])
+
+		with col2:
+			se_type = st.selectbox("Standard errors:", COV_TYPES, index=COV_TYPES.index('HC1'))
+			cluster_variable = None
+			if se_type == 'cluster':
+				cluster_variable = st.selectbox("Cluster variable:",
+												[c for c in results_data.columns if c != outcome_variable])
+			ols_solver = st.selectbox("Solver:", SOLVERS)
+
+		specifications = [[key_variable]]
+		if control_variables:
+			specifications.append([key_variable] + control_variables)
+
+		absorption_info = []
+		try:
+			if fixed_effect_variables:
+				# One common sample, so the factor codes are built once for all specifications
+				fe_sample = results_data.dropna(subset=list(dict.fromkeys(
+					[outcome_variable] + specifications[-1] + fixed_effect_variables +
+					([cluster_variable] if cluster_variable else []))))
+				fe_codes = factorize_fixed_effects(fe_sample, fixed_effect_variables)
+				fitted_models = []
+				for regressors in specifications:
+					model, info = fit_absorbed(fe_sample, outcome_variable, regressors, fe_codes,
+											   cov_type=se_type, cluster=cluster_variable)
+					fitted_models.append(model)
+					absorption_info.append(info)
+			else:
+				fitted_models = [
+					fit_ols(results_data, outcome_variable, regressors, cov_type=se_type,
+							cluster=cluster_variable, solver=ols_solver)
+					for regressors in specifications
+				]
+		except (ValueError, np.linalg.LinAlgError) as error:
+			st.error(f"Could not estimate the model: {error}")
+			fitted_models = []
+
+		if fitted_models:
+			controls_row = ['No', 'Yes'][:len(fitted_models)]
+			fe_row = [', '.join(fixed_effect_variables) if fixed_effect_variables else 'No'] * len(fitted_models)
+			user_table = results_table(fitted_models, extra_rows={'Controls': controls_row, 'Fixed Effects': fe_row})
+			model_columns = [c for c in user_table.columns if c != 'Variable']
+
+			table_html = f"<table border='1' class='dataframe'><thead><tr><th>Effect of {key_variable} on {outcome_variable}</th>"
+			table_html += ''.join(f"<th>{c}</th>" for c in model_columns) + "</tr></thead><tbody>"
+			for _, row in user_table.iterrows():
+				table_html += f"<tr><td>{row['Variable']}</td>" + ''.join(f"<td>{row[c]}</td>" for c in model_columns) + "</tr>"
+			table_html += "</tbody></table>"
+			st.markdown(table_html, unsafe_allow_html=True)
+
+			se_note = {
+				'classical': 'Conventional standard errors',
+				'cluster': f'Standard errors clustered by {cluster_variable}'
+			}.get(se_type, f'Heteroskedasticity-robust ({se_type}) standard errors')
+			st.markdown(f"<i>Notes: {se_note} in parentheses. *** p<0.01, ** p<0.05, * p<0.1.</i>",
+						unsafe_allow_html=True)
+
+			if absorption_info:
+				st.markdown(f"Absorbed {absorption_info[-1].absorbed_df:,} fixed-effect parameters; "
+							f"R-squared is the within R-squared.")
+				if not all(info.converged.all() for info in absorption_info):
+					st.warning("Fixed-effect absorption did not converge for some variables; "
+							   "check the diagnostics below.")
+				with st.expander("Absorption diagnostics"):
+					st.dataframe(absorption_table(absorption_info[-1]), use_container_width=True)
+
+			st.markdown(get_table_download_link(user_table.replace('<br>', ' ', regex=True), "results_table.csv",
+												"Download Results Table"), unsafe_allow_html=True)
+
+			col1, col2 = create_columns()
+
+			with col1:
+				st.pyplot(plot_coefficients(fitted_models, key_variable, labels=model_columns,
+											title=f'Effect of {key_variable} Across Specifications'))
+
+			with col2:
+				st.dataframe(coefficient_table(fitted_models[-1]), use_container_width=True)
+
+if selected_page == "8. Results":
+	with st.expander("Estimate on a File Too Large to Upload"):
+		st.markdown("""
+        For datasets that do not fit in memory, give the path of a CSV or Parquet file on this machine. The 
+        file is read in chunks and only the cross-products are kept, so memory does not grow with the number 
+        of rows. Robust (HC) and clustered standard errors take a second pass over the file.
+        """)
+
+		large_file_path = st.text_input("Path to CSV or Parquet file:", key="large_file_path")
+
+		if large_file_path:
+			try:
+				large_file_columns = file_columns(large_file_path)
+			except Exception as error:
+				st.error(f"Could not read the file: {error}")
+				large_file_columns = []
+
+			if large_file_columns:
+				col1, col2 = create_columns()
+
+				with col1:
+					large_outcome = st.selectbox("Dependent variable:", large_file_columns, key="large_outcome")
+					large_regressors = st.multiselect("Independent variables:",
+													  [c for c in large_file_columns if c != large_outcome],
+													  key="large_regressors")
+
+				with col2:
+					large_se_type = st.selectbox("Standard errors:", COV_TYPES, index=COV_TYPES.index('HC1'),
+												 key="large_se_type")
+					large_cluster = None
+					if large_se_type == 'cluster':
+						large_cluster = st.selectbox("Cluster variable:",
+													 [c for c in large_file_columns if c != large_outcome],
+													 key="large_cluster")
+
+				if large_regressors and st.button("Estimate from file"):
+					try:
+						with st.spinner("Streaming the file..."):
+							large_model = fit_ols_file(large_file_path, large_outcome, large_regressors,
+													   cov_type=large_se_type, cluster=large_cluster)
+					except Exception as error:
+						st.error(f"Could not estimate the model: {error}")
+					else:
+						st.markdown(f"**Observations**: {large_model.nobs:,} | **R-squared**: {large_model.rsquared:.3f}")
+						st.dataframe(coefficient_table(large_model), use_container_width=True)
+
 st.markdown("<div class='section-header'>Interpreting Coefficients</div>", unsafe_allow_html=True)
 
 col1, col2 = create_columns()
@@ -2586,6 +3380,88 @@ significance_comparison = pd.DataFrame({
 
 st.dataframe(significance_comparison, use_container_width=True)
 
+if selected_page == "8. Results":
+	with st.expander("Power and Minimum Detectable Effect"):
+		st.markdown("""
+        Before reading an insignificant estimate as a null finding, check what your design could have 
+        detected. Effects are in standard deviations of the outcome. For individual randomization set the 
+        units per cluster to 1. The contour plot shows how the minimum detectable effect (or power) changes 
+        over two design parameters while the others stay at the values below.
+        """)
+
+		col1, col2 = create_columns()
+
+		with col1:
+			power_clusters = st.number_input("Number of clusters:", 4, 100000, 40, key="power_clusters")
+			power_cluster_size = st.number_input("Units per cluster:", 1, 100000, 20, key="power_cluster_size")
+			power_icc = st.slider("Intraclass correlation:", 0.0, 1.0, 0.1, 0.01, key="power_icc")
+
+		with col2:
+			power_share = st.slider("Share treated:", 0.05, 0.95, 0.5, 0.05, key="power_share")
+			power_r2 = st.slider("R-squared from covariates:", 0.0, 0.95, 0.0, 0.05, key="power_r2")
+			power_effect = st.number_input("Effect of interest (SD):", 0.01, 5.0, 0.2, 0.01, key="power_effect")
+
+		power_design = {'n_clusters': power_clusters, 'cluster_size': power_cluster_size, 'icc': power_icc,
+						'treatment_share': power_share, 'r2': power_r2}
+		power_mde = float(mde(**power_design))
+		power_at_effect = float(power(power_effect, **power_design))
+		power_needed = int(required_clusters(power_effect, power_cluster_size, power_icc, power_share, power_r2))
+
+		col1, col2, col3 = st.columns(3)
+		col1.metric("MDE at 80% power (SD)", f"{power_mde:.3f}")
+		col2.metric(f"Power for an effect of {power_effect:g} SD", f"{power_at_effect:.1%}")
+		col3.metric("Clusters needed for 80% power", f"{power_needed:,}")
+
+		power_axes = {
+			'n_clusters': tuple(np.unique(np.geomspace(4, max(4 * power_clusters, 20), 40).round())),
+			'cluster_size': tuple(np.unique(np.geomspace(1, max(4 * power_cluster_size, 10), 40).round())),
+			'icc': tuple(np.linspace(0, 0.5, 41)),
+			'treatment_share': tuple(np.linspace(0.1, 0.9, 33)),
+			'r2': tuple(np.linspace(0, 0.9, 37)),
+		}
+
+		col1, col2, col3 = st.columns(3)
+		with col1:
+			power_kind = st.radio("Plot:", ['Minimum detectable effect', 'Power'], key="power_kind")
+		with col2:
+			power_x = st.selectbox("Horizontal axis:", GRID_PARAMETERS, format_func=PARAMETER_LABELS.get,
+								   key="power_x")
+		with col3:
+			power_y = st.selectbox("Vertical axis:", [p for p in GRID_PARAMETERS if p != power_x], index=1,
+								   format_func=PARAMETER_LABELS.get, key="power_y")
+
+		power_fixed = tuple((name, value) for name, value in power_design.items() if name not in (power_x, power_y))
+		power_png = render_surface('mde' if power_kind == 'Minimum detectable effect' else 'power',
+								   power_y, power_axes[power_y], power_x, power_axes[power_x], power_fixed,
+								   effect=power_effect)
+		st.image(power_png)
+
+		st.markdown("<div class='section-header'>Check by Simulation</div>", unsafe_allow_html=True)
+		st.markdown("""
+        The formula assumes equal cluster sizes and large-sample behaviour of clustered standard errors. 
+        The simulation draws clustered data for the design above, randomizes treatment across clusters, 
+        and counts how often a cluster-robust t-test rejects at the 5% level.
+        """)
+
+		power_replications = st.select_slider("Replications:", [200, 500, 1000, 2000, 5000], 1000,
+											  key="power_replications")
+		available_cpus = os.cpu_count() or 1
+		power_workers = st.slider("Worker processes:", 1, available_cpus, 1, key="power_workers") \
+			if available_cpus > 1 else 1
+
+		power_units = power_clusters * power_cluster_size
+		if power_units > MAX_SIMULATED_UNITS:
+			st.info(f"Simulation is available for designs of up to {MAX_SIMULATED_UNITS:,} units "
+					f"(this design has {power_units:,}). The analytical results above still apply.")
+		elif st.button("Simulate power"):
+			with st.spinner("Simulating..."):
+				simulated = simulate_power(power_effect, power_design, replications=power_replications,
+										   n_jobs=power_workers)
+			st.markdown(f"""
+            Simulated power: **{simulated.power:.1%}** (simulation standard error {simulated.std_error:.1%}); 
+            analytical power: **{simulated.analytical:.1%}**.
+            """)
+
 st.markdown(
 	"<div class='caution'>⚠️ **Caution**: Avoid the common mistake of focusing exclusively on statistical significance (p-values). Economics journals increasingly emphasize effect sizes, confidence intervals, and economic interpretation over simple binary significance testing.</div>",
 	unsafe_allow_html=True)
@@ -2659,6 +3535,66 @@ st.markdown("""
         **Effective Caption**: "Figure 4: Robustness of estimated treatment effects. This figure shows point estimates and 95% confidence intervals for our main treatment effect across different specifications. 'Baseline' is our preferred specification from Table 2, Column 3. 'Alt. Controls' adds additional demographic controls. 'Subsample' restricts to urban areas. 'Alt. Outcome' uses the alternative outcome measure. 'Alt. FE' includes industry-by-year fixed effects. 'Alt. Estimator' uses the Poisson pseudo-maximum likelihood estimator. All specifications yield qualitatively similar results."
         """)
 
+if selected_page == "8. Results" and results_data is not None:
+	with st.expander("Run a Specification Curve on Your Data"):
+		st.markdown("""
+        Declare the choices of your robustness analysis, following the rows of the specification table in 
+        "7. Methodology". Every combination is estimated for the dependent and key variables selected in 
+        "Build Your Results Table".
+        """)
+
+		other_columns = [c for c in results_data.columns if c not in (outcome_variable, key_variable)]
+		numeric_others = [c for c in numeric_columns if c not in (outcome_variable, key_variable)]
+
+		col1, col2 = create_columns(1, 1)
+
+		with col1:
+			base_controls = st.multiselect("Controls in every specification:", numeric_others, key="curve_base")
+			optional_controls = st.multiselect("Optional controls (all combinations):",
+											   [c for c in numeric_others if c not in base_controls],
+											   key="curve_optional")
+			fe_choices = st.multiselect("Fixed-effect variables (each alone and all together):", other_columns,
+										key="curve_fe")
+
+		with col2:
+			cluster_choices = st.multiselect("Clustering variables:", other_columns, key="curve_cluster")
+			sample_input = st.text_area("Sample restrictions (one pandas query per line):", "", key="curve_samples")
+			weight_choices = st.multiselect("Weights for WLS:", numeric_others, key="curve_weights")
+			available_cpus = os.cpu_count() or 1
+			curve_workers = st.slider("Worker processes:", 1, available_cpus, 1) if available_cpus > 1 else 1
+
+		fe_options = {'None': []}
+		fe_options.update({c: [c] for c in fe_choices})
+		if len(fe_choices) > 1:
+			fe_options[', '.join(fe_choices)] = list(fe_choices)
+
+		curve_grid = {
+			'Controls': control_sets(base_controls, optional_controls[:10]),
+			'Fixed Effects': fe_options,
+			'Sample': dict([('Full', None)] + [(q.strip(), q.strip()) for q in sample_input.splitlines() if q.strip()]),
+			'Clustering': dict([('Robust', None)] + [(c, c) for c in cluster_choices]),
+			'Estimator': dict([('OLS', None)] + [(f'WLS ({w})', w) for w in weight_choices])
+		}
+		st.markdown(f"**{len(enumerate_specifications(curve_grid)):,} specifications** "
+					f"(at most 10 optional controls are combined).")
+
+		if st.button("Run specification curve"):
+			curve_progress = st.progress(0)
+			try:
+				curve_results = run_multiverse(
+					results_data, outcome_variable, key_variable, curve_grid, n_jobs=curve_workers,
+					progress=lambda done, total: curve_progress.progress(done / total)
+				)
+			except Exception as error:
+				st.error(f"Could not run the specification curve: {error}")
+			else:
+				st.pyplot(plot_specification_curve(curve_results))
+				share_significant = (curve_results['p-value'] < 0.05).mean()
+				st.markdown(f"The estimate is positive in {(curve_results['Coefficient'] > 0).mean():.0%} "
+							f"and significant at 5% in {share_significant:.0%} of specifications.")
+				st.markdown(get_table_download_link(curve_results, "specification_curve.csv",
+													"Download Specification Results"), unsafe_allow_html=True)
+
 st.markdown("<div class='section-header'>Exploring Heterogeneity and Mechanisms</div>", unsafe_allow_html=True)
 
 st.markdown("""
@@ -2763,22 +3699,7 @@ st.dataframe(mistakes, use_container_width=True)
 
 st.markdown("<div class='section-header'>Results Section Checklist</div>", unsafe_allow_html=True)
 
-results_checklist = """
-    <ul>
-        <li><input type="checkbox"/> Main results clearly presented with appropriate tables/figures</li>
-        <li><input type="checkbox"/> Coefficients interpreted in terms of magnitude, not just significance</li>
-        <li><input type="checkbox"/> Economic significance discussed alongside statistical significance</li>
-        <li><input type="checkbox"/> Results connected to theoretical predictions</li>
-        <li><input type="checkbox"/> Key robustness checks presented and interpreted</li>
-        <li><input type="checkbox"/> Heterogeneity analyses included where appropriate</li>
-        <li><input type="checkbox"/> Potential mechanisms explored</li>
-        <li><input type="checkbox"/> Tables and figures properly formatted with comprehensive notes</li>
-        <li><input type="checkbox"/> Narrative guides reader through key findings</li>
-        <li><input type="checkbox"/> Alternative explanations considered</li>
-    </ul>
-    """
-
-st.markdown(results_checklist, unsafe_allow_html=True)
+render_checklist("results")
 
 st.markdown(
 	"<div class='highlight'>The results section is where your paper's contribution comes alive. Focus on telling a coherent, evidence-based story rather than simply reporting statistical output. Clear presentation, thoughtful interpretation, and connecting findings to theory are what distinguish exceptional economics papers from merely competent ones.</div>",
@@ -3125,22 +4046,7 @@ st.dataframe(mistakes, use_container_width=True)
 
 st.markdown("<div class='section-header'>Discussion Section Checklist</div>", unsafe_allow_html=True)
 
-discussion_checklist = """
-    <ul>
-        <li><input type="checkbox"/> Summary of key findings without merely repeating results</li>
-        <li><input type="checkbox"/> Connection of empirical results to theoretical framework</li>
-        <li><input type="checkbox"/> Comparison with previous literature, noting agreements and differences</li>
-        <li><input type="checkbox"/> Honest discussion of limitations and their implications</li>
-        <li><input type="checkbox"/> Well-justified policy or practical implications</li>
-        <li><input type="checkbox"/> Specific suggestions for future research</li>
-        <li><input type="checkbox"/> Balanced tone that acknowledges both strengths and constraints</li>
-        <li><input type="checkbox"/> No introduction of new results</li>
-        <li><input type="checkbox"/> Appropriate emphasis on most important implications</li>
-        <li><input type="checkbox"/> Clear connection to original research question</li>
-    </ul>
-    """
-
-st.markdown(discussion_checklist, unsafe_allow_html=True)
+render_checklist("discussion")
 
 st.markdown(
 	"<div class='highlight'>The discussion section is your opportunity to demonstrate scholarly depth and connect your specific findings to broader economic understanding. Done well, it transforms a competent empirical exercise into a meaningful contribution to economic knowledge.</div>",
@@ -3404,22 +4310,7 @@ st.dataframe(mistakes, use_container_width=True)
 
 st.markdown("<div class='section-header'>Conclusion Checklist</div>", unsafe_allow_html=True)
 
-conclusion_checklist = """
-    <ul>
-        <li><input type="checkbox"/> Brief restatement of research question</li>
-        <li><input type="checkbox"/> Concise mention of methodological approach</li>
-        <li><input type="checkbox"/> Summary of 2-3 key findings with specific magnitudes</li>
-        <li><input type="checkbox"/> Clear statement of main contribution</li>
-        <li><input type="checkbox"/> Indication of broader significance or implications</li>
-        <li><input type="checkbox"/> Strong closing sentence with lasting impression</li>
-        <li><input type="checkbox"/> Appropriate length (typically 1-2 paragraphs)</li>
-        <li><input type="checkbox"/> No new information or analyses</li>
-        <li><input type="checkbox"/> No excessive detail or technical aspects</li>
-        <li><input type="checkbox"/> No ending with limitations or hedging</li>
-    </ul>
-    """
-
-st.markdown(conclusion_checklist, unsafe_allow_html=True)
+render_checklist("conclusion")
 
 st.markdown(
 	"<div class='highlight'>Your conclusion is the last impression readers will have of your paper. A concise, powerful conclusion reinforces your key findings and contribution, leaving readers with a clear understanding of why your paper matters.</div>",
@@ -3863,22 +4754,7 @@ st.markdown("""
 
 st.markdown("<div class='section-header'>Reference and Citation Checklist</div>", unsafe_allow_html=True)
 
-ref_checklist = """
-    <ul>
-        <li><input type="checkbox"/> All in-text citations follow journal's required format</li>
-        <li><input type="checkbox"/> Every in-text citation has a corresponding reference entry</li>
-        <li><input type="checkbox"/> All references are in the correct format for the target journal</li>
-        <li><input type="checkbox"/> References are in alphabetical order by first author's last name</li>
-        <li><input type="checkbox"/> Multiple works by same author are in chronological order</li>
-        <li><input type="checkbox"/> All journal names, page ranges, and publication details are complete</li>
-        <li><input type="checkbox"/> DOIs or URLs are included when available</li>
-        <li><input type="checkbox"/> Data sources are properly cited</li>
-        <li><input type="checkbox"/> Software and code citations are included where appropriate</li>
-        <li><input type="checkbox"/> Citation style is consistent throughout the paper</li>
-    </ul>
-    """
-
-st.markdown(ref_checklist, unsafe_allow_html=True)
+render_checklist("references")
 
 st.markdown(
 	"<div class='highlight'>Proper citation is not just about avoiding plagiarism—it's about positioning your work within the scholarly conversation and giving credit to those whose work has influenced yours. In economics, careful citation practices signal your professionalism and familiarity with the literature in your field.</div>",
@@ -3992,6 +4868,96 @@ journal_tiers = pd.DataFrame({
 
 st.dataframe(journal_tiers, use_container_width=True)
 
+if selected_page == "12. Submission Process":
+	with st.expander("Find Journals That Fit Your Paper"):
+		st.markdown("""
+        Paste your title, abstract, keywords and JEL codes to rank journals by how closely their published 
+        work matches yours. Without a corpus, journals are profiled from their names and JEL areas; upload a CSV 
+        of published abstracts (columns **Journal**, **Title**, **Abstract** and optionally **JEL Codes**) for 
+        profiles built from what each journal actually publishes.
+        """)
+
+		uploaded_fit_corpus = st.file_uploader("Upload an abstract corpus (CSV):", type=['csv'], key="fit_corpus")
+
+		col1, col2 = create_columns()
+
+		with col1:
+			fit_title = st.text_input("Title:", "Monetary Policy Shocks and Household Inflation Expectations",
+									  key="fit_title")
+			fit_abstract = st.text_area("Abstract:", "We estimate how surprise changes in the policy rate move the "
+									   "inflation expectations of households, using high-frequency identification.",
+									   height=150, key="fit_abstract")
+
+		with col2:
+			fit_keywords = st.text_input("Keywords (comma-separated):", "monetary policy, inflation expectations",
+										 key="fit_keywords")
+			fit_jel = st.text_input("JEL codes (comma-separated):", "E52, E31", key="fit_jel")
+			fit_weight = st.slider("Weight on text (vs. JEL codes):", 0.0, 1.0, DEFAULT_TEXT_WEIGHT, 0.05,
+								   key="fit_weight")
+			fit_tiers = st.multiselect("Only these tiers:", JOURNAL_TIERS, key="fit_tiers")
+
+		try:
+			fit_profiles = profiles_from_csv(uploaded_fit_corpus.getvalue()) if uploaded_fit_corpus is not None \
+				else default_profiles()
+			fit_shortlist = recommend(fit_profiles, fit_title, fit_abstract, split_items(fit_keywords),
+									  split_items(fit_jel), text_weight=fit_weight, top=15, tiers=fit_tiers)
+		except (ImportError, ValueError) as error:
+			st.error(str(error))
+			fit_shortlist = None
+
+		if fit_shortlist is not None:
+			if uploaded_fit_corpus is not None:
+				st.markdown(f"Profiles built from {fit_profiles.documents:,} abstracts in {len(fit_profiles.journals):,} journals.")
+			st.dataframe(fit_shortlist.style.format({'Fit': '{:.3f}', 'Text Fit': '{:.3f}', 'JEL Fit': '{:.3f}',
+													 'Acceptance Rate': '{:.0%}', 'Impact Factor': '{:.2f}'},
+													na_rep='-'), use_container_width=True)
+			st.download_button("📥 Download Shortlist", fit_shortlist.to_csv(index=False), "journal_shortlist.csv")
+			st.markdown(
+				"<div class='tip'>Fit measures topical overlap only. Combine it with the tier and acceptance rates, and use the shortlist in the submission-order optimizer below.</div>",
+				unsafe_allow_html=True)
+
+	with st.expander("Find the Best Submission Order"):
+		st.markdown("""
+        Given your view of the paper's quality and how much you value time, the optimizer picks which journals 
+        to try and in what order. An acceptance is worth its tier weight, discounted by the years it takes; a 
+        rejection also teaches you something about the paper, which the optimizer accounts for when choosing 
+        the next journal.
+        """)
+
+		strategy_journals = st.multiselect("Journals you would consider:", JOURNAL_PROFILES['Journal'].tolist(),
+										   default=JOURNAL_PROFILES['Journal'].tolist(), key="strategy_journals")
+
+		col1, col2 = create_columns()
+
+		with col1:
+			strategy_quality = st.slider("Paper quality (shift in log-odds of an R&R):", -2.0, 2.0, 0.0, 0.1,
+										 key="strategy_quality")
+			strategy_quality_sd = st.slider("Uncertainty about quality:", 0.0, 2.0, 0.5, 0.1, key="strategy_quality_sd")
+			strategy_discount = st.slider("Value of an acceptance one year later (vs. today):", 0.5, 1.0,
+										  DEFAULT_DISCOUNT, 0.01, key="strategy_discount")
+			strategy_max = st.slider("Maximum number of submissions:", 1, max(len(strategy_journals), 1),
+									 min(6, max(len(strategy_journals), 1)), key="strategy_max") \
+				if len(strategy_journals) > 1 else 1
+
+		with col2:
+			strategy_weights = {tier: st.number_input(f"Weight of a {tier} publication:", 0.0, 1.0, weight, 0.05,
+													  key=f"strategy_weight_{tier}")
+								for tier, weight in TIER_WEIGHTS.items()}
+
+		if strategy_journals:
+			strategy = optimize_ladder(strategy_journals, strategy_quality, strategy_quality_sd, strategy_discount,
+									   strategy_weights, strategy_max)
+
+			col1, col2, col3 = st.columns(3)
+			col1.metric("Expected discounted tier weight", f"{strategy.value:.3f}")
+			col2.metric("Chance of acceptance", f"{strategy.acceptance:.1%}")
+			col3.metric("Expected months to acceptance",
+						f"{strategy.expected_months:.0f}" if not np.isnan(strategy.expected_months) else "–")
+
+			st.dataframe(strategy.timeline, use_container_width=True)
+			st.download_button("📥 Download Submission Plan", strategy.timeline.to_csv(index=False),
+							   "submission_plan.csv")
+
 st.markdown("<div class='section-header'>Preparing Your Manuscript</div>", unsafe_allow_html=True)
 
 col1, col2 = create_columns()
@@ -4265,24 +5231,63 @@ st.markdown("""
     Plan your submission strategy accordingly, especially if you have career milestones like job market or tenure reviews.
     """)
 
-st.markdown("<div class='section-header'>Submission Checklist</div>", unsafe_allow_html=True)
+if selected_page == "12. Submission Process":
+	with st.expander("Simulate Your Submission Ladder"):
+		st.markdown("""
+        Choose the journals you would try, in order. Each simulated paper is desk rejected, rejected after 
+        review, or gets an R&R that succeeds or fails, with probabilities from the acceptance and R&R success 
+        rates above and stage lengths from the timeline. Rejected papers move to the next journal.
+        """)
 
-submission_checklist = """
-    <ul>
-        <li><input type="checkbox"/> Manuscript formatted according to journal guidelines</li>
-        <li><input type="checkbox"/> Abstract, keywords, and JEL codes prepared</li>
-        <li><input type="checkbox"/> Tables and figures properly formatted and numbered</li>
-        <li><input type="checkbox"/> References formatted according to journal style</li>
-        <li><input type="checkbox"/> Supplementary materials organized (appendices, data, code)</li>
-        <li><input type="checkbox"/> Cover letter drafted addressing the appropriate editor</li>
-        <li><input type="checkbox"/> All co-authors have approved the submission</li>
-        <li><input type="checkbox"/> Contact information for all authors is up-to-date</li>
-        <li><input type="checkbox"/> Any potential conflicts of interest disclosed</li>
-        <li><input type="checkbox"/> Final proofread for typos and formatting errors</li>
-    </ul>
-    """
+		ladder = st.multiselect("Journal ladder (in order of submission):", JOURNAL_PROFILES['Journal'].tolist(),
+								default=['American Economic Review', 'Review of Economics and Statistics',
+										 'Journal of Development Economics', 'Journal of Urban Economics'],
+								key="cascade_ladder")
+
+		col1, col2 = create_columns()
+
+		with col1:
+			cascade_quality = st.slider("Paper quality (shift in log-odds of an R&R):", -2.0, 2.0, 0.0, 0.1,
+										key="cascade_quality")
+			cascade_quality_sd = st.slider("Uncertainty about quality:", 0.0, 2.0, 0.5, 0.1, key="cascade_quality_sd")
+			cascade_paths = st.select_slider("Simulated papers:", [100_000, 250_000, 500_000, 1_000_000, 2_000_000],
+											 1_000_000, key="cascade_paths")
+
+		with col2:
+			cascade_review = st.slider("Months to first decision:", 1.0, 12.0, DEFAULT_TIMING.review, 0.5,
+									   key="cascade_review")
+			cascade_revision = st.slider("Months to revise:", 1.0, 12.0, DEFAULT_TIMING.revision, 0.5,
+										 key="cascade_revision")
+			cascade_second = st.slider("Months to second decision:", 1.0, 12.0, DEFAULT_TIMING.second_decision, 0.5,
+									   key="cascade_second")
+
+		if ladder:
+			cascade_timing = DEFAULT_TIMING._replace(review=cascade_review, revision=cascade_revision,
+													 second_decision=cascade_second)
+			cascade = simulate_cascade(ladder, cascade_paths, cascade_quality, cascade_quality_sd, cascade_timing)
+			cascade_accepted = ~np.isnan(cascade.months)
+
+			col1, col2, col3 = st.columns(3)
+			col1.metric("Accepted somewhere on the ladder", f"{cascade_accepted.mean():.1%}")
+			col2.metric("Median months to acceptance",
+						f"{np.median(cascade.months[cascade_accepted]):.0f}" if cascade_accepted.any() else "–")
+			col3.metric("Average submissions", f"{cascade.submissions.mean():.1f}")
+
+			st.pyplot(plot_cascade(cascade))
+
+			col1, col2 = create_columns()
+			with col1:
+				st.dataframe(cascade_table(cascade), use_container_width=True)
+			with col2:
+				st.dataframe(time_quantiles(cascade), use_container_width=True)
+
+			st.markdown(
+				"<div class='tip'>💡 **Tip**: Compare ladders with the same quality setting. Starting higher raises the chance of a top placement but adds months for every rejection along the way.</div>",
+				unsafe_allow_html=True)
+
+st.markdown("<div class='section-header'>Submission Checklist</div>", unsafe_allow_html=True)
 
-st.markdown(submission_checklist, unsafe_allow_html=True)
+render_checklist("submission")
 
 st.markdown(
 	"<div class='highlight'>The submission process in economics requires patience and persistence. Top journals have high rejection rates, and even eventually successful papers often go through multiple submissions and revisions. View this process as an opportunity to refine and strengthen your work through expert feedback.</div>",
@@ -4443,6 +5448,91 @@ ax.set_title('Comment Classification Framework')
 plt.tight_layout()
 st.pyplot(fig)
 
+if selected_page == "13. Responding to Reviewers":
+	st.markdown("<div class='section-header'>Triage Your Referee Reports</div>", unsafe_allow_html=True)
+
+	st.markdown("""
+    Paste the decision letter and referee reports below. Start each report with a header such as 
+    "Reviewer 1" or "Referee #2"; numbered items and paragraphs are split into individual comments 
+    and placed on the Comment Classification Framework.
+    """)
+
+	reports_input = st.text_area("Paste referee reports:", height=250, key=workspace_draft("referee_reports"),
+								 on_change=save_draft, args=("referee_reports",))
+
+	if reports_input.strip():
+		triaged = triage_reports(reports_input)
+		st.session_state["triaged_comments"] = triaged
+
+		col1, col2 = create_columns(3, 2)
+
+		with col1:
+			st.pyplot(plot_triage_matrix(triaged))
+
+		with col2:
+			quadrant_counts = triaged['Quadrant'].value_counts().reindex(QUADRANTS, fill_value=0)
+			st.dataframe(quadrant_counts.rename('Comments'), use_container_width=True)
+			st.dataframe(triaged.groupby('Reviewer').size().rename('Comments'), use_container_width=True)
+
+		st.dataframe(triaged, use_container_width=True)
+		st.markdown(get_table_download_link(triaged, "comment_triage.csv", "Download Comment Triage"),
+					unsafe_allow_html=True)
+
+		st.markdown("<div class='section-header'>Build Your Response Letter</div>", unsafe_allow_html=True)
+
+		st.markdown("""
+    Enter your reply and the location of the change (e.g. "page 12, Section 4.2") for each comment. 
+    Replies are kept when you edit or reorder the pasted reports.
+    """)
+
+		replies = st.session_state.setdefault("comment_replies", {})
+		keys = comment_keys(triaged['Reviewer'], triaged['Text'])
+		reply_table = triaged[['Reviewer', 'Comment', 'Quadrant', 'Text']].copy()
+		reply_table['Response'] = [replies.get(k, {}).get('Response', '') for k in keys]
+		reply_table['Location'] = [replies.get(k, {}).get('Location', '') for k in keys]
+
+		edited_replies = st.data_editor(
+			reply_table,
+			disabled=['Reviewer', 'Comment', 'Quadrant', 'Text'],
+			use_container_width=True,
+			key="reply_editor"
+		)
+		for k, response, location in zip(keys, edited_replies['Response'], edited_replies['Location']):
+			replies[k] = {'Response': response or '', 'Location': location or ''}
+
+		col1, col2 = create_columns()
+
+		with col1:
+			letter_title = st.text_input("Manuscript title:", "[Title]")
+			letter_number = st.text_input("Manuscript number:", "[Number]")
+			letter_editor = st.text_input("Editor:", "[Editor Name]")
+			letter_journal = st.text_input("Journal:", "[Journal Name]")
+			letter_authors = st.text_input("Authors:", "[Authors]")
+
+		with col2:
+			letter_focus = st.text_input("Main editorial concerns addressed:", "")
+			letter_changes = st.text_area("Additional changes (one per line):", height=120)
+			letter_format = st.selectbox("Output format:", LETTER_FORMATS)
+
+		letter_blocks = build_letter_blocks(
+			triaged, replies, title=letter_title, manuscript_number=letter_number,
+			editor=letter_editor, journal=letter_journal, authors=letter_authors,
+			editorial_focus=letter_focus, additional_changes=letter_changes.splitlines()
+		)
+		letter = render_letter(letter_blocks, letter_format)
+
+		if letter_format == 'DOCX':
+			st.download_button("📥 Download Response Letter", letter, "response_letter.docx",
+							   "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+		else:
+			with st.expander("Preview Response Letter"):
+				if letter_format == 'Markdown':
+					st.markdown(letter)
+				else:
+					st.code(letter, language='latex')
+			extension = 'md' if letter_format == 'Markdown' else 'tex'
+			st.download_button("📥 Download Response Letter", letter, f"response_letter.{extension}")
+
 st.markdown("<div class='section-header'>Response Letter Structure</div>", unsafe_allow_html=True)
 
 st.markdown("""
@@ -4681,22 +5771,7 @@ st.markdown("""
 
 st.markdown("<div class='section-header'>Reviewer Response Checklist</div>", unsafe_allow_html=True)
 
-response_checklist = """
-    <ul>
-        <li><input type="checkbox"/> Created point-by-point response addressing every comment</li>
-        <li><input type="checkbox"/> Implemented all feasible requested changes</li>
-        <li><input type="checkbox"/> Provided clear justification for any disagreements</li>
-        <li><input type="checkbox"/> Referenced specific page numbers and sections for changes</li>
-        <li><input type="checkbox"/> Highlighted or marked changes in the manuscript</li>
-        <li><input type="checkbox"/> Addressed editor's comments with particular attention</li>
-        <li><input type="checkbox"/> Used respectful, professional tone throughout</li>
-        <li><input type="checkbox"/> Explained how changes improve the paper</li>
-        <li><input type="checkbox"/> Checked that response letter is well-organized and comprehensive</li>
-        <li><input type="checkbox"/> Verified that all attachments and supplementary materials are included</li>
-    </ul>
-    """
-
-st.markdown(response_checklist, unsafe_allow_html=True)
+render_checklist("response")
 
 st.markdown(
 	"<div class='highlight'>The revision process is an opportunity to significantly strengthen your paper. Even when you disagree with specific comments, consider the underlying concerns that motivated them. Reviewers and editors want to help you produce the best possible version of your work, and taking their feedback seriously demonstrates your commitment to scholarly rigor.</div>",
@@ -0,0 +1,224 @@
+from collections import namedtuple
+
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from workspace import get_all, put, delete
+
+# Chapter checklists of the guide, kept as data so the app can render them
+# as real checkboxes and save them in the user's workspace (see
+# workspace.py). Each checked item is one value of kind 'checklist' named
+# "<checklist>:<item index>"; unchecking deletes it. Ticking a box therefore
+# writes one key, whatever the number of checklists.
+#
+# A workspace's checklist state is read once (one query for every item) into
+# a Progress: the set of checked item keys and the number of checked items
+# per checklist. Toggling an item updates both in place, so the completion
+# dashboard reads the counts instead of recounting every checklist.
+
+# A checklist: its title, the page it appears on and its items
+Checklist = namedtuple('Checklist', ['title', 'page', 'items'])
+
+# Checked item keys and checked items per checklist (both updated in place)
+Progress = namedtuple('Progress', ['checked', 'counts'])
+
+CHECKLISTS = {
+	'preliminary': Checklist('Preliminary Research Checklist', '2. Preliminary Research', [
+		'Clearly defined research question with specific scope',
+		'Comprehensive literature map with identified gaps',
+		'Assessed data availability and quality',
+		'Evaluated methodological options and requirements',
+		'Articulated specific contribution statement',
+		'Identified target journals and their requirements',
+		'Created detailed project timeline with milestones',
+		'Secured necessary resources (data access, software, etc.)',
+		'Obtained feedback on research design from colleagues',
+		'Conducted pilot testing of key analytical approaches',
+	]),
+	'abstract': Checklist('Abstract Checklist', '4. Title & Abstract', [
+		'Clearly states the research question or objective',
+		'Identifies key variables and relationships studied',
+		'Mentions data sources and sample characteristics',
+		'Explains methodology and empirical strategy',
+		'Reports specific results with magnitudes (not just direction)',
+		'Indicates statistical and economic significance',
+		'Articulates main contribution or advance over prior work',
+		'Notes key implications for theory, policy, or practice',
+		"Stays within journal's word limit (typically 150-250 words)",
+		'Contains no citations, tables, or figures',
+	]),
+	'introduction': Checklist('Introduction Checklist', '5. Introduction', [
+		'Research question clearly stated in first or second paragraph',
+		'Importance of the question established (theoretical or practical)',
+		'Relevant background or context provided',
+		'Key literature positioned thematically with specific gaps identified',
+		'Data sources and methodological approach previewed',
+		'Identification strategy explained (for causal papers)',
+		'Key findings presented with specific magnitudes',
+		'Contribution statement explicitly articulated',
+		'Paper roadmap included in final paragraph',
+		'Introduction length appropriate for journal (typically 4-7 pages)',
+	]),
+	'literature': Checklist('Literature Review Checklist', '6. Literature Review', [
+		'Covers seminal papers in the field',
+		'Includes recent literature (last 5-10 years)',
+		'Organized thematically rather than chronologically',
+		'Critically engages with methodologies and findings',
+		'Identifies specific limitations or gaps in existing research',
+		'Connects literature discussion directly to your contribution',
+		'Balanced treatment of competing perspectives',
+		'Appropriate depth for most relevant papers',
+		'Avoids excessive breadth on tangential topics',
+		'Synthesizes patterns and trends rather than just summarizing',
+	]),
+	'methodology': Checklist('Methodology Checklist', '7. Methodology', [
+		'Theoretical framework clearly articulated',
+		'Data sources and sample construction fully described',
+		'Key variables precisely defined',
+		'Summary statistics for all important variables provided',
+		'Econometric specifications presented with clear notation',
+		'Identification strategy explicitly discussed',
+		'Key identifying assumptions stated and justified',
+		'Potential endogeneity concerns addressed',
+		'Robustness checks described',
+		'Treatment of standard errors and clustering explained',
+	]),
+	'results': Checklist('Results Section Checklist', '8. Results', [
+		'Main results clearly presented with appropriate tables/figures',
+		'Coefficients interpreted in terms of magnitude, not just significance',
+		'Economic significance discussed alongside statistical significance',
+		'Results connected to theoretical predictions',
+		'Key robustness checks presented and interpreted',
+		'Heterogeneity analyses included where appropriate',
+		'Potential mechanisms explored',
+		'Tables and figures properly formatted with comprehensive notes',
+		'Narrative guides reader through key findings',
+		'Alternative explanations considered',
+	]),
+	'discussion': Checklist('Discussion Section Checklist', '9. Discussion', [
+		'Summary of key findings without merely repeating results',
+		'Connection of empirical results to theoretical framework',
+		'Comparison with previous literature, noting agreements and differences',
+		'Honest discussion of limitations and their implications',
+		'Well-justified policy or practical implications',
+		'Specific suggestions for future research',
+		'Balanced tone that acknowledges both strengths and constraints',
+		'No introduction of new results',
+		'Appropriate emphasis on most important implications',
+		'Clear connection to original research question',
+	]),
+	'conclusion': Checklist('Conclusion Checklist', '10. Conclusion', [
+		'Brief restatement of research question',
+		'Concise mention of methodological approach',
+		'Summary of 2-3 key findings with specific magnitudes',
+		'Clear statement of main contribution',
+		'Indication of broader significance or implications',
+		'Strong closing sentence with lasting impression',
+		'Appropriate length (typically 1-2 paragraphs)',
+		'No new information or analyses',
+		'No excessive detail or technical aspects',
+		'No ending with limitations or hedging',
+	]),
+	'references': Checklist('Reference and Citation Checklist', '11. References & Citations', [
+		"All in-text citations follow journal's required format",
+		'Every in-text citation has a corresponding reference entry',
+		'All references are in the correct format for the target journal',
+		"References are in alphabetical order by first author's last name",
+		'Multiple works by same author are in chronological order',
+		'All journal names, page ranges, and publication details are complete',
+		'DOIs or URLs are included when available',
+		'Data sources are properly cited',
+		'Software and code citations are included where appropriate',
+		'Citation style is consistent throughout the paper',
+	]),
+	'submission': Checklist('Submission Checklist', '12. Submission Process', [
+		'Manuscript formatted according to journal guidelines',
+		'Abstract, keywords, and JEL codes prepared',
+		'Tables and figures properly formatted and numbered',
+		'References formatted according to journal style',
+		'Supplementary materials organized (appendices, data, code)',
+		'Cover letter drafted addressing the appropriate editor',
+		'All co-authors have approved the submission',
+		'Contact information for all authors is up-to-date',
+		'Any potential conflicts of interest disclosed',
+		'Final proofread for typos and formatting errors',
+	]),
+	'response': Checklist('Reviewer Response Checklist', '13. Responding to Reviewers', [
+		'Created point-by-point response addressing every comment',
+		'Implemented all feasible requested changes',
+		'Provided clear justification for any disagreements',
+		'Referenced specific page numbers and sections for changes',
+		'Highlighted or marked changes in the manuscript',
+		"Addressed editor's comments with particular attention",
+		'Used respectful, professional tone throughout',
+		'Explained how changes improve the paper',
+		'Checked that response letter is well-organized and comprehensive',
+		'Verified that all attachments and supplementary materials are included',
+	]),
+}
+
+TOTAL_ITEMS = sum(len(checklist.items) for checklist in CHECKLISTS.values())
+
+
+# Function to return the stored name of a checklist item
+def item_key(name, index):
+	return f'{name}:{index}'
+
+
+# Function to read a workspace's checklist state in one query. Items of
+# checklists or indexes that no longer exist are ignored.
+def load_progress(workspace, path=None):
+	checked = set()
+	counts = dict.fromkeys(CHECKLISTS, 0)
+	for key in get_all(workspace, 'checklist', path):
+		name, _, index = key.rpartition(':')
+		if name in CHECKLISTS and index.isdigit() and int(index) < len(CHECKLISTS[name].items):
+			checked.add(key)
+			counts[name] += 1
+	return Progress(checked, counts)
+
+
+# Function to check or uncheck one item: writes (or deletes) that item only
+# and moves its checklist's count by one. Returns whether anything changed.
+def set_item(progress, workspace, name, index, done, path=None):
+	key = item_key(name, index)
+	if done == (key in progress.checked):
+		return False
+	if done:
+		progress.checked.add(key)
+		put(workspace, 'checklist', key, True, path)
+	else:
+		progress.checked.discard(key)
+		delete(workspace, 'checklist', key, path)
+	progress.counts[name] += 1 if done else -1
+	return True
+
+
+# Function to summarize progress per checklist (page order) from the counts
+def progress_table(progress):
+	rows = [(checklist.page, checklist.title, progress.counts[name], len(checklist.items))
+			for name, checklist in CHECKLISTS.items()]
+	table = pd.DataFrame(rows, columns=['Page', 'Checklist', 'Done', 'Items'])
+	table['Completion (%)'] = 100.0 * table['Done'] / table['Items']
+	return table
+
+
+# Function to return the overall share of checked items (0 to 1)
+def overall_completion(progress):
+	return sum(progress.counts.values()) / TOTAL_ITEMS
+
+
+# Function to plot completion per checklist as horizontal bars
+def plot_progress(table):
+	fig, ax = plt.subplots(figsize=(10, 6))
+	labels = table['Checklist'].str.replace(' Checklist', '', regex=False)
+	ax.barh(labels, 100, color='#E5E7EB')
+	ax.barh(labels, table['Completion (%)'], color='#3B82F6')
+	for position, (done, items) in enumerate(zip(table['Done'], table['Items'])):
+		ax.text(101, position, f'{done}/{items}', va='center', fontsize=9)
+	ax.invert_yaxis()
+	ax.set_xlim(0, 110)
+	ax.set_xlabel('Completion (%)')
+	ax.set_title('Checklist Progress')
+	fig.tight_layout()
+	return fig
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+# Multicollinearity diagnostics for the "7. Methodology" page.
+# All VIFs come from one factorization: VIF_j is the j-th diagonal element
+# of the inverse correlation matrix of the regressors, which equals
+# 1 / (1 - R^2_j) from the auxiliary regression of x_j on the other
+# regressors and a constant. This replaces K separate auxiliary fits with a
+# single K x K Cholesky.
+
+# Conventional rule of thumb: VIFs below 5 are low to moderate, 5-10 high
+# and above 10 serious
+VIF_LEVELS = [(10.0, 'Serious'), (5.0, 'High'), (0.0, 'Low/Moderate')]
+CONDITION_NUMBER_LIMIT = 30.0
+
+
+def _vif_level(vif):
+	for threshold, label in VIF_LEVELS:
+		if vif >= threshold:
+			return label
+	return 'None'
+
+
+# Function to compute the correlation matrix from a centered cross-product
+def _correlation(cov):
+	sd = np.sqrt(np.diag(cov))
+	constant = sd == 0
+	sd[constant] = 1.0
+	return cov / np.outer(sd, sd), constant
+
+
+# Function to return diag(R^-1) using a Cholesky factorization; columns in
+# an exact linear dependency get an infinite VIF
+def inverse_diagonal(R, tol=1e-10):
+	try:
+		L = np.linalg.cholesky(R)
+		if np.min(np.diag(L)) > np.sqrt(tol):
+			L_inv = np.linalg.inv(L)
+			return np.einsum('ij,ij->j', L_inv, L_inv)
+	except np.linalg.LinAlgError:
+		pass
+	# Singular: columns loading on the null space are perfectly collinear
+	eigenvalues, eigenvectors = np.linalg.eigh(R)
+	null = eigenvalues < tol * max(eigenvalues.max(), 1.0)
+	vif = np.einsum('ij,j,ij->i', eigenvectors[:, ~null], 1.0 / eigenvalues[~null], eigenvectors[:, ~null])
+	collinear = np.abs(eigenvectors[:, null]).max(axis=1) > 1e-6 if null.any() else np.zeros(len(R), bool)
+	vif[collinear] = np.inf
+	return vif
+
+
+# Function to compute the scaled condition number of the design (Belsley):
+# columns of [1, X] scaled to unit length
+def condition_number(XtX):
+	d = np.sqrt(np.diag(XtX))
+	d[d == 0] = 1.0
+	eigenvalues = np.linalg.eigvalsh(XtX / np.outer(d, d))
+	smallest = max(eigenvalues.min(), 0.0)
+	return np.inf if smallest == 0 else float(np.sqrt(eigenvalues.max() / smallest))
+
+
+# Function to run all diagnostics from moments: n, the column means and the
+# centered cross-product (co-moment) matrix of the regressors
+def diagnostics_from_moments(n, means, comoments, names):
+	if n <= 0:
+		raise ValueError("The diagnostics need at least one observation")
+	means = np.asarray(means, dtype=float)
+	comoments = np.asarray(comoments, dtype=float)
+	R, constant = _correlation(comoments / n)
+	R[constant, :] = 0.0
+	R[:, constant] = 0.0
+	R[constant, constant] = 1.0
+
+	vif = inverse_diagonal(R)
+	# A column without variation is collinear with the intercept
+	vif[constant] = np.inf
+
+	# Uncentered cross-product of [1, X] for the condition number
+	k = len(names)
+	augmented = np.empty((k + 1, k + 1))
+	augmented[0, 0] = n
+	augmented[0, 1:] = augmented[1:, 0] = n * means
+	augmented[1:, 1:] = comoments + n * np.outer(means, means)
+
+	with np.errstate(divide='ignore'):
+		auxiliary_r2 = 1.0 - 1.0 / vif
+	table = pd.DataFrame({
+		'Variable': list(names),
+		'VIF': vif,
+		'Auxiliary R-squared': auxiliary_r2,
+		'Multicollinearity': [_vif_level(v) for v in vif]
+	})
+	return table, condition_number(augmented)
+
+
+# Function to compute VIFs for the given columns of a DataFrame (listwise
+# deletion of missing values, as in the regressions). Raises ValueError when
+# no row is complete.
+def vif_table(data, columns):
+	X = data[list(columns)].dropna().to_numpy(dtype=float)
+	if not len(X):
+		raise ValueError("No observations are left after dropping rows with missing values")
+	means = X.mean(axis=0)
+	centered = X - means
+	return diagnostics_from_moments(len(X), means, centered.T @ centered, list(columns))
+
+
+# Function to list columns that need attention, for the methodology checklist
+def problem_columns(table, level='High'):
+	levels = [label for _, label in VIF_LEVELS]
+	flagged = levels[:levels.index(level) + 1]
+	return table.loc[table['Multicollinearity'].isin(flagged), 'Variable'].tolist()
@@ -0,0 +1,131 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+
+try:
+	import wooldridge as _wooldridge
+	# Keep the package's own reader; install() replaces wooldridge.data
+	_read_source = _wooldridge.data
+except ImportError:
+	_wooldridge = None
+
+try:
+	import pyarrow.feather as _feather
+except ImportError:
+	_feather = None
+
+# Local cache for the Wooldridge datasets used in the notebooks. The
+# wooldridge package ships bz2-compressed CSV files and re-parses them on
+# every wool.data() call. Here each dataset is parsed once, written as an
+# uncompressed Feather (Arrow IPC) file, and later loads memory-map that
+# file: numeric columns are handed to pandas without copying, and the OS
+# shares the pages between processes. Within a process, loaded frames are
+# memoized, so repeated loads cost a shallow copy.
+#
+# The cache directory defaults to ~/.cache/acad_datasets and can be moved
+# with the ACAD_DATASET_CACHE environment variable. Files are keyed on the
+# wooldridge package version, so an upgrade rebuilds them.
+
+CACHE_DIR = os.environ.get('ACAD_DATASET_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'acad_datasets'))
+
+WorkedExample = namedtuple('WorkedExample', ['title', 'dataset', 'outcome', 'regressors', 'log_outcome'])
+
+# Regressions estimated in "Ch3. Multiple Regression Analysis - Estimation"
+WORKED_EXAMPLES = [
+	WorkedExample('College GPA (gpa1)', 'gpa1', 'colGPA', ['hsGPA', 'ACT'], False),
+	WorkedExample('Log wage (wage1)', 'wage1', 'wage', ['educ', 'exper', 'tenure'], True),
+	WorkedExample('401(k) participation (401k)', '401k', 'prate', ['mrate', 'age'], False),
+	WorkedExample('Arrests without avgsen (crime1)', 'crime1', 'narr86', ['pcnv', 'ptime86', 'qemp86'], False),
+	WorkedExample('Arrests with avgsen (crime1)', 'crime1', 'narr86', ['pcnv', 'avgsen', 'ptime86', 'qemp86'], False),
+]
+
+_MEMO = {}
+
+
+def _version():
+	return getattr(_wooldridge, '__version__', 'unknown')
+
+
+# Function to return the cache file path of a dataset
+def cache_path(name):
+	return os.path.join(CACHE_DIR, f'{name}-{_version()}.feather')
+
+
+def _parse(name):
+	if _wooldridge is None:
+		raise ImportError("The example datasets require the wooldridge package (pip install wooldridge)")
+	return _read_source(name)
+
+
+def _write(frame, path):
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	# Write to a temporary file first so concurrent readers never see a partial file
+	temporary = f'{path}.{os.getpid()}.tmp'
+	_feather.write_feather(frame.reset_index(drop=True), temporary, compression='uncompressed')
+	os.replace(temporary, path)
+
+
+def _read(path):
+	table = _feather.read_table(path, memory_map=True)
+	# split_blocks keeps one block per column, so numeric columns without
+	# missing values stay views on the mapped file
+	return table.to_pandas(split_blocks=True)
+
+
+# Function to load a dataset: per-process memo, then the Feather cache, and
+# only on the very first use the bundled CSV. The returned frame is a
+# shallow copy, so adding or replacing columns never touches the cache.
+def load(name):
+	if name not in _MEMO:
+		if _feather is None:
+			_MEMO[name] = _parse(name)
+		else:
+			path = cache_path(name)
+			if not os.path.exists(path):
+				frame = _parse(name)
+				try:
+					_write(frame, path)
+				except OSError:
+					# Read-only cache location: keep the parsed frame for this process
+					_MEMO[name] = frame
+					return frame.copy(deep=False)
+			_MEMO[name] = _read(path)
+	return _MEMO[name].copy(deep=False)
+
+
+# Function to convert the given datasets (default: all worked examples) ahead of time
+def warm(names=None):
+	names = names or sorted({example.dataset for example in WORKED_EXAMPLES})
+	for name in names:
+		load(name)
+	return [cache_path(name) for name in names]
+
+
+# Function to make wool.data(name) read from the cache, so existing notebook
+# cells benefit without changes; description and listing calls are passed on
+def install():
+	if _wooldridge is None or getattr(_wooldridge.data, '_cached', False):
+		return
+
+	def data(name=None, description=False):
+		if name is not None and not description:
+			return load(name)
+		return _read_source(name, description)
+
+	data._cached = True
+	_wooldridge.data = data
+
+
+# Function to return the data of a worked example, with log(outcome) added
+# when the notebook regression uses a log outcome
+def example_data(example):
+	frame = load(example.dataset)
+	if example.log_outcome:
+		frame[f'log_{example.outcome}'] = np.log(frame[example.outcome])
+	return frame
+
+
+# Function to return the outcome column name used by a worked example
+def example_outcome(example):
+	return f'log_{example.outcome}' if example.log_outcome else example.outcome
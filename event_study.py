@@ -0,0 +1,373 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from regression import OLSResult, solve_cholesky, coefficient_table, _critical_value
+from fixed_effects import factorize, demean, nested_in, absorbed_degrees_of_freedom, DEFAULT_TOL, DEFAULT_MAX_ITER
+
+try:
+	from scipy import sparse as _sparse
+except ImportError:
+	_sparse = None
+
+try:
+	from scipy import stats as _stats
+except ImportError:
+	_stats = None
+
+# Event-study estimates for the "Event study plots" figure type in
+# "8. Results". The panel has one row per unit and period; time must be in
+# integer periods (years, quarters numbered consecutively) and treatment
+# is absorbing, starting at the unit's adoption period (its cohort). Units
+# that are never treated have a missing adoption period.
+#
+# Relative-time indicators are never built as dense dummies: each row gets
+# the code of its event-time bin and the indicators are a sparse matrix
+# with at most one entry per row. Two estimators are available:
+#
+# - 'twfe': the classic dynamic two-way fixed-effects regression of the
+#   outcome on leads and lags with unit and time effects absorbed (see
+#   fixed_effects.py). With staggered adoption and heterogeneous effects its
+#   coefficients mix cohorts with possibly negative weights.
+# - 'imputation': the heterogeneity-robust estimator of Borusyak, Jaravel and
+#   Spiess (2024). Unit and time effects are fitted on untreated rows only,
+#   each treated row's untreated outcome is imputed, and the effects are
+#   averaged by event time. Its cost does not grow with the number of
+#   cohorts. Standard errors follow their conservative clustered formula;
+#   leads come from their pre-trend regression on untreated rows.
+#
+# Unit and time effects are solved from the sparse normal equations by
+# block preconditioned conjugate gradients, one right-hand side per horizon.
+
+ESTIMATORS = ['twfe', 'imputation']
+
+ESTIMATOR_LABELS = {
+	'twfe': 'Two-way fixed effects',
+	'imputation': 'Imputation (Borusyak, Jaravel and Spiess)',
+}
+
+EventStudy = namedtuple('EventStudy', [
+	'horizons', 'result', 'reference', 'estimator', 'counts', 'n_cohorts', 'dropped'
+])
+
+_BLOCK_BYTES = 256 << 20
+
+
+# Function to label an event-time horizon (t-2, t+0, ...)
+def horizon_label(h):
+	return f't{int(h):+d}'
+
+
+# Function to compute each unit's adoption period from a treatment
+# indicator: the first period in which it is positive (NaN if never)
+def adoption_time(data, unit, time, treatment):
+	treated = data[treatment].to_numpy(dtype=float) > 0
+	return data[time].where(treated).groupby(data[unit]).transform('min')
+
+
+# Function to build the sparse indicator matrix from bin codes (-1 means
+# no indicator for the row)
+def indicator_matrix(codes, n_columns, weights=None):
+	rows = np.flatnonzero(codes >= 0)
+	values = np.ones(len(rows)) if weights is None else np.asarray(weights, dtype=float)[rows]
+	return _sparse.csc_matrix((values, (rows, codes[rows])), shape=(len(codes), n_columns))
+
+
+def _bin_codes(relative, first, last, bin_endpoints):
+	# Column code of every row for horizons first..last; NaN (never treated)
+	# and, without binning, rows outside the window get no column
+	valid = ~np.isnan(relative)
+	h = np.clip(relative, first, last) if bin_endpoints else relative
+	inside = valid & (h >= first) & (h <= last)
+	return np.where(inside, np.nan_to_num(h) - first, -1).astype(np.int64), inside
+
+
+def _absorbed_fit(y, X, fe, clusters, names, tol, max_iter):
+	# OLS of y on the sparse X with the factors absorbed and clustered
+	# standard errors. X'MX = X'(MX), so only the columns being demeaned are
+	# ever dense, in blocks that fit in _BLOCK_BYTES.
+	n, k = X.shape
+	y_tilde = demean(y, fe, tol=tol, max_iter=max_iter)[0][:, 0]
+	per_block = max(1, _BLOCK_BYTES // (8 * n))
+	blocks = [slice(start, min(start + per_block, k)) for start in range(0, k, per_block)]
+
+	def demeaned(block):
+		return demean(X[:, block].toarray(), fe, tol=tol, max_iter=max_iter, copy=False)[0]
+
+	XtX = np.empty((k, k))
+	cached = None
+	for block in blocks:
+		Xb = demeaned(block)
+		XtX[:, block] = X.T @ Xb
+		if len(blocks) == 1:
+			cached = Xb
+	XtX = (XtX + XtX.T) / 2
+	beta, XtX_inv = solve_cholesky(XtX, X.T @ y_tilde)
+	resid = demean(y - X @ beta, fe, tol=tol, max_iter=max_iter)[0][:, 0]
+
+	codes, uniques = pd.factorize(clusters, use_na_sentinel=False)
+	n_clusters = len(uniques)
+	if n_clusters < 2:
+		raise ValueError("Clustered standard errors need at least two clusters")
+	scores = np.empty((n_clusters, k))
+	for block in blocks:
+		Xb = cached if cached is not None else demeaned(block)
+		for j in range(Xb.shape[1]):
+			scores[:, block.start + j] = np.bincount(codes, weights=Xb[:, j] * resid, minlength=n_clusters)
+
+	df_resid = n - k - absorbed_degrees_of_freedom(fe, nested_in(fe, clusters))
+	if df_resid <= 0:
+		raise ValueError(f"Not enough observations ({n}) for {k} indicators and the fixed effects")
+	scale = n_clusters / (n_clusters - 1) * (n - 1) / df_resid
+	cov = scale * XtX_inv @ (scores.T @ scores) @ XtX_inv
+	ssr, tss = float(resid @ resid), float(y_tilde @ y_tilde)
+	return OLSResult(names, beta, np.sqrt(np.diag(cov)), cov, n, df_resid,
+					 1.0 - ssr / tss if tss > 0 else np.nan, ssr, 'cluster', n_clusters)
+
+
+def _solve_two_way(system, diagonal, rhs, tol, max_iter):
+	# Block Jacobi-preconditioned conjugate gradients on the (singular but
+	# consistent) unit/time normal equations; one column per right-hand side
+	inverse = np.divide(1.0, diagonal, out=np.zeros_like(diagonal), where=diagonal > 0)[:, None]
+	x = np.zeros_like(rhs)
+	r = rhs.copy()
+	z = inverse * r
+	p = z.copy()
+	rz = np.einsum('ij,ij->j', r, z)
+	target = tol * np.maximum(np.linalg.norm(rhs, axis=0), 1e-300)
+	for _ in range(max_iter):
+		if np.all(np.linalg.norm(r, axis=0) <= target):
+			break
+		q = system @ p
+		pq = np.einsum('ij,ij->j', p, q)
+		alpha = np.divide(rz, pq, out=np.zeros_like(rz), where=pq > 0)
+		x += alpha * p
+		r -= alpha * q
+		z = inverse * r
+		rz_new = np.einsum('ij,ij->j', r, z)
+		beta = np.divide(rz_new, rz, out=np.zeros_like(rz), where=rz > 0)
+		p = z + beta * p
+		rz = rz_new
+	return x
+
+
+def _impute(y, unit, time, n_units, n_times, untreated, horizon, n_horizons, cohort, cluster_of_unit,
+			tol, max_iter):
+	u0, t0, y0 = unit[untreated], time[untreated], y[untreated]
+	n_u = np.bincount(u0, minlength=n_units).astype(float)
+	n_t = np.bincount(t0, minlength=n_times).astype(float)
+	pairs = _sparse.csr_matrix((np.ones(len(u0)), (u0, t0)), shape=(n_units, n_times))
+	system = _sparse.bmat([[_sparse.diags(n_u), pairs], [pairs.T, _sparse.diags(n_t)]]).tocsr()
+	diagonal = np.concatenate([n_u, n_t])
+
+	def solve(unit_rhs, time_rhs):
+		x = _solve_two_way(system, diagonal, np.vstack([unit_rhs, time_rhs]), tol, max_iter)
+		return x[:n_units], x[n_units:]
+
+	# Unit and time effects from the untreated rows
+	a, lam = solve(np.bincount(u0, y0, n_units)[:, None], np.bincount(t0, y0, n_times)[:, None])
+	resid0 = y0 - a[u0, 0] - lam[t0, 0]
+
+	# Treated rows need a unit and a period with untreated rows to impute from
+	rows = np.flatnonzero(horizon >= 0)
+	identified = (n_u[unit[rows]] > 0) & (n_t[time[rows]] > 0)
+	dropped = int((~identified).sum())
+	rows = rows[identified]
+	u1, t1, h1 = unit[rows], time[rows], horizon[rows]
+	tau = y[rows] - a[u1, 0] - lam[t1, 0]
+	counts = np.bincount(h1, minlength=n_horizons)
+	estimates = np.bincount(h1, tau, n_horizons) / np.maximum(counts, 1)
+	w = 1.0 / counts[h1]
+
+	# Each estimate is linear in y: weight w on its treated rows and
+	# -(A_i + L_t) on untreated rows, where (A, L) solve the normal
+	# equations with the treated weights' unit and time sums on the right
+	A, L = solve(_sparse.coo_matrix((w, (u1, h1)), shape=(n_units, n_horizons)).toarray(),
+				 _sparse.coo_matrix((w, (t1, h1)), shape=(n_times, n_horizons)).toarray())
+	residuals = _sparse.csr_matrix((resid0, (u0, t0)), shape=(n_units, n_times))
+	untreated_scores = A * np.bincount(u0, resid0, n_units)[:, None] + residuals @ L
+
+	# Treated residuals are taken around cohort-by-horizon means
+	key = cohort[rows] * n_horizons + h1
+	key_counts = np.bincount(key)
+	cell_means = np.bincount(key, tau) / np.maximum(key_counts, 1)
+	treated_scores = _sparse.coo_matrix((w * (tau - cell_means[key]), (u1, h1)),
+										shape=(n_units, n_horizons)).toarray()
+
+	n_clusters = int(cluster_of_unit.max()) + 1
+	to_cluster = _sparse.csr_matrix((np.ones(n_units), (cluster_of_unit, np.arange(n_units))),
+									shape=(n_clusters, n_units))
+	scores = to_cluster @ (treated_scores - untreated_scores)
+	return estimates, scores.T @ scores, counts, dropped, n_clusters
+
+
+def _cluster_of_unit(unit, clusters, n_units):
+	codes, _ = pd.factorize(clusters, use_na_sentinel=False)
+	first = np.full(n_units, -1, dtype=codes.dtype)
+	first[unit[::-1]] = codes[::-1]
+	if not np.array_equal(first[unit], codes):
+		raise ValueError("The imputation estimator needs clusters that contain whole units")
+	return first
+
+
+# Function to estimate an event study on a long panel. Give the adoption
+# period either directly (`cohort`, missing for never-treated units) or
+# through a treatment indicator. Leads run from -leads to -1 and lags from 0
+# to `lags`; with bin_endpoints the end bins also collect all earlier
+# (later) periods, otherwise rows beyond the window are dropped. Standard
+# errors are clustered by `cluster` (default: the unit).
+def event_study(data, outcome, unit, time, cohort=None, treatment=None, leads=4, lags=4, estimator='twfe',
+				controls=(), cluster=None, bin_endpoints=True, tol=DEFAULT_TOL, max_iter=DEFAULT_MAX_ITER):
+	if _sparse is None:
+		raise ImportError("Event studies require scipy (pip install scipy)")
+	if estimator not in ESTIMATORS:
+		raise ValueError(f"Unknown estimator {estimator!r}; choose one of {ESTIMATORS}")
+	if (cohort is None) == (treatment is None):
+		raise ValueError("Give either the adoption-period column (cohort) or a treatment indicator")
+	if estimator == 'imputation' and controls:
+		raise ValueError("The imputation estimator does not take controls; use estimator='twfe'")
+	if leads < 1 or lags < 0:
+		raise ValueError("Use at least one lead and a non-negative number of lags")
+
+	cluster = cluster or unit
+	adoption = (data[cohort] if cohort else adoption_time(data, unit, time, treatment)).to_numpy(dtype=float)
+	columns = list(dict.fromkeys([outcome, unit, time, cluster] + list(controls)))
+	keep = data[columns].notna().all(axis=1).to_numpy()
+	relative = data[time].to_numpy(dtype=float) - adoption
+	if np.any(relative[keep & ~np.isnan(relative)] % 1):
+		raise ValueError(f"{time} must be measured in integer periods")
+	if not bin_endpoints:
+		keep &= np.isnan(relative) | ((relative >= -leads) & (relative <= lags))
+	sample = data.loc[keep]
+	relative, adoption = relative[keep], adoption[keep]
+	if len(sample) == 0:
+		raise ValueError("No complete observations")
+	never_treated = bool(np.isnan(adoption).any())
+	n_cohorts = len(np.unique(adoption[~np.isnan(adoption)]))
+	if n_cohorts == 0:
+		raise ValueError("No unit is ever treated")
+
+	fe = factorize(sample, [unit, time])
+	y = sample[outcome].to_numpy(dtype=float)
+	clusters = sample[cluster].to_numpy()
+	horizons = np.arange(-leads, lags + 1)
+
+	if estimator == 'twfe':
+		codes, _ = _bin_codes(relative, -leads, lags, True)
+		# Without never-treated units, relative time is collinear with unit
+		# and time effects, so the first lead is normalized as well
+		reference = [-1] if never_treated else sorted({-leads, -1})
+		counts = np.bincount(codes[codes >= 0], minlength=len(horizons))
+		estimated = [j for j, h in enumerate(horizons) if h not in reference and counts[j] > 0]
+		remap = np.full(len(horizons) + 1, -1)
+		remap[estimated] = np.arange(len(estimated))
+		X = indicator_matrix(remap[codes], len(estimated))
+		names = [horizon_label(h) for h in horizons[estimated]]
+		if controls:
+			X = _sparse.hstack([X, _sparse.csc_matrix(sample[list(controls)].to_numpy(dtype=float))]).tocsc()
+			names += list(controls)
+		result = _absorbed_fit(y, X, fe, clusters, names, tol, max_iter)
+		k = len(estimated)
+		result = result._replace(names=names[:k], params=result.params[:k], bse=result.bse[:k],
+								 cov=result.cov[:k, :k])
+		return EventStudy(horizons[estimated], result, reference, estimator, counts[estimated], n_cohorts, 0)
+
+	unit_codes, time_codes = fe.codes
+	untreated = np.isnan(relative) | (relative < 0)
+	lag_codes, _ = _bin_codes(np.where(untreated, np.nan, relative), 0, lags, bin_endpoints)
+	cohort_codes, _ = pd.factorize(adoption, use_na_sentinel=False)
+	cluster_of_unit = _cluster_of_unit(unit_codes, clusters, fe.n_levels[0])
+	estimates, lag_cov, lag_counts, dropped, n_clusters = _impute(
+		y, unit_codes, time_codes, fe.n_levels[0], fe.n_levels[1], untreated, lag_codes, lags + 1,
+		cohort_codes, cluster_of_unit, tol, max_iter)
+
+	# Pre-trends: leads regressed on untreated rows only, relative to the
+	# periods before the window. If treated units have no such periods, the
+	# first lead becomes the reference instead.
+	rows = np.flatnonzero(untreated)
+	lead_codes, _ = _bin_codes(relative[rows], -leads, -1, False)
+	lead_counts = np.bincount(lead_codes[lead_codes >= 0], minlength=leads)
+	reference = [] if np.any(relative[rows] < -leads) else [-leads]
+	present = np.array([j for j in np.flatnonzero(lead_counts > 0) if horizons[j] not in reference], dtype=int)
+	remap = np.full(leads + 1, -1)
+	remap[present] = np.arange(len(present))
+	lead_params, lead_cov, df_resid = np.empty(0), np.empty((0, 0)), len(y) - lags - 1
+	if len(present):
+		lead_result = _absorbed_fit(y[rows], indicator_matrix(remap[lead_codes], len(present)),
+									factorize(sample.iloc[rows], [unit, time]), clusters[rows],
+									[horizon_label(h) for h in horizons[present]], tol, max_iter)
+		lead_params, lead_cov, df_resid = lead_result.params, lead_result.cov, lead_result.df_resid
+
+	lagged = np.flatnonzero(lag_counts > 0)
+	params = np.concatenate([lead_params, estimates[lagged]])
+	cov = np.zeros((len(params), len(params)))
+	cov[:len(present), :len(present)] = lead_cov
+	cov[len(present):, len(present):] = lag_cov[np.ix_(lagged, lagged)]
+	estimated = np.concatenate([horizons[present], lagged])
+	result = OLSResult([horizon_label(h) for h in estimated], params, np.sqrt(np.diag(cov)), cov, len(y),
+					   df_resid, np.nan, np.nan, 'cluster', n_clusters)
+	counts = np.concatenate([lead_counts[present], lag_counts[lagged]])
+	return EventStudy(estimated, result, reference, estimator, counts, n_cohorts, dropped)
+
+
+# Function to test that all leads are jointly zero (Wald F test with G - 1
+# denominator degrees of freedom); returns (F, p-value)
+def pretrend_test(study):
+	leads = np.flatnonzero(study.horizons < 0)
+	if len(leads) == 0:
+		return np.nan, np.nan
+	b = study.result.params[leads]
+	V = study.result.cov[np.ix_(leads, leads)]
+	F = float(b @ np.linalg.pinv(V) @ b) / len(leads)
+	p = float(_stats.f.sf(F, len(leads), study.result.n_clusters - 1)) if _stats is not None else np.nan
+	return F, p
+
+
+# Function to lay out the estimates by horizon, including the normalized
+# reference periods
+def event_study_table(study, alpha=0.05):
+	table = coefficient_table(study.result, alpha).drop(columns=['t', 'p-value'])
+	table.insert(0, 'Horizon', study.horizons)
+	table['Observations'] = study.counts
+	if study.reference:
+		reference = pd.DataFrame({'Horizon': study.reference, 'Variable': [horizon_label(h) for h in study.reference],
+								  'Coefficient': 0.0})
+		table = pd.concat([table, reference], ignore_index=True)
+	return table.sort_values('Horizon').rename(columns={'Variable': 'Event Time'}).reset_index(drop=True)
+
+
+# Function to draw the publication-style event-study plot: estimates with
+# confidence intervals by event time, a dashed zero line and a marker for the
+# treatment onset. Several studies (e.g. both estimators) are drawn side by side.
+def plot_event_study(studies, labels=None, alpha=0.05, ax=None, title='Event Study',
+					 xlabel='Periods Relative to Treatment', ylabel='Estimated Effect'):
+	if isinstance(studies, EventStudy):
+		studies = [studies]
+	labels = labels or [ESTIMATOR_LABELS[study.estimator] for study in studies]
+	if ax is None:
+		fig, ax = plt.subplots(figsize=(9, 5.5))
+	else:
+		fig = ax.figure
+	colors = ['steelblue', 'indianred', 'seagreen', 'darkorange']
+	width = 0.6 / len(studies)
+	for i, (study, label) in enumerate(zip(studies, labels)):
+		offset = (i - (len(studies) - 1) / 2) * width
+		crit = _critical_value(study.result, alpha)
+		color = colors[i % len(colors)]
+		ax.errorbar(study.horizons + offset, study.result.params, yerr=crit * study.result.bse, fmt='o',
+					color=color, capsize=3, markersize=6, label=label)
+		if study.reference:
+			ax.scatter(np.asarray(study.reference) + offset, np.zeros(len(study.reference)), s=36,
+					   facecolors='white', edgecolors=color, zorder=3)
+	ax.axhline(0, color='black', linestyle='--', linewidth=0.8)
+	ax.axvline(-0.5, color='gray', linestyle='--', linewidth=0.8)
+	ax.set_xlabel(xlabel)
+	ax.set_ylabel(ylabel)
+	ax.set_title(title)
+	ax.grid(axis='y', linestyle='--', alpha=0.7)
+	if len(studies) > 1:
+		ax.legend(loc='best')
+	fig.tight_layout()
+	return fig
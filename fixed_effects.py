@@ -0,0 +1,225 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from regression import OLSResult, COV_TYPES, solve_cholesky, sandwich_cov
+
+try:
+	from scipy import sparse as _sparse
+	from scipy.sparse.csgraph import connected_components as _connected_components
+except ImportError:
+	_sparse = None
+
+# High-dimensional fixed-effects absorption for the preferred specification
+# of the `spec_table` in "7. Methodology" (e.g. County and Year fixed effects
+# with county clustering). No dummy variables are built: each factor is kept
+# as an integer code per row plus its level counts, and variables are
+# demeaned by alternating projections (one weighted group-mean sweep per
+# factor), with Irons-Tuck extrapolation when there are two or more factors.
+# Columns are demeaned one at a time, so memory is a few vectors of length n
+# on top of the data, and every column stops as soon as it has converged.
+#
+#   fe = factorize(data, ['county', 'year'])      # reuse across specifications
+#   result, info = fit_absorbed(data, 'y', ['x1', 'x2'], fe, cluster='county')
+
+FixedEffects = namedtuple('FixedEffects', ['names', 'codes', 'n_levels', 'counts'])
+Absorption = namedtuple('Absorption', ['names', 'iterations', 'converged', 'max_change', 'absorbed_df'])
+
+DEFAULT_TOL = 1e-8
+DEFAULT_MAX_ITER = 10_000
+
+
+# Function to encode the fixed-effect columns as integer codes. The result
+# only depends on the rows, so it can be built once and reused by every
+# specification estimated on the same sample.
+def factorize(data, names):
+	codes, n_levels = [], []
+	for name in names:
+		values, uniques = pd.factorize(data[name], use_na_sentinel=False)
+		dtype = np.int32 if len(uniques) < 2 ** 31 else np.int64
+		codes.append(values.astype(dtype, copy=False))
+		n_levels.append(len(uniques))
+	counts = [np.bincount(c, minlength=g).astype(float) for c, g in zip(codes, n_levels)]
+	return FixedEffects(list(names), codes, n_levels, counts)
+
+
+# Function to restrict the factors to a subset of rows (a boolean mask or
+# row positions); levels that disappear are dropped
+def subset(fe, rows):
+	codes, n_levels = [], []
+	for c in fe.codes:
+		values, uniques = pd.factorize(c[rows])
+		codes.append(values.astype(c.dtype, copy=False))
+		n_levels.append(len(uniques))
+	counts = [np.bincount(c, minlength=g).astype(float) for c, g in zip(codes, n_levels)]
+	return FixedEffects(fe.names, codes, n_levels, counts)
+
+
+def _inverse_counts(fe, weights):
+	inverse = []
+	for c, g, count in zip(fe.codes, fe.n_levels, fe.counts):
+		if weights is not None:
+			count = np.bincount(c, weights=weights, minlength=g)
+		inverse.append(np.divide(1.0, count, out=np.zeros(g), where=count > 0))
+	return inverse
+
+
+def _sweep(x, fe, inverse, weights):
+	# One pass of the alternating projections: subtract the (weighted) group
+	# means of every factor in turn, in place
+	for c, g, inv in zip(fe.codes, fe.n_levels, inverse):
+		sums = np.bincount(c, weights=x if weights is None else weights * x, minlength=g)
+		x -= (sums * inv)[c]
+	return x
+
+
+def _demean_column(x, fe, inverse, weights, tol, max_iter):
+	x = _sweep(x, fe, inverse, weights)
+	if len(fe.codes) == 1:
+		return x, 1, 0.0, True
+
+	scale = max(float(np.sqrt(np.mean(x ** 2))), 1e-300)
+	change = np.inf
+	for iteration in range(1, max_iter + 1):
+		# Irons-Tuck: two sweeps, then extrapolate along the last step
+		Tx = _sweep(x.copy(), fe, inverse, weights)
+		TTx = _sweep(Tx.copy(), fe, inverse, weights)
+		step = TTx - Tx
+		second = step - (Tx - x)
+		denominator = float(second @ second)
+		if denominator > 0:
+			TTx -= (float(step @ second) / denominator) * step
+		change = float(np.abs(TTx - x).max()) / scale
+		x = TTx
+		if change <= tol:
+			return x, iteration, change, True
+	return x, max_iter, change, False
+
+
+# Function to demean the columns of Z by all factors. Returns the demeaned
+# matrix (Fortran order) and per-column convergence diagnostics.
+def demean(Z, fe, weights=None, tol=DEFAULT_TOL, max_iter=DEFAULT_MAX_ITER, names=None, copy=True):
+	Z = np.asarray(Z, dtype=float)
+	Z = np.array(Z, order='F') if copy or not Z.flags.f_contiguous else Z
+	if Z.ndim == 1:
+		Z = Z[:, None]
+	k = Z.shape[1]
+	weights = None if weights is None else np.asarray(weights, dtype=float)
+	inverse = _inverse_counts(fe, weights)
+
+	iterations, converged, max_change = np.zeros(k, int), np.zeros(k, bool), np.zeros(k)
+	for j in range(k):
+		Z[:, j], iterations[j], max_change[j], converged[j] = _demean_column(
+			Z[:, j].copy(), fe, inverse, weights, tol, max_iter)
+
+	names = list(names) if names is not None else [f'x{j}' for j in range(k)]
+	return Z, Absorption(names, iterations, converged, max_change, absorbed_degrees_of_freedom(fe))
+
+
+def _mobility_groups(a, b, n_a, n_b):
+	# Connected components of the bipartite graph linking levels of two
+	# factors; each component adds one redundant (collinear) level
+	if _sparse is None:
+		return 1
+	graph = _sparse.coo_matrix((np.ones(len(a)), (a, b)), shape=(n_a, n_b)).tocsr()
+	graph = _sparse.bmat([[None, graph], [graph.T, None]])
+	return int(_connected_components(graph, directed=False)[0])
+
+
+# Function to count the parameters absorbed by the fixed effects: all
+# levels of the first factor, the second net of its mobility groups with the
+# first, and one redundant level for each further factor (a conservative
+# count, as in reghdfe). Factors nested within the cluster variable are
+# left out because the clustered variance already accounts for them.
+def absorbed_degrees_of_freedom(fe, nested=()):
+	kept = [(c, g) for name, c, g in zip(fe.names, fe.codes, fe.n_levels) if name not in nested]
+	if not kept:
+		return 0
+	absorbed = sum(g for _, g in kept)
+	if len(kept) > 1:
+		(a, n_a), (b, n_b) = kept[:2]
+		absorbed -= _mobility_groups(a, b, n_a, n_b)
+		absorbed -= len(kept) - 2
+	return absorbed
+
+
+# Function to list the factors nested within the cluster variable (every
+# level of the factor falls in a single cluster)
+def nested_in(fe, clusters):
+	clusters, _ = pd.factorize(np.asarray(clusters), use_na_sentinel=False)
+	nested = []
+	for name, c, g in zip(fe.names, fe.codes, fe.n_levels):
+		first = np.full(g, -1, dtype=clusters.dtype)
+		# Reversed assignment leaves the first cluster seen for every level
+		first[c[::-1]] = clusters[::-1]
+		if np.array_equal(first[c], clusters):
+			nested.append(name)
+	return nested
+
+
+# Function to fit OLS with absorbed fixed effects on DataFrame columns.
+# `fixed_effects` is a list of column names or a FixedEffects built by
+# factorize() on exactly these rows (rows with missing values must already
+# be dropped). The R-squared reported is the within R-squared.
+def fit_absorbed(data, outcome, regressors, fixed_effects, cov_type='HC1', cluster=None, weights=None,
+				 tol=DEFAULT_TOL, max_iter=DEFAULT_MAX_ITER):
+	if cov_type not in COV_TYPES:
+		raise ValueError(f"Unknown cov_type {cov_type!r}; choose one of {COV_TYPES}")
+	if isinstance(fixed_effects, FixedEffects):
+		fe, sample = fixed_effects, data
+		if len(fe.codes[0]) != len(sample):
+			raise ValueError("FixedEffects were built on a different number of rows than the data")
+	else:
+		columns = [outcome] + list(regressors) + list(fixed_effects) + ([cluster] if cluster else []) + \
+				  ([weights] if weights else [])
+		sample = data.dropna(subset=list(dict.fromkeys(columns)))
+		fe = factorize(sample, fixed_effects)
+
+	variables = [outcome] + list(regressors)
+	Z = np.empty((len(sample), len(variables)), order='F')
+	for j, name in enumerate(variables):
+		Z[:, j] = sample[name].to_numpy(dtype=float)
+	w = sample[weights].to_numpy(dtype=float) if weights else None
+	Z, info = demean(Z, fe, w, tol=tol, max_iter=max_iter, names=variables, copy=False)
+	if w is not None:
+		Z *= np.sqrt(w)[:, None]
+
+	n, k = len(Z), len(regressors)
+	clusters = sample[cluster].to_numpy() if cov_type == 'cluster' else None
+	nested = nested_in(fe, clusters) if clusters is not None else []
+	absorbed = absorbed_degrees_of_freedom(fe, nested)
+	info = info._replace(absorbed_df=absorbed)
+	df_resid = n - k - absorbed
+	if df_resid <= 0:
+		raise ValueError(f"Not enough observations ({n}) for {k} regressors and {absorbed} fixed effects")
+
+	y, X = Z[:, 0], Z[:, 1:]
+	beta, XtX_inv = solve_cholesky(X.T @ X, X.T @ y)
+	resid = y - X @ beta
+	ssr = float(resid @ resid)
+	tss = float(y @ y)
+	cov, n_clusters = sandwich_cov(X, resid, XtX_inv, cov_type, clusters, df_resid)
+	result = OLSResult(
+		names=list(regressors),
+		params=beta,
+		bse=np.sqrt(np.diag(cov)),
+		cov=cov,
+		nobs=n,
+		df_resid=df_resid,
+		rsquared=1.0 - ssr / tss if tss > 0 else np.nan,
+		ssr=ssr,
+		cov_type=cov_type,
+		n_clusters=n_clusters
+	)
+	return result, info
+
+
+# Function to summarize the convergence diagnostics as a table
+def absorption_table(info):
+	return pd.DataFrame({
+		'Variable': info.names,
+		'Iterations': info.iterations,
+		'Converged': info.converged,
+		'Max Relative Change': info.max_change
+	})
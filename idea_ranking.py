@@ -0,0 +1,173 @@
+import io
+import json
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from workspace import put, get
+
+# Scoring and ranking of candidate research ideas on the five criteria of
+# the "Research Idea Evaluation" radar in "1. Finding Research Ideas". An
+# idea list is a table with an Idea column and one 1-5 score per criterion.
+#
+# The weighted score of every idea is one matrix-vector product and the
+# ranking one argsort, so re-ranking 10,000 ideas after a weight change is
+# immediate. The Pareto frontier (ideas no other idea beats on every
+# criterion) does not depend on the weights; it is computed on the distinct
+# score rows, in decreasing order of their sum and in blocks, so each block
+# is only compared with the frontier found so far, and memoized on the
+# scores. Radar charts are drawn only for the ideas asked for and memoized
+# as PNG bytes.
+#
+# Idea lists and weights are saved in the user's workspace (see
+# workspace.py).
+
+IDEA_CRITERIA = ['Significance', 'Originality', 'Feasibility', 'Publication Potential', 'Expertise Alignment']
+
+IDEA_COLUMNS = ['Idea'] + IDEA_CRITERIA
+
+DEFAULT_WEIGHTS = {criterion: 1.0 for criterion in IDEA_CRITERIA}
+
+SCORE_RANGE = (1, 5)
+
+# The two sample ideas of the original radar chart
+EXAMPLE_IDEAS = pd.DataFrame([
+	['Idea 1', 4, 5, 3, 4, 5],
+	['Idea 2', 5, 3, 4, 5, 2],
+], columns=IDEA_COLUMNS)
+
+_BLOCK = 1024
+
+
+# Function to validate an idea table and return it with numeric scores
+# (rows without a name are dropped). Raises ValueError for missing or
+# out-of-range scores.
+def clean_ideas(ideas):
+	missing = [column for column in IDEA_COLUMNS if column not in ideas.columns]
+	if missing:
+		raise ValueError(f"The idea list is missing columns {missing}")
+	ideas = ideas[IDEA_COLUMNS].dropna(subset=['Idea'])
+	ideas = ideas[ideas['Idea'].astype(str).str.strip() != ''].reset_index(drop=True)
+	scores = ideas[IDEA_CRITERIA].apply(pd.to_numeric, errors='coerce')
+	low, high = SCORE_RANGE
+	bad = scores.isna().any(axis=1) | ((scores < low) | (scores > high)).any(axis=1)
+	if bad.any():
+		raise ValueError(f"Scores must be numbers from {low} to {high}: {ideas.loc[bad, 'Idea'].astype(str).tolist()[:10]}")
+	ideas = ideas.copy()
+	ideas['Idea'] = ideas['Idea'].astype(str)
+	ideas[IDEA_CRITERIA] = scores.astype(float)
+	return ideas
+
+
+def _dominated(candidates, frontier):
+	# Row i of candidates is dominated by some row of frontier (>= everywhere,
+	# > somewhere)
+	if not len(frontier) or not len(candidates):
+		return np.zeros(len(candidates), dtype=bool)
+	at_least = (frontier[None, :, :] >= candidates[:, None, :]).all(axis=2)
+	better = (frontier[None, :, :] > candidates[:, None, :]).any(axis=2)
+	return (at_least & better).any(axis=1)
+
+
+@lru_cache(maxsize=16)
+def _pareto_rows(data, shape):
+	scores = np.frombuffer(data, dtype=float).reshape(shape)
+	distinct, inverse = np.unique(scores, axis=0, return_inverse=True)
+	# Only a row with a larger sum can dominate another, so rows in
+	# decreasing order of sum are final once checked against earlier ones
+	order = np.argsort(-distinct.sum(axis=1), kind='stable')
+	frontier = np.zeros((0, shape[1]))
+	on_frontier = np.zeros(len(distinct), dtype=bool)
+	for start in range(0, len(order), _BLOCK):
+		block = order[start:start + _BLOCK]
+		keep = ~_dominated(distinct[block], frontier)
+		keep[keep] = ~_dominated(distinct[block[keep]], distinct[block[keep]])
+		on_frontier[block[keep]] = True
+		frontier = np.vstack([frontier, distinct[block[keep]]])
+	return on_frontier[inverse.ravel()]
+
+
+# Function to flag the ideas on the Pareto frontier of a score matrix
+# (ideas x criteria); memoized on the scores
+def pareto_mask(scores):
+	scores = np.ascontiguousarray(scores, dtype=float)
+	if not len(scores):
+		return np.zeros(0, dtype=bool)
+	return _pareto_rows(scores.tobytes(), scores.shape)
+
+
+# Function to rank ideas by their weighted score (weights: criterion ->
+# weight, normalized to sum to one). Returns the ideas sorted best first
+# with Rank, Score and Pareto columns.
+def rank_ideas(ideas, weights=None):
+	ideas = clean_ideas(ideas)
+	weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+	w = np.array([weights[criterion] for criterion in IDEA_CRITERIA], dtype=float)
+	if np.any(w < 0) or w.sum() <= 0:
+		raise ValueError("Weights must be non-negative and not all zero")
+	scores = ideas[IDEA_CRITERIA].to_numpy()
+	total = scores @ (w / w.sum())
+	order = np.lexsort((np.arange(len(total)), -total))
+	ranked = ideas.iloc[order].reset_index(drop=True)
+	ranked.insert(0, 'Rank', np.arange(1, len(ranked) + 1))
+	ranked['Score'] = total[order]
+	ranked['Pareto'] = pareto_mask(scores)[order]
+	return ranked
+
+
+# Function to draw a radar chart of ideas (names and score rows)
+def plot_radar(names, scores, labels=tuple(IDEA_CRITERIA), title='Research Idea Evaluation'):
+	angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
+	angles += angles[:1]
+	fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
+	colors = plt.cm.tab10(np.arange(len(names)) % 10)
+	for name, row, color in zip(names, scores, colors):
+		values = list(row) + [row[0]]
+		ax.plot(angles, values, '-', color=color, linewidth=2, label=name)
+		ax.fill(angles, values, color=color, alpha=0.1)
+	ax.set_xticks(angles[:-1])
+	ax.set_xticklabels(labels)
+	ax.set_yticks([1, 2, 3, 4, 5])
+	ax.set_yticklabels(['1', '2', '3', '4', '5'])
+	ax.set_ylim(0, 5)
+	ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
+	ax.set_title(title)
+	return fig
+
+
+# Function to render a radar chart to PNG bytes, memoized on the names and
+# scores (tuples), so reruns that keep the same top ideas are free
+@lru_cache(maxsize=128)
+def render_radar(names, scores, labels=tuple(IDEA_CRITERIA), title='Research Idea Evaluation'):
+	fig = plot_radar(names, scores, labels, title)
+	buffer = io.BytesIO()
+	fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+	plt.close(fig)
+	return buffer.getvalue()
+
+
+# Function to return the hashable radar arguments of the top n ranked ideas
+def radar_rows(ranked, n=5):
+	top = ranked.head(n)
+	return tuple(top['Idea']), tuple(tuple(row) for row in top[IDEA_CRITERIA].to_numpy().tolist())
+
+
+# Function to save a workspace's idea list and weights. The list is
+# validated first (ValueError as in clean_ideas), so nothing is saved that
+# rank_ideas would reject. Returns the saved (cleaned) ideas.
+def save_ideas(workspace, ideas, weights=None):
+	ideas = clean_ideas(ideas)
+	put(workspace, 'ideas', 'list', {'weights': weights or DEFAULT_WEIGHTS,
+									 'ideas': json.loads(ideas[IDEA_COLUMNS].to_json(orient='values'))})
+	return ideas
+
+
+# Function to load a workspace's idea list and weights (the example ideas
+# and equal weights when nothing is saved)
+def load_ideas(workspace):
+	saved = get(workspace, 'ideas', 'list')
+	if saved is None:
+		return EXAMPLE_IDEAS.copy(), dict(DEFAULT_WEIGHTS)
+	return pd.DataFrame(saved['ideas'], columns=IDEA_COLUMNS), {**DEFAULT_WEIGHTS, **saved.get('weights', {})}
@@ -0,0 +1,258 @@
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+try:
+	import pyarrow.feather as _feather
+except ImportError:
+	_feather = None
+
+from journal_rules import JOURNAL_RULES, GENERAL_GUIDANCE
+from submission_cascade import JOURNAL_PROFILES
+
+# Journal metadata database behind the sidebar "Top Economics Journals"
+# search. The built-in catalog covers the journals used elsewhere in the
+# guide (tiers and word limits from journal_rules.py, acceptance rates from
+# submission_cascade.py, the 2024 impact factors of the original sidebar
+# table); a full catalog of thousands of journals can be imported from a CSV
+# with the same columns (see import_catalog).
+#
+# The database is stored as an uncompressed Feather file, memory-mapped on
+# load like the dataset cache, at ~/.cache/acad_journals/journals.feather
+# (or ACAD_JOURNAL_DB). Two indexes are built once per process:
+#
+# - a prefix index: the sorted normalized names and every word-start suffix
+#   of them ("labor economics" for "journal of labor economics"), so a
+#   prefix is a pair of binary searches;
+# - a trigram index: each name's trigrams as integer codes in CSR form, so
+#   a fuzzy query gathers the posting lists of its trigrams and scores every
+#   journal with one bincount: the share of the query's trigrams found in
+#   the name, so "labr econ" still finds the Journal of Labor Economics.
+#
+# search() is memoized per query and filter set, so search-as-you-type only
+# pays for new prefixes.
+
+DATABASE_PATH = os.environ.get('ACAD_JOURNAL_DB', os.path.join(os.path.expanduser('~'), '.cache', 'acad_journals',
+																  'journals.feather'))
+
+DATABASE_COLUMNS = ['Journal', 'Tier', 'Impact Factor', 'Acceptance Rate', 'First Decision (months)',
+					'Abstract Max Words', 'Page Limit', 'JEL Codes']
+
+JEL_LETTERS = 'ABCDEFGHIJKLMNOPQRYZ'
+
+# Minimum share of the query's trigrams a name must contain to match
+SIMILARITY_THRESHOLD = 0.5
+
+JournalIndex = namedtuple('JournalIndex', ['journals', 'keys', 'key_rows', 'key_starts', 'codes', 'ptr', 'rows',
+										   'sizes', 'jel_mask'])
+
+_ALL_FIELDS = JEL_LETTERS
+
+# 2024 impact factors from the original sidebar table
+_IMPACT_FACTORS = {
+	'American Economic Review': 5.24,
+	'Quarterly Journal of Economics': 8.41,
+	'Journal of Political Economy': 6.34,
+	'Econometrica': 4.87,
+	'Review of Economic Studies': 5.12,
+	'Journal of Economic Literature': 7.32,
+	'Journal of Finance': 6.28,
+	'Journal of Monetary Economics': 3.89,
+	'Journal of Development Economics': 3.45,
+	'Journal of Economic Perspectives': 5.76,
+}
+
+# JEL areas each journal publishes in (general-interest journals: all)
+_JEL_COVERAGE = {
+	'American Economic Journal: Applied': 'DIJKO',
+	'Journal of Finance': 'G',
+	'Journal of Monetary Economics': 'E',
+	'Journal of Labor Economics': 'J',
+	'Journal of Development Economics': 'O',
+	'Journal of Public Economics': 'H',
+	'Journal of International Economics': 'F',
+	'Journal of Urban Economics': 'R',
+	'Economic Development and Cultural Change': 'O',
+	'Journal of Environmental Economics and Management': 'Q',
+	'China Economic Review': 'OPR',
+	'Journal of African Economies': 'OR',
+}
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+# Function to normalize a journal name or query for matching
+def normalize(text):
+	return ' '.join(_WORD.findall(str(text).lower()))
+
+
+# Function to return the built-in catalog
+def builtin_catalog():
+	rules = JOURNAL_RULES[JOURNAL_RULES['Journal'] != GENERAL_GUIDANCE]
+	acceptance = JOURNAL_PROFILES.set_index('Journal')['Acceptance Rate']
+	return pd.DataFrame({
+		'Journal': rules['Journal'].to_numpy(),
+		'Tier': rules['Tier'].to_numpy(),
+		'Impact Factor': rules['Journal'].map(_IMPACT_FACTORS).to_numpy(float),
+		'Acceptance Rate': rules['Journal'].map(acceptance).to_numpy(float),
+		'First Decision (months)': np.nan,
+		'Abstract Max Words': rules['Abstract Max Words'].to_numpy(float),
+		'Page Limit': rules['Page Limit'].to_numpy(float),
+		'JEL Codes': [';'.join(_JEL_COVERAGE.get(journal, _ALL_FIELDS)) for journal in rules['Journal']],
+	})
+
+
+def _clean(catalog):
+	missing = [column for column in ['Journal', 'Tier'] if column not in catalog.columns]
+	if missing:
+		raise ValueError(f"Catalog is missing columns {missing}")
+	catalog = catalog.reindex(columns=DATABASE_COLUMNS)
+	catalog = catalog.dropna(subset=['Journal']).drop_duplicates('Journal').reset_index(drop=True)
+	for column in DATABASE_COLUMNS[2:-1]:
+		catalog[column] = pd.to_numeric(catalog[column], errors='coerce').astype(float)
+	catalog['Journal'] = catalog['Journal'].astype(str)
+	catalog['Tier'] = catalog['Tier'].fillna('').astype(str)
+	catalog['JEL Codes'] = catalog['JEL Codes'].fillna('').astype(str)
+	return catalog
+
+
+# Function to import a catalog (a CSV path or a DataFrame with the
+# DATABASE_COLUMNS; Journal and Tier are required) into the on-disk database
+def import_catalog(source, path=None):
+	path = path or DATABASE_PATH
+	catalog = _clean(pd.read_csv(source) if isinstance(source, (str, os.PathLike)) else source)
+	os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+	temporary = f'{path}.{os.getpid()}.tmp'
+	if _feather is not None:
+		_feather.write_feather(catalog, temporary, compression='uncompressed')
+	else:
+		catalog.to_pickle(temporary)
+	os.replace(temporary, path)
+	load_database.cache_clear()
+	search.cache_clear()
+	return path
+
+
+# Function to load the database (the imported catalog if there is one, else
+# the built-in catalog) and build its indexes, once per process
+@lru_cache(maxsize=4)
+def load_database(path=None):
+	path = path or DATABASE_PATH
+	if os.path.exists(path):
+		if _feather is not None:
+			catalog = _feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+		else:
+			catalog = pd.read_pickle(path)
+	else:
+		catalog = builtin_catalog()
+	return build_index(_clean(catalog))
+
+
+def _trigram_codes(name):
+	padded = f'  {name} '
+	codes = {(ord(padded[i]) << 42) | (ord(padded[i + 1]) << 21) | ord(padded[i + 2]) for i in range(len(padded) - 2)}
+	return np.fromiter(codes, dtype=np.int64, count=len(codes))
+
+
+def _jel_mask(cells):
+	bits = {letter: 1 << i for i, letter in enumerate(JEL_LETTERS)}
+	return np.array([sum(bits.get(code.strip()[:1].upper(), 0) for code in set(str(cell).split(';'))) for cell in cells],
+					dtype=np.int64)
+
+
+# Function to build the prefix and trigram indexes of a catalog
+def build_index(catalog):
+	names = [normalize(name) for name in catalog['Journal']]
+
+	keys, key_rows, key_starts = [], [], []
+	for row, name in enumerate(names):
+		starts = [0] + [m.start() + 1 for m in re.finditer(' ', name)]
+		keys.extend(name[start:] for start in starts)
+		key_rows.extend([row] * len(starts))
+		key_starts.extend(start == 0 for start in starts)
+	keys = np.array(keys, dtype=str)
+	order = np.argsort(keys, kind='stable')
+
+	per_name = [_trigram_codes(name) for name in names]
+	sizes = np.array([len(codes) for codes in per_name], dtype=np.int64)
+	codes = np.concatenate(per_name) if per_name else np.zeros(0, dtype=np.int64)
+	rows = np.repeat(np.arange(len(names)), sizes)
+	trigram_order = np.argsort(codes, kind='stable')
+	unique, counts = np.unique(codes[trigram_order], return_counts=True)
+	ptr = np.zeros(len(unique) + 1, dtype=np.int64)
+	np.cumsum(counts, out=ptr[1:])
+
+	return JournalIndex(catalog, keys[order], np.array(key_rows, dtype=np.int64)[order],
+						np.array(key_starts, dtype=bool)[order], unique, ptr, rows[trigram_order], sizes,
+						_jel_mask(catalog['JEL Codes']))
+
+
+def _prefix_matches(index, query):
+	# Rows whose name or one of its words starts with the query, and whether
+	# the match is at the start of the name
+	low = np.searchsorted(index.keys, query, side='left')
+	high = np.searchsorted(index.keys, query + '\uffff', side='left')
+	return index.key_rows[low:high], index.key_starts[low:high]
+
+
+def _trigram_scores(index, query):
+	query_codes = _trigram_codes(query)
+	position = np.minimum(np.searchsorted(index.codes, query_codes), max(len(index.codes) - 1, 0))
+	position = position[index.codes[position] == query_codes] if len(index.codes) else position[:0]
+	postings = [index.rows[index.ptr[p]:index.ptr[p + 1]] for p in position]
+	shared = np.bincount(np.concatenate(postings), minlength=len(index.sizes)) if postings \
+		else np.zeros(len(index.sizes), dtype=np.int64)
+	return shared / len(query_codes)
+
+
+# Function to search the database: prefix matches (on the name or any word
+# of it) come first, then fuzzy trigram matches above the similarity
+# threshold; both are filtered by tier, minimum impact factor and JEL area
+# and ranked by match quality and impact factor. Memoized per query and
+# filters (tiers as a tuple); do not modify the returned frame.
+@lru_cache(maxsize=1024)
+def search(query='', tiers=None, min_impact=None, jel=None, limit=50, path=None):
+	index = load_database(path)
+	catalog = index.journals
+	n = len(catalog)
+	query = normalize(query)
+
+	keep = np.ones(n, dtype=bool)
+	if tiers:
+		keep &= catalog['Tier'].isin(list(tiers)).to_numpy()
+	if min_impact:
+		keep &= catalog['Impact Factor'].to_numpy(float) >= min_impact
+	if jel:
+		keep &= (index.jel_mask & (1 << JEL_LETTERS.index(jel[0].upper()))) != 0
+
+	if query:
+		score = np.zeros(n)
+		if len(query) >= 3:
+			similarity = _trigram_scores(index, query)
+			score = np.where(similarity >= SIMILARITY_THRESHOLD, similarity, 0.0)
+		# Prefix matches outrank fuzzy ones; a match at the start of the name
+		# outranks one at a later word
+		prefix, at_start = _prefix_matches(index, query)
+		np.maximum.at(score, prefix, np.where(at_start, 3.0, 2.0))
+		keep &= score > 0
+	else:
+		score = np.zeros(n)
+
+	rows = np.flatnonzero(keep)
+	impact = np.nan_to_num(catalog['Impact Factor'].to_numpy(float)[rows], nan=-np.inf)
+	ranked = rows[np.lexsort((catalog['Journal'].to_numpy()[rows], -impact, -score[rows]))][:limit]
+	result = catalog.iloc[ranked].reset_index(drop=True)
+	if query:
+		result.insert(1, 'Match', np.round(np.minimum(score[ranked], 1.0), 2))
+	return result
+
+
+# Function to list the tiers present in the database, in ranking order
+def database_tiers(path=None):
+	tiers = load_database(path).journals['Tier']
+	order = list(dict.fromkeys(JOURNAL_RULES['Tier'][JOURNAL_RULES['Tier'] != '']))
+	return [tier for tier in order if (tiers == tier).any()] + sorted(set(tiers) - set(order) - {''})
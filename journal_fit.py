@@ -0,0 +1,244 @@
+import io
+import re
+import zlib
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+try:
+	from scipy import sparse as _sparse
+except ImportError:
+	_sparse = None
+
+from journal_db import load_database, JEL_LETTERS
+
+# Journal-fit recommender for choosing a target journal in "12. Submission
+# Process". Each journal has a topic profile with two parts:
+#
+# - a text centroid: the mean of the TF-IDF vectors of the abstracts it has
+#   published (from a local corpus: a CSV with Journal, Title and Abstract
+#   columns, optionally JEL Codes), L2-normalized;
+# - a JEL distribution: the share of its articles in each JEL area (from the
+#   corpus, or the JEL coverage in journal_db when there is none).
+#
+# Words and bigrams are hashed into a fixed number of features (crc32, so
+# the same text always hashes the same way), so no vocabulary is stored.
+# Both parts are columns of one journals x features CSC matrix. A manuscript
+# touches only a few hundred features, so scoring it against every journal
+# is one product of the matrix's columns at those features with the
+# manuscript's weights: fit = text weight * cosine(text) + JEL weight *
+# cosine(JEL areas).
+#
+# Without a corpus the profiles are built from each journal's name and the
+# descriptions of its JEL areas, which is enough to separate field journals.
+
+N_FEATURES = 1 << 18
+
+DEFAULT_TEXT_WEIGHT = 0.7
+
+# Keywords count this many times as much as a word of the abstract
+KEYWORD_WEIGHT = 2.0
+
+JEL_AREAS = {
+	'A': 'General Economics and Teaching',
+	'B': 'History of Economic Thought, Methodology, and Heterodox Approaches',
+	'C': 'Mathematical and Quantitative Methods',
+	'D': 'Microeconomics',
+	'E': 'Macroeconomics and Monetary Economics',
+	'F': 'International Economics',
+	'G': 'Financial Economics',
+	'H': 'Public Economics',
+	'I': 'Health, Education, and Welfare',
+	'J': 'Labor and Demographic Economics',
+	'K': 'Law and Economics',
+	'L': 'Industrial Organization',
+	'M': 'Business Administration and Business Economics; Marketing; Accounting; Personnel Economics',
+	'N': 'Economic History',
+	'O': 'Economic Development, Innovation, Technological Change, and Growth',
+	'P': 'Economic Systems',
+	'Q': 'Agricultural and Natural Resource Economics; Environmental and Ecological Economics',
+	'R': 'Urban, Rural, Regional, Real Estate, and Transportation Economics',
+	'Y': 'Miscellaneous Categories',
+	'Z': 'Other Special Topics',
+}
+
+# Journal profiles: names in row order, the journals x (N_FEATURES + JEL
+# areas) CSC matrix and the inverse document frequencies of the features
+JournalProfiles = namedtuple('JournalProfiles', ['journals', 'matrix', 'idf', 'documents'])
+
+_TOKEN = re.compile(r"[a-z][a-z\-]+")
+
+_STOPWORDS = frozenset(
+	'a an and are as at be by can for from has have how in into is it its of on or our that the their these this '
+	'to we which while with using use used does do not than more less between among both also paper study '
+	'article evidence show shows find finds results effect effects data new'.split())
+
+
+def _require_sparse():
+	if _sparse is None:
+		raise ImportError("The journal recommender requires scipy (pip install scipy)")
+
+
+# Function to split a text into the features used by the profiles: words
+# (stopwords dropped) and adjacent word pairs
+def text_features(text):
+	words = [word for word in _TOKEN.findall(str(text).lower()) if word not in _STOPWORDS]
+	return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+
+def _hash(features):
+	return np.array([zlib.crc32(feature.encode()) & (N_FEATURES - 1) for feature in features], dtype=np.int64)
+
+
+def _counts(texts):
+	# Hashed feature counts of each text as a CSR matrix
+	rows, columns = [], []
+	for row, text in enumerate(texts):
+		hashed = _hash(text_features(text))
+		rows.append(np.full(len(hashed), row))
+		columns.append(hashed)
+	rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+	columns = np.concatenate(columns) if columns else np.zeros(0, dtype=np.int64)
+	counts = _sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(texts), N_FEATURES))
+	counts.sum_duplicates()
+	return counts
+
+
+def _normalize_rows(matrix):
+	norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+	return _sparse.diags(1.0 / np.where(norms > 0, norms, 1.0)) @ matrix
+
+
+def _jel_distribution(cells):
+	# Share of each JEL area in a list of "E52; D31"-style cells
+	letters = [code.strip()[:1].upper() for cell in cells for code in re.split(r'[;,\s]+', str(cell)) if code.strip()]
+	counts = np.array([letters.count(letter) for letter in JEL_LETTERS], dtype=float)
+	return counts / counts.sum() if counts.sum() > 0 else counts
+
+
+def _assemble(journals, text, jel, idf, documents):
+	jel = np.asarray(jel, dtype=float)
+	norms = np.linalg.norm(jel, axis=1, keepdims=True)
+	jel = np.divide(jel, norms, out=np.zeros_like(jel), where=norms > 0)
+	matrix = _sparse.hstack([_normalize_rows(text), _sparse.csr_matrix(jel)]).tocsc()
+	matrix.sort_indices()
+	return JournalProfiles(list(journals), matrix, idf, documents)
+
+
+# Function to build journal profiles from a corpus of abstracts (a DataFrame
+# with Journal, Title and Abstract columns and optionally JEL Codes). JEL
+# distributions of journals without JEL codes in the corpus come from
+# journal_db.
+def build_profiles(corpus):
+	_require_sparse()
+	missing = [column for column in ['Journal', 'Abstract'] if column not in corpus.columns]
+	if missing:
+		raise ValueError(f"The corpus is missing columns {missing}")
+	corpus = corpus.dropna(subset=['Journal', 'Abstract']).reset_index(drop=True)
+	if corpus.empty:
+		raise ValueError("The corpus has no abstracts")
+	texts = (corpus['Title'].fillna('').astype(str) + ' ' if 'Title' in corpus.columns else '') + corpus['Abstract'].astype(str)
+	counts = _counts(texts.tolist())
+
+	# Sublinear term frequencies, smoothed IDF, unit-length documents
+	n_documents = counts.shape[0]
+	frequency = np.bincount(counts.indices, minlength=N_FEATURES)
+	idf = np.log((1.0 + n_documents) / (1.0 + frequency)) + 1.0
+	weights = counts.copy()
+	weights.data = (1.0 + np.log(weights.data)) * idf[weights.indices]
+	weights = _normalize_rows(weights)
+
+	codes, journals = pd.factorize(corpus['Journal'].astype(str))
+	members = _sparse.csr_matrix((np.ones(n_documents), (codes, np.arange(n_documents))),
+								 shape=(len(journals), n_documents))
+	centroids = _sparse.diags(1.0 / np.asarray(members.sum(axis=1)).ravel()) @ members @ weights
+
+	coverage = load_database().journals.set_index('Journal')['JEL Codes']
+	jel_cells = corpus['JEL Codes'].fillna('') if 'JEL Codes' in corpus.columns else pd.Series('', index=corpus.index)
+	cells_by_journal = jel_cells.groupby(codes).agg(list)
+	jel = []
+	for code, journal in enumerate(journals):
+		distribution = _jel_distribution(cells_by_journal.get(code, []))
+		if distribution.sum() == 0:
+			distribution = _jel_distribution([coverage.get(journal, '')])
+		jel.append(distribution)
+	return _assemble(journals, centroids, jel, idf, n_documents)
+
+
+# Function to build profiles from the bytes of a corpus CSV, memoized on the
+# contents so an uploaded corpus is only indexed once
+@lru_cache(maxsize=2)
+def profiles_from_csv(data):
+	return build_profiles(pd.read_csv(io.BytesIO(data)))
+
+
+# Function to build profiles from journal_db alone: each journal's name and
+# the descriptions of its JEL areas stand in for its abstracts
+@lru_cache(maxsize=1)
+def default_profiles():
+	_require_sparse()
+	catalog = load_database().journals
+	texts = [f"{journal} " + ' '.join(JEL_AREAS[letter] for letter in _covered(cell))
+			 for journal, cell in zip(catalog['Journal'], catalog['JEL Codes'])]
+	counts = _counts(texts)
+	weights = counts.copy()
+	weights.data = 1.0 + np.log(weights.data)
+	return _assemble(catalog['Journal'], weights, [_jel_distribution([cell]) for cell in catalog['JEL Codes']],
+					 np.ones(N_FEATURES), 0)
+
+
+def _covered(cell):
+	return [letter for letter, share in zip(JEL_LETTERS, _jel_distribution([cell])) if share > 0]
+
+
+# Function to build the manuscript's query: hashed TF-IDF features of the
+# title, abstract and keywords (unit length) and its JEL area shares (unit
+# length). Returns (feature columns, weights, JEL vector).
+def manuscript_query(profiles, title='', abstract='', keywords=(), jel_codes=()):
+	features = _hash(text_features(f'{title} {abstract}'))
+	keyword_features = _hash([feature for keyword in keywords for feature in text_features(keyword)])
+	columns, inverse = np.unique(np.concatenate([features, keyword_features]), return_inverse=True)
+	counts = np.bincount(inverse, weights=np.concatenate([np.ones(len(features)),
+														  np.full(len(keyword_features), KEYWORD_WEIGHT)]))
+	weights = (1.0 + np.log(np.maximum(counts, 1.0))) * profiles.idf[columns] if len(columns) else counts
+	norm = np.linalg.norm(weights)
+	jel = _jel_distribution(jel_codes)
+	jel_norm = np.linalg.norm(jel)
+	return columns, weights / norm if norm > 0 else weights, jel / jel_norm if jel_norm > 0 else jel
+
+
+# Function to score a manuscript against every journal. Returns the fit of
+# each journal (row order of profiles.journals) as (fit, text fit, JEL fit);
+# the text and JEL cosines are combined with text_weight, or text alone when
+# no JEL codes are given.
+def score_journals(profiles, title='', abstract='', keywords=(), jel_codes=(), text_weight=DEFAULT_TEXT_WEIGHT):
+	columns, weights, jel = manuscript_query(profiles, title, abstract, keywords, jel_codes)
+	if not len(columns) and not jel.any():
+		raise ValueError("Enter a title, abstract, keywords or JEL codes to score")
+	jel_columns = N_FEATURES + np.arange(len(JEL_LETTERS))
+	block = profiles.matrix[:, np.concatenate([columns, jel_columns])]
+	text_fit = block[:, :len(columns)] @ weights
+	jel_fit = block[:, len(columns):] @ jel
+	if not jel.any():
+		text_weight = 1.0
+	elif not len(columns):
+		text_weight = 0.0
+	return text_weight * text_fit + (1 - text_weight) * jel_fit, text_fit, jel_fit
+
+
+# Function to rank journals for a manuscript and join the shortlist with the
+# tier, acceptance rate and impact factor from journal_db
+def recommend(profiles, title='', abstract='', keywords=(), jel_codes=(), text_weight=DEFAULT_TEXT_WEIGHT, top=15,
+			  tiers=None):
+	fit, text_fit, jel_fit = score_journals(profiles, title, abstract, keywords, jel_codes, text_weight)
+	catalog = load_database().journals.set_index('Journal')
+	ranking = pd.DataFrame({'Journal': profiles.journals, 'Fit': fit, 'Text Fit': text_fit, 'JEL Fit': jel_fit})
+	ranking = ranking.join(catalog[['Tier', 'Acceptance Rate', 'Impact Factor']], on='Journal')
+	if tiers:
+		ranking = ranking[ranking['Tier'].isin(list(tiers))]
+	order = np.lexsort((ranking['Journal'].to_numpy(), -ranking['Fit'].to_numpy()))[:top]
+	shortlist = ranking.iloc[order].reset_index(drop=True)
+	shortlist.insert(0, 'Rank', np.arange(1, len(shortlist) + 1))
+	return shortlist
@@ -0,0 +1,142 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Journal submission rules used to check a manuscript against target
+# journals. Limits are approximate and should be verified against each
+# journal's current author guidelines; NaN means the journal sets no limit.
+# The 'General Guidance' row holds the thresholds used by the title and
+# abstract analyzer when no journal is selected.
+
+GENERAL_GUIDANCE = 'General Guidance'
+
+_NO = np.nan
+
+JOURNAL_RULES = pd.DataFrame({
+	'Journal': [
+		GENERAL_GUIDANCE,
+		'American Economic Review',
+		'Quarterly Journal of Economics',
+		'Journal of Political Economy',
+		'Econometrica',
+		'Review of Economic Studies',
+		'Journal of Economic Literature',
+		'Journal of Economic Perspectives',
+		'Economic Journal',
+		'Review of Economics and Statistics',
+		'Journal of the European Economic Association',
+		'American Economic Journal: Applied',
+		'Journal of Finance',
+		'Journal of Monetary Economics',
+		'Journal of Labor Economics',
+		'Journal of Development Economics',
+		'Journal of Public Economics',
+		'Journal of International Economics',
+		'Journal of Urban Economics',
+		'Economic Development and Cultural Change',
+		'Journal of Environmental Economics and Management',
+		'China Economic Review',
+		'Eastern Economic Journal',
+		'Journal of African Economies'
+	],
+	'Tier': [
+		'',
+		'Top-5', 'Top-5', 'Top-5', 'Top-5', 'Top-5',
+		'General Excellence', 'General Excellence', 'General Excellence', 'General Excellence', 'General Excellence',
+		'Top Field', 'Top Field', 'Top Field', 'Top Field', 'Top Field', 'Top Field', 'Top Field',
+		'Solid Field', 'Solid Field', 'Solid Field',
+		'Regional/Specialized', 'Regional/Specialized', 'Regional/Specialized'
+	],
+	'Abstract Min Words': [
+		50, 50, 50, 50, 50, 50, 50, 50, 50, 50, 50, 50, 50, 50, 50,
+		50, 50, 50, 50, 50, 50, 50, 50, 50
+	],
+	'Abstract Max Words': [
+		250, 100, 150, 150, 150, 150, 100, 100, 100, 100, 150, 100, 100, 150, 150,
+		150, 150, 150, 150, 150, 150, 200, 150, 150
+	],
+	'Title Min Words': [
+		6, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO,
+		_NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO
+	],
+	'Title Max Words': [
+		15, _NO, _NO, _NO, _NO, _NO, _NO, _NO, 20, _NO, _NO, _NO, _NO, 25, _NO,
+		25, 25, 25, 25, _NO, 25, 25, _NO, _NO
+	],
+	'Keywords Min': [
+		0, 0, 0, 0, 1, 1, 0, 0, 1, 0, 1, 0, 0, 1, 0,
+		1, 1, 1, 1, 0, 1, 1, 1, 1
+	],
+	'Keywords Max': [
+		_NO, _NO, _NO, _NO, 6, 6, _NO, _NO, 6, _NO, 6, _NO, _NO, 6, _NO,
+		6, 6, 6, 6, _NO, 6, 6, 6, 6
+	],
+	'JEL Required': [
+		False, True, True, True, False, True, True, True, True, True, True, True, True, True, True,
+		True, True, True, True, False, True, True, True, True
+	],
+	'JEL Max': [
+		_NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO,
+		_NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO
+	],
+	'Page Limit': [
+		_NO, _NO, _NO, _NO, _NO, _NO, _NO, _NO, 50, 45, 50, _NO, 50, _NO, 50,
+		_NO, _NO, _NO, _NO, _NO, _NO, _NO, 35, _NO
+	]
+})
+
+# Most journals ask for 1-3 JEL codes (see "12. Submission Process")
+JOURNAL_RULES.loc[JOURNAL_RULES['JEL Required'], 'JEL Max'] = 3
+
+_JEL_CODE = re.compile(r'\b([A-Z]\d{0,2})\b')
+
+
+# Function to count the words of a text the same way as the analyzer
+def word_count(text):
+	return len(text.split())
+
+
+# Function to split free-text keyword or JEL input into items
+def split_items(text):
+	return [item.strip() for item in re.split(r'[;,\n]', text or '') if item.strip()]
+
+
+# Function to return the rules row for one journal
+def journal_rule(journal):
+	rows = JOURNAL_RULES[JOURNAL_RULES['Journal'] == journal]
+	if rows.empty:
+		raise KeyError(f"No rules for journal {journal!r}")
+	return rows.iloc[0]
+
+
+def _within(value, low, high):
+	# Missing limits always pass
+	low = np.where(np.isnan(low), -np.inf, low)
+	high = np.where(np.isnan(high), np.inf, high)
+	return (value >= low) & (value <= high)
+
+
+# Function to check one manuscript against the selected journals (all by
+# default). Every rule is evaluated as one array comparison across journals.
+def check_manuscript(title, abstract, keywords=(), jel_codes=(), pages=None, journals=None):
+	rules = JOURNAL_RULES[JOURNAL_RULES['Journal'] != GENERAL_GUIDANCE]
+	if journals is not None:
+		rules = rules[rules['Journal'].isin(list(journals))]
+
+	title_words = word_count(title)
+	abstract_words = word_count(abstract)
+	n_keywords = len(keywords)
+	n_jel = len([code for code in jel_codes if _JEL_CODE.fullmatch(code.strip().upper())])
+
+	checks = pd.DataFrame({
+		'Journal': rules['Journal'].to_numpy(),
+		'Tier': rules['Tier'].to_numpy(),
+		'Abstract': _within(abstract_words, rules['Abstract Min Words'].to_numpy(float), rules['Abstract Max Words'].to_numpy(float)),
+		'Title': _within(title_words, rules['Title Min Words'].to_numpy(float), rules['Title Max Words'].to_numpy(float)),
+		'Keywords': _within(n_keywords, rules['Keywords Min'].to_numpy(float), rules['Keywords Max'].to_numpy(float)),
+		'JEL Codes': (~rules['JEL Required'].to_numpy(bool) | (n_jel > 0)) & _within(n_jel, np.full(len(rules), np.nan), rules['JEL Max'].to_numpy(float)),
+		'Pages': np.ones(len(rules), dtype=bool) if pages is None else _within(pages, np.full(len(rules), np.nan), rules['Page Limit'].to_numpy(float)),
+	})
+	checks['Compliant'] = checks[['Abstract', 'Title', 'Keywords', 'JEL Codes', 'Pages']].all(axis=1)
+	return checks.sort_values(['Compliant', 'Journal'], ascending=[False, True], kind='stable').reset_index(drop=True)
@@ -0,0 +1,340 @@
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from regression import OLSResult, solve_cholesky, sandwich_cov, p_values, _critical_value
+from fixed_effects import factorize, demean, absorbed_degrees_of_freedom, nested_in
+
+# Specification-curve (multiverse) runner for the robustness figures on the
+# "8. Results" page. A grid declares named options for each dimension of the
+# `spec_table` schema in "7. Methodology":
+#
+#   grid = {
+#       'Controls':      {'Basic': ['age', 'female'], 'Basic + Additional': [...]},
+#       'Fixed Effects': {'None': [], 'State, Year': ['state', 'year']},
+#       'Sample':        {'Full': None, 'Urban': 'urban == 1'},
+#       'Clustering':    {'Robust': None, 'State': 'state'},
+#       'Estimator':     {'OLS': None, 'WLS': 'population'},
+#   }
+#
+# Specifications sharing the same sample, fixed effects, estimator and
+# clustering form a group. Each group demeans/weights the data once and forms
+# the cross-product of all its variables, so every control set is solved from
+# a submatrix in O(k^3); only robust or clustered standard errors need a pass
+# over the residuals. Groups run in a process pool that attaches to the data
+# through shared memory, and finished groups are streamed to a CSV file.
+
+DIMENSIONS = ['Controls', 'Fixed Effects', 'Sample', 'Clustering', 'Estimator']
+
+RESULT_COLUMNS = ['Specification'] + DIMENSIONS + [
+	'Coefficient', 'Std. Error', 'p-value', 'CI Low', 'CI High', 'Observations', 'R-squared'
+]
+
+# Memory for precomputed per-cluster cross-products (G x p x p floats plus
+# one specification's slice of them), shared by all worker processes
+_CLUSTER_MEMORY = 256 * 1024 ** 2
+
+# Arrays of a pool worker, attached by _init_worker
+_SHARED = {}
+
+
+# Function to enumerate every subset of optional controls on top of a base set
+def control_sets(base, optional):
+	sets = {}
+	for r in range(len(optional) + 1):
+		for combo in itertools.combinations(optional, r):
+			name = ' + '.join(['Base'] + list(combo)) if base else (' + '.join(combo) or 'None')
+			sets[name] = list(base) + list(combo)
+	return sets
+
+
+# Function to turn a spec_table-like DataFrame into a grid. `columns` maps
+# the labels used in the table (e.g. 'Basic Controls', 'State', 'Year') to
+# dataset columns (a list for control groups, a column name otherwise).
+def grid_from_spec_table(spec_table, columns):
+	features = spec_table.set_index(spec_table.columns[0])
+	grid = {dimension: {} for dimension in DIMENSIONS}
+	for model in features.columns:
+		spec = features[model]
+		control_labels = [label for label in ('Basic Controls', 'Additional Controls')
+						  if label in spec.index and spec[label]]
+		grid['Controls'][' + '.join(control_labels) or 'None'] = [
+			c for label in control_labels for c in columns[label]
+		]
+		fe_label = spec.get('Fixed Effects', '') or 'None'
+		grid['Fixed Effects'][fe_label] = [columns[f.strip()] for f in fe_label.split(',') if f.strip() != 'None']
+		cluster_label = spec.get('Clustering', '') or 'Robust'
+		grid['Clustering'][cluster_label] = columns.get(cluster_label)
+	grid['Sample'] = {'Full': None}
+	grid['Estimator'] = {'OLS': None}
+	return grid
+
+
+def _normalize_grid(grid):
+	grid = {dimension: dict(grid.get(dimension) or {}) for dimension in DIMENSIONS}
+	defaults = {'Controls': {'None': []}, 'Fixed Effects': {'None': []}, 'Sample': {'Full': None},
+				'Clustering': {'Robust': None}, 'Estimator': {'OLS': None}}
+	for dimension in DIMENSIONS:
+		if not grid[dimension]:
+			grid[dimension] = defaults[dimension]
+	return grid
+
+
+# Function to list every specification of the grid (cartesian product)
+def enumerate_specifications(grid):
+	grid = _normalize_grid(grid)
+	combos = itertools.product(*(grid[dimension].keys() for dimension in DIMENSIONS))
+	specs = pd.DataFrame(list(combos), columns=DIMENSIONS)
+	specs.insert(0, 'Specification', np.arange(1, len(specs) + 1))
+	return specs
+
+
+def _attach(blocks):
+	# Process-pool initializer: map the shared arrays into this worker
+	for key, (name, shape, dtype) in blocks.items():
+		shm = shared_memory.SharedMemory(name=name)
+		_SHARED[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+		_SHARED['_shm_' + key] = shm
+
+
+# Function to return the factor codes of a sample, cached per run (or per
+# worker) so specifications sharing a sample and fixed effects factorize
+# only once
+def _fixed_effects(shared, sample, rows, fe_columns):
+	cache = shared.setdefault('_fe_cache', {})
+	key = (sample, tuple(fe_columns))
+	if key not in cache:
+		C, factor_index = shared['codes'], shared['factor_index']
+		cache[key] = factorize({f: C[rows, factor_index[f]] for f in fe_columns}, fe_columns)
+	return cache[key]
+
+
+# Function to accumulate per-cluster cross-products A_g = sum_{i in g} z_i z_i'
+# so clustered scores of any specification follow without another data pass
+def _cluster_crossproducts(Z, codes, n_clusters):
+	p = Z.shape[1]
+	A = np.empty((n_clusters, p, p))
+	for a in range(p):
+		for b in range(a, p):
+			A[:, a, b] = A[:, b, a] = np.bincount(codes, weights=Z[:, a] * Z[:, b], minlength=n_clusters)
+	return A
+
+
+# Function to fit one group of specifications on the arrays of `shared`
+# (the worker's shared-memory arrays when not given)
+def _fit_group(task, shared=None):
+	shared = _SHARED if shared is None else shared
+	sample, fe_columns, cluster_column, weight_column, specs = task
+	V, C, M = shared['values'], shared['codes'], shared['samples']
+	factor_index = shared['factor_index']
+	rows = np.flatnonzero(M[:, sample]) if sample is not None else np.arange(len(V))
+
+	variables = sorted({0, 1} | {j for _, _, controls in specs for j in controls})
+	position = {j: i for i, j in enumerate(variables)}
+	Z = V[np.ix_(rows, variables)]
+	weights = V[rows, weight_column] if weight_column is not None else None
+	n = len(rows)
+
+	fe = None
+	if fe_columns:
+		fe = _fixed_effects(shared, sample, rows, fe_columns)
+		Z, _ = demean(Z, fe, weights, copy=False)
+		absorbed = absorbed_degrees_of_freedom(fe)
+		has_constant = False
+	else:
+		Z = np.column_stack([Z, np.ones(n)])
+		absorbed = 0
+		has_constant = True
+	if weights is not None:
+		Z *= np.sqrt(weights)[:, None]
+	# Column-major so each specification gathers its columns with memcpy
+	Z = np.asfortranarray(Z)
+
+	cross = Z.T @ Z
+	y_pos = position[0]
+	y = Z[:, y_pos]
+	yy = cross[y_pos, y_pos]
+	# Centered (weighted) TSS from the constant column; with fixed effects the
+	# reported R-squared is the within R-squared
+	tss = yy - cross[-1, y_pos] ** 2 / cross[-1, -1] if has_constant else yy
+
+	clusters, A = None, None
+	if cluster_column is not None:
+		clusters, uniques = pd.factorize(C[rows, factor_index[cluster_column]])
+		n_clusters = len(uniques)
+		if fe is not None:
+			absorbed = absorbed_degrees_of_freedom(fe, nested_in(fe, clusters))
+		if 2 * 8 * n_clusters * Z.shape[1] ** 2 <= shared.get('cluster_memory', _CLUSTER_MEMORY):
+			A = _cluster_crossproducts(Z, clusters, n_clusters)
+
+	out = []
+	for spec_id, labels, controls in specs:
+		idx = [position[1]] + [position[j] for j in controls] + ([Z.shape[1] - 1] if has_constant else [])
+		k = len(idx)
+		df_resid = n - k - absorbed
+		try:
+			beta, XtX_inv = solve_cholesky(cross[np.ix_(idx, idx)], cross[idx, y_pos])
+		except np.linalg.LinAlgError:
+			out.append([spec_id] + labels + [np.nan] * 5 + [n, np.nan])
+			continue
+		ssr = float(yy - beta @ cross[idx, y_pos])
+
+		if A is not None:
+			scores = A[:, idx, y_pos] - A[:, idx][:, :, idx] @ beta
+			scale = n_clusters / (n_clusters - 1) * (n - 1) / df_resid
+			cov, cov_type = scale * XtX_inv @ (scores.T @ scores) @ XtX_inv, 'cluster'
+		else:
+			X = Z[:, idx]
+			resid = y - X @ beta
+			if clusters is not None:
+				cov, _ = sandwich_cov(X, resid, XtX_inv, 'cluster', clusters, df_resid)
+				cov_type = 'cluster'
+			else:
+				weighted = X.T * resid
+				cov, cov_type = XtX_inv @ (weighted @ weighted.T) @ XtX_inv * (n / df_resid), 'HC1'
+
+		result = OLSResult(['treatment'], beta[:1], np.sqrt(np.diag(cov))[:1], cov[:1, :1], n, df_resid,
+						   1 - ssr / tss if tss > 0 else np.nan, ssr, cov_type,
+						   n_clusters if clusters is not None else None)
+		crit = _critical_value(result, 0.05)
+		coef, se = result.params[0], result.bse[0]
+		out.append([spec_id] + labels + [coef, se, p_values(result)[0], coef - crit * se, coef + crit * se,
+										 n, result.rsquared])
+	return out
+
+
+def _share(arrays):
+	blocks, handles = {}, []
+	for key, array in arrays.items():
+		array = np.ascontiguousarray(array)
+		shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+		np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+		blocks[key] = (shm.name, array.shape, array.dtype)
+		handles.append(shm)
+	return blocks, handles
+
+
+# Function to run every specification of the grid. With n_jobs > 1 the
+# groups are fitted in a process pool sharing the data through shared
+# memory; with `output` set, rows are appended to that CSV as groups finish.
+def run_multiverse(data, outcome, treatment, grid, n_jobs=1, output=None, progress=None):
+	grid = _normalize_grid(grid)
+	specs = enumerate_specifications(grid)
+
+	control_columns = sorted({c for cols in grid['Controls'].values() for c in cols})
+	weight_columns = sorted({w for w in grid['Estimator'].values() if w})
+	factor_columns = sorted({f for cols in grid['Fixed Effects'].values() for f in cols} |
+							{c for c in grid['Clustering'].values() if c})
+	numeric = [outcome, treatment] + [c for c in control_columns + weight_columns if c not in (outcome, treatment)]
+
+	# One common estimation sample across all specifications
+	sample_data = data.dropna(subset=list(dict.fromkeys(numeric + factor_columns)))
+	column_index = {c: i for i, c in enumerate(numeric)}
+	factor_index = {c: i for i, c in enumerate(factor_columns)}
+	values = sample_data[numeric].to_numpy(dtype=float)
+	codes = np.column_stack([pd.factorize(sample_data[c])[0] for c in factor_columns]) if factor_columns \
+		else np.zeros((len(sample_data), 0), dtype=np.int64)
+
+	sample_names = list(grid['Sample'])
+	masks = np.column_stack([
+		np.ones(len(sample_data), bool) if query is None
+		else (sample_data[query].to_numpy(bool) if query in sample_data.columns
+			  else sample_data.eval(query).to_numpy(bool))
+		for query in grid['Sample'].values()
+	])
+
+	# Group specifications that share all data transformations
+	tasks = {}
+	for row in specs.itertuples(index=False):
+		spec_id, control_name, fe_name, sample_name, cluster_name, estimator_name = row
+		key = (sample_names.index(sample_name), fe_name, cluster_name, estimator_name)
+		if key not in tasks:
+			weight = grid['Estimator'][estimator_name]
+			tasks[key] = (
+				key[0], list(grid['Fixed Effects'][fe_name]), grid['Clustering'][cluster_name],
+				column_index[weight] if weight else None, []
+			)
+		controls = [column_index[c] for c in grid['Controls'][control_name] if c not in (outcome, treatment)]
+		tasks[key][4].append((spec_id, [control_name, fe_name, sample_name, cluster_name, estimator_name], controls))
+	tasks = list(tasks.values())
+
+	arrays = {'values': values, 'codes': codes, 'samples': masks}
+	if output and os.path.exists(output):
+		os.remove(output)
+	collected = []
+
+	def handle(rows):
+		frame = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+		collected.append(frame)
+		if output:
+			frame.to_csv(output, mode='a', header=not os.path.exists(output), index=False)
+		if progress:
+			progress(sum(len(f) for f in collected), len(specs))
+
+	if n_jobs == 1 or len(tasks) == 1:
+		# The arrays of this run only, so concurrent runs in one process do
+		# not see each other's data
+		shared = dict(arrays, factor_index=factor_index, cluster_memory=_CLUSTER_MEMORY)
+		for task in tasks:
+			handle(_fit_group(task, shared))
+	else:
+		blocks, handles = _share(arrays)
+		try:
+			# Every worker may hold one group's cluster cross-products at once
+			with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+									 initargs=(blocks, factor_index, _CLUSTER_MEMORY // n_jobs)) as pool:
+				for future in as_completed([pool.submit(_fit_group, task) for task in tasks]):
+					handle(future.result())
+		finally:
+			for shm in handles:
+				shm.close()
+				shm.unlink()
+
+	results = pd.concat(collected, ignore_index=True) if collected else pd.DataFrame(columns=RESULT_COLUMNS)
+	return results.sort_values('Specification', kind='stable').reset_index(drop=True)
+
+
+def _init_worker(blocks, factor_index, cluster_memory):
+	_attach(blocks)
+	_SHARED['factor_index'] = factor_index
+	_SHARED['cluster_memory'] = cluster_memory
+
+
+# Function to draw the specification curve: sorted estimates with confidence
+# intervals on top, the choices behind each specification underneath
+def plot_specification_curve(results, dimensions=None, alpha=0.05):
+	results = results.dropna(subset=['Coefficient']).sort_values('Coefficient').reset_index(drop=True)
+	dimensions = [d for d in (dimensions or DIMENSIONS) if results[d].nunique() > 1]
+	rows = [(d, option) for d in dimensions for option in sorted(results[d].unique())]
+
+	fig, (ax_top, ax_bottom) = plt.subplots(
+		2, 1, figsize=(10, 4 + 0.3 * max(len(rows), 1)), sharex=True,
+		gridspec_kw={'height_ratios': [3, max(len(rows), 1) * 0.35 + 0.5]}
+	)
+	x = np.arange(len(results))
+	significant = (results['p-value'] < alpha).to_numpy()
+	colors = np.where(significant, 'steelblue', 'lightgray')
+	ax_top.vlines(x, results['CI Low'], results['CI High'], colors=colors, alpha=0.6,
+				  linewidth=1 if len(results) < 500 else 0.3)
+	ax_top.scatter(x, results['Coefficient'], c=colors, s=12 if len(results) < 500 else 2, zorder=3)
+	ax_top.axhline(0, color='red', linestyle='--', alpha=0.5)
+	ax_top.set_ylabel('Coefficient Estimate')
+	ax_top.set_title(f'Specification Curve ({len(results):,} specifications; blue: p < {alpha})')
+	ax_top.grid(axis='y', linestyle='--', alpha=0.7)
+
+	for i, (dimension, option) in enumerate(rows):
+		used = (results[dimension] == option).to_numpy()
+		ax_bottom.scatter(x[used], np.full(used.sum(), i), marker='|', color='black',
+						  s=40 if len(results) < 500 else 10)
+	ax_bottom.set_yticks(range(len(rows)))
+	ax_bottom.set_yticklabels([f'{d}: {o}' for d, o in rows], fontsize=8)
+	ax_bottom.set_ylim(-0.5, len(rows) - 0.5)
+	ax_bottom.invert_yaxis()
+	ax_bottom.set_xlabel('Specifications (ranked by estimate)')
+	fig.tight_layout()
+	return fig
@@ -0,0 +1,285 @@
+import sys
+import queue
+import argparse
+import threading
+from collections import namedtuple
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from regression import OLSResult, COV_TYPES, solve_cholesky, coefficient_table
+
+# Out-of-core OLS for datasets that do not fit in memory. A CSV or Parquet
+# file is streamed in chunks and only the sufficient statistics are kept:
+# the cross-product of [X, y]. Memory is O(k^2) instead of O(n * k).
+# Robust covariances take a second pass once beta is known: HC meat matrices
+# are O(k^2), clustered scores O(G * k). Chunks are read on a background
+# thread so parsing overlaps with the matrix products. Results are OLSResult
+# tuples, so they feed the same coefficient and results tables as
+# regression.fit_ols.
+
+Moments = namedtuple('Moments', ['names', 'n', 'cross', 'shift', 'has_constant'])
+
+DEFAULT_CHUNKSIZE = 250_000
+
+
+# Function to iterate over a CSV or Parquet file in DataFrame chunks
+def iter_chunks(path, columns, chunksize=DEFAULT_CHUNKSIZE):
+	if str(path).lower().endswith(('.parquet', '.pq')):
+		try:
+			import pyarrow.parquet as pq
+		except ImportError:
+			raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow)")
+		parquet = pq.ParquetFile(path)
+		try:
+			for batch in parquet.iter_batches(batch_size=chunksize, columns=list(columns)):
+				yield batch.to_pandas()
+		finally:
+			if hasattr(parquet, 'close'):
+				parquet.close()
+	else:
+		with pd.read_csv(path, usecols=list(columns), chunksize=chunksize) as reader:
+			yield from reader
+
+
+# Function to list the columns of a CSV or Parquet file without reading rows
+def file_columns(path):
+	if str(path).lower().endswith(('.parquet', '.pq')):
+		import pyarrow.parquet as pq
+		return list(pq.ParquetFile(path).schema_arrow.names)
+	return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+# Function to read ahead from an iterator on a background thread. When the
+# consumer stops early (or closes the generator) the reader stops too and
+# the iterator is closed, which closes its file.
+def prefetch(iterator, depth=2, poll_seconds=0.1):
+	buffer = queue.Queue(maxsize=depth)
+	stop = threading.Event()
+	done = object()
+
+	def offer(item):
+		# Wait for room in the buffer unless the consumer has gone
+		while not stop.is_set():
+			try:
+				buffer.put(item, timeout=poll_seconds)
+				return True
+			except queue.Full:
+				pass
+		return False
+
+	def produce():
+		try:
+			for item in iterator:
+				if not offer(item):
+					break
+		except BaseException as error:
+			offer(error)
+		finally:
+			if hasattr(iterator, 'close'):
+				iterator.close()
+			offer(done)
+
+	threading.Thread(target=produce, daemon=True).start()
+	try:
+		while True:
+			item = buffer.get()
+			if item is done:
+				return
+			if isinstance(item, BaseException):
+				raise item
+			yield item
+	finally:
+		stop.set()
+
+
+def _design_chunk(chunk, outcome, regressors, cluster, add_constant):
+	chunk = chunk.dropna(subset=[outcome] + list(regressors) + ([cluster] if cluster else []))
+	Z = np.empty((len(chunk), len(regressors) + int(add_constant) + 1))
+	for j, name in enumerate(regressors):
+		Z[:, j] = chunk[name].to_numpy(dtype=float)
+	if add_constant:
+		Z[:, -2] = 1.0
+	Z[:, -1] = chunk[outcome].to_numpy(dtype=float)
+	return Z, (chunk[cluster].to_numpy() if cluster else None)
+
+
+# Function to accumulate the sufficient statistics over chunks. Z = [X, y];
+# rows missing the cluster variable are dropped so the sample matches the
+# clustered second pass. With a constant, every column is shifted by its
+# first value before the products are summed, which keeps y'y - b'X'y free
+# of cancellation when the data have large means; ols_from_moments maps the
+# results back.
+def accumulate_moments(chunks, outcome, regressors, cluster=None, add_constant=True):
+	names = list(regressors) + (['Constant'] if add_constant else [])
+	p = len(names) + 1
+	n, cross, shift = 0, np.zeros((p, p)), None
+
+	for chunk in chunks:
+		Z, _ = _design_chunk(chunk, outcome, regressors, cluster, add_constant)
+		if not len(Z):
+			continue
+		if shift is None:
+			shift = Z[0].copy() if add_constant else np.zeros(p)
+			if add_constant:
+				shift[-2] = 0.0
+		Z -= shift
+		n += len(Z)
+		cross += Z.T @ Z
+
+	return Moments(names, n, cross, np.zeros(p) if shift is None else shift, add_constant)
+
+
+def _unshift(moments):
+	# With x = x_s + s and y = y_s + s_y only the intercept changes:
+	# beta = T beta_s + s_y e_c and V = T V_s T', where T = I - e_c s'
+	k = len(moments.names)
+	T = np.eye(k)
+	if moments.has_constant:
+		T[-1, :] -= moments.shift[:k]
+	return T
+
+
+# Function to solve the normal equations from accumulated moments; returns
+# beta and (X'X)^-1 in the original (unshifted) units, the SSR and the TSS
+def solve_moments(moments):
+	n, cross = moments.n, moments.cross
+	k = len(moments.names)
+	if n <= k:
+		raise ValueError(f"Need more observations ({n}) than regressors ({k})")
+	XtX, Xty, yy = cross[:k, :k], cross[:k, k], cross[k, k]
+	beta_s, XtX_inv_s = solve_cholesky(XtX, Xty)
+	ssr = max(float(yy - beta_s @ Xty), 0.0)
+	tss = float(yy - cross[k - 1, k] ** 2 / n) if moments.has_constant else float(yy)
+
+	T = _unshift(moments)
+	beta = T @ beta_s
+	if moments.has_constant:
+		beta[-1] += moments.shift[k]
+	return beta, T @ XtX_inv_s @ T.T, ssr, tss
+
+
+# Function to solve OLS from accumulated moments. Classical covariances need
+# nothing else; HC0-HC3 take a meat matrix and clustered ones the cross-product
+# of the cluster scores (with the number of clusters) from a second pass.
+def ols_from_moments(moments, cov_type='classical', meat=None, n_clusters=None):
+	n = moments.n
+	k = len(moments.names)
+	beta, XtX_inv, ssr, tss = solve_moments(moments)
+	df_resid = n - k
+
+	if cov_type == 'classical':
+		cov = XtX_inv * ssr / df_resid
+		n_clusters = None
+	elif cov_type == 'cluster':
+		if meat is None or n_clusters is None:
+			raise ValueError("Clustered standard errors need the cluster scores from a second pass")
+		if n_clusters < 2:
+			raise ValueError("Clustered standard errors need at least two clusters")
+		scale = n_clusters / (n_clusters - 1) * (n - 1) / df_resid
+		cov = scale * XtX_inv @ meat @ XtX_inv
+	elif cov_type in ('HC0', 'HC1', 'HC2', 'HC3'):
+		n_clusters = None
+		if meat is None:
+			raise ValueError(f"{cov_type} standard errors need the meat matrix from a second pass")
+		cov = XtX_inv @ meat @ XtX_inv
+		if cov_type == 'HC1':
+			cov *= n / df_resid
+	else:
+		raise ValueError(f"Unknown cov_type {cov_type!r}; choose one of {COV_TYPES}")
+
+	return OLSResult(
+		names=moments.names,
+		params=beta,
+		bse=np.sqrt(np.diag(cov)),
+		cov=cov,
+		nobs=n,
+		df_resid=df_resid,
+		rsquared=1.0 - ssr / tss if tss > 0 else np.nan,
+		ssr=ssr,
+		cov_type=cov_type,
+		n_clusters=n_clusters
+	)
+
+
+# Function to accumulate the heteroskedasticity-robust meat over chunks
+def accumulate_meat(chunks, outcome, regressors, beta, XtX_inv, cov_type, add_constant=True):
+	k = len(beta)
+	meat = np.zeros((k, k))
+	for chunk in chunks:
+		Z, _ = _design_chunk(chunk, outcome, regressors, None, add_constant)
+		X, y = Z[:, :k], Z[:, k]
+		weight = (y - X @ beta) ** 2
+		if cov_type in ('HC2', 'HC3'):
+			leverage = np.einsum('ij,ij->i', X @ XtX_inv, X)
+			weight = weight / (1.0 - leverage) ** (1 if cov_type == 'HC2' else 2)
+		meat += (X.T * weight) @ X
+	return meat
+
+
+# Function to accumulate the score x_i * e_i of every cluster over chunks;
+# returns a clusters x k array
+def accumulate_cluster_scores(chunks, outcome, regressors, cluster, beta, add_constant=True):
+	k = len(beta)
+	cluster_index, scores = {}, np.zeros((0, k))
+	for chunk in chunks:
+		Z, labels = _design_chunk(chunk, outcome, regressors, cluster, add_constant)
+		if not len(Z):
+			continue
+		X, y = Z[:, :k], Z[:, k]
+		row_scores = X * (y - X @ beta)[:, None]
+		codes, uniques = pd.factorize(labels)
+		index = np.array([cluster_index.setdefault(u, len(cluster_index)) for u in uniques])
+		if len(cluster_index) > len(scores):
+			grown = np.zeros((max(len(cluster_index), 2 * len(scores)), k))
+			grown[:len(scores)] = scores
+			scores = grown
+		for j in range(k):
+			scores[index, j] += np.bincount(codes, weights=row_scores[:, j], minlength=len(uniques))
+	return scores[:len(cluster_index)]
+
+
+# Function to fit OLS on a CSV or Parquet file without loading it into memory
+def fit_ols_file(path, outcome, regressors, cov_type='HC1', cluster=None, add_constant=True,
+				 chunksize=DEFAULT_CHUNKSIZE):
+	if cov_type not in COV_TYPES:
+		raise ValueError(f"Unknown cov_type {cov_type!r}; choose one of {COV_TYPES}")
+	if cov_type == 'cluster' and not cluster:
+		raise ValueError("Clustered standard errors need a cluster variable")
+	cluster = cluster if cov_type == 'cluster' else None
+	columns = [outcome] + list(regressors) + ([cluster] if cluster else [])
+	with closing(prefetch(iter_chunks(path, columns, chunksize))) as chunks:
+		moments = accumulate_moments(chunks, outcome, regressors, cluster, add_constant)
+	if cov_type == 'classical':
+		return ols_from_moments(moments, cov_type)
+
+	# Robust and clustered covariances need the residuals: one more pass
+	beta, XtX_inv = solve_moments(moments)[:2]
+	with closing(prefetch(iter_chunks(path, columns, chunksize))) as chunks:
+		if cov_type == 'cluster':
+			scores = accumulate_cluster_scores(chunks, outcome, regressors, cluster, beta, add_constant)
+			return ols_from_moments(moments, cov_type, meat=scores.T @ scores, n_clusters=len(scores))
+		meat = accumulate_meat(chunks, outcome, regressors, beta, XtX_inv, cov_type, add_constant)
+	return ols_from_moments(moments, cov_type, meat=meat)
+
+
+# CLI: python out_of_core.py data.parquet y x1 x2 [--cluster id] [--cov HC1]
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Fit OLS on a CSV/Parquet file that does not fit in memory.")
+	parser.add_argument('path')
+	parser.add_argument('outcome')
+	parser.add_argument('regressors', nargs='+')
+	parser.add_argument('--cov', default='HC1', choices=COV_TYPES)
+	parser.add_argument('--cluster')
+	parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+	args = parser.parse_args(argv)
+
+	result = fit_ols_file(args.path, args.outcome, args.regressors, cov_type=args.cov,
+						  cluster=args.cluster, chunksize=args.chunksize)
+	coefficient_table(result).to_csv(sys.stdout, index=False)
+	print(f"\nObservations: {result.nobs:,}  R-squared: {result.rsquared:.4f}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+	main()
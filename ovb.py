@@ -0,0 +1,146 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from regression import solve_cholesky
+
+# Omitted-variable-bias explorer for the "Omitted variable bias" row of the
+# `concerns` table in "7. Methodology". It generalizes the notebook's
+#
+#   b1_tilde = b["ACT"] + b["hsGPA"] * delta_tilde["ACT"]
+#
+# to any number of candidate omitted variables. The short regression has the
+# treatment and the base controls; the long regression adds the candidates.
+# Following Gelbach (2016), the gap between the short and long coefficients
+# splits exactly into one term per candidate, delta_k * beta_k, where delta_k
+# is the treatment coefficient in the auxiliary regression of candidate k on
+# the short-regression variables and beta_k is its coefficient in the long
+# regression. Every regression is solved from one cross-product matrix of the
+# centered data, so all candidates cost a single pass over the rows.
+#
+# Oster (2019) bounds use her approximation
+#   beta* = beta_long - delta * (beta_short - beta_long) * (R_max - R_long) / (R_long - R_short)
+# evaluated by broadcasting over a grid of delta and R_max. Oster suggests
+# R_max = min(1.3 * R_long, 1) and delta = 1 as the benchmark.
+
+OSTER_R_MAX_MULTIPLIER = 1.3
+
+OVBSummary = namedtuple('OVBSummary', [
+	'treatment', 'short_coef', 'long_coef', 'short_r2', 'long_r2', 'total_bias', 'nobs'
+])
+
+# Function to compute the decomposition for all candidates. Returns the
+# per-candidate table and an OVBSummary with the short and long fits.
+def ovb_decomposition(data, outcome, treatment, candidates, controls=()):
+	candidates = [c for c in candidates if c not in (outcome, treatment) and c not in controls]
+	if not candidates:
+		raise ValueError("Select at least one candidate omitted variable")
+	short_vars = [treatment] + [c for c in controls if c not in (outcome, treatment)]
+	variables = short_vars + candidates + [outcome]
+	sample = data[variables].dropna()
+	n = len(sample)
+	if n <= len(variables):
+		raise ValueError(f"Need more observations ({n}) than variables ({len(variables)})")
+
+	# Centering absorbs the constant, which every regression includes
+	Z = sample.to_numpy(dtype=float)
+	Z -= Z.mean(axis=0)
+	cross = Z.T @ Z
+
+	s = len(short_vars)
+	short = list(range(s))
+	long = list(range(len(variables) - 1))
+	cand = list(range(s, len(variables) - 1))
+	y = len(variables) - 1
+	tss = cross[y, y]
+	if tss <= 0:
+		raise ValueError(f"{outcome} has no variation in the sample")
+
+	short_beta, short_inv = solve_cholesky(cross[np.ix_(short, short)], cross[short, y])
+	long_beta, long_inv = solve_cholesky(cross[np.ix_(long, long)], cross[long, y])
+	short_r2 = float(short_beta @ cross[short, y] / tss)
+	long_r2 = float(long_beta @ cross[long, y] / tss)
+
+	# Auxiliary regressions of every candidate on the short variables at once
+	delta = (short_inv @ cross[np.ix_(short, cand)])[0]
+	beta = long_beta[s:]
+	contribution = delta * beta
+	total = short_beta[0] - long_beta[0]
+
+	# Dropping only candidate k from the long model: by the partitioned
+	# inverse, the treatment coefficient moves by -beta_k * inv[0, k] / inv[k, k]
+	alone = -beta * long_inv[0, s:] / np.diag(long_inv)[s:]
+
+	with np.errstate(invalid='ignore', divide='ignore'):
+		share = contribution / total
+	table = pd.DataFrame({
+		'Candidate': candidates,
+		'Delta': delta,
+		'Beta (Long)': beta,
+		'Contribution': contribution,
+		'Share of Gap': share,
+		'Bias if Omitted Alone': alone
+	})
+	summary = OVBSummary(treatment, float(short_beta[0]), float(long_beta[0]), short_r2, long_r2, float(total), n)
+	return table, summary
+
+
+# Function to evaluate Oster's bias-adjusted coefficient over a grid:
+# returns an array of shape (len(deltas), len(r_max))
+def oster_bounds(summary, deltas, r_max):
+	deltas = np.asarray(deltas, dtype=float)[:, None]
+	r_max = np.asarray(r_max, dtype=float)[None, :]
+	movement = summary.long_r2 - summary.short_r2
+	if movement <= 0:
+		raise ValueError("The candidates do not raise the R-squared; Oster bounds are undefined")
+	return summary.long_coef - deltas * (summary.short_coef - summary.long_coef) * \
+		(r_max - summary.long_r2) / movement
+
+
+# Function to compute the delta that would drive the coefficient to zero
+# for each R_max (the usual "delta for beta = 0" robustness statistic)
+def oster_delta(summary, r_max):
+	r_max = np.asarray(r_max, dtype=float)
+	gap = summary.short_coef - summary.long_coef
+	with np.errstate(divide='ignore', invalid='ignore'):
+		return summary.long_coef * (summary.long_r2 - summary.short_r2) / (gap * (r_max - summary.long_r2))
+
+
+# Function to plot the per-candidate contributions to the short-long gap
+def plot_decomposition(table, summary, ax=None):
+	if ax is None:
+		fig, ax = plt.subplots(figsize=(8, max(3, 0.5 * len(table) + 1.5)))
+	else:
+		fig = ax.figure
+	ordered = table.sort_values('Contribution')
+	colors = ['indianred' if v > 0 else 'steelblue' for v in ordered['Contribution']]
+	ax.barh(ordered['Candidate'].astype(str), ordered['Contribution'], color=colors, alpha=0.8)
+	ax.axvline(0, color='black', linewidth=0.8)
+	ax.set_xlabel(f'Contribution to short - long gap in the {summary.treatment} coefficient')
+	ax.set_title(f'Short {summary.short_coef:.3f} vs. long {summary.long_coef:.3f} '
+				 f'(gap {summary.total_bias:.3f})')
+	ax.grid(axis='x', linestyle='--', alpha=0.7)
+	fig.tight_layout()
+	return fig
+
+
+# Function to draw the bias-adjusted coefficient over (R_max, delta) with
+# the contour where it crosses zero
+def plot_oster_bounds(summary, deltas, r_max, ax=None):
+	if ax is None:
+		fig, ax = plt.subplots(figsize=(8, 6))
+	else:
+		fig = ax.figure
+	surface = oster_bounds(summary, deltas, r_max)
+	filled = ax.contourf(r_max, deltas, surface, levels=20, cmap='viridis')
+	fig.colorbar(filled, ax=ax, label=f'Bias-adjusted coefficient on {summary.treatment}')
+	if surface.min() < 0 < surface.max():
+		zero = ax.contour(r_max, deltas, surface, levels=[0], colors='black', linewidths=2)
+		ax.clabel(zero, fmt={0: 'beta = 0'})
+	ax.set_xlabel('R-squared max')
+	ax.set_ylabel('delta (selection on unobservables / observables)')
+	ax.set_title('Oster Bounds')
+	fig.tight_layout()
+	return fig
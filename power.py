@@ -0,0 +1,241 @@
+import io
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import erf, sqrt
+from statistics import NormalDist
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+try:
+	from scipy import stats as _stats
+except ImportError:
+	_stats = None
+
+# Power and minimum detectable effect (MDE) for the "consider power issues"
+# advice in the `significance_comparison` table. For a design with J
+# clusters of m units, intraclass correlation rho, treatment share P and
+# covariates explaining R^2 of the outcome variance (Bloom 1995; Duflo,
+# Glennerster and Kremer 2007), the standard error of the treatment effect
+# in outcome standard deviations is
+#
+#   SE = sqrt((rho + (1 - rho) / m) * (1 - R^2) / (P * (1 - P) * J))
+#
+# and MDE = (t_{1-alpha/2} + t_{power}) * SE with J - 2 degrees of freedom.
+# Individual randomization is m = 1. Every function broadcasts over its
+# arguments, so a whole grid is one numpy expression. Simulation-based power
+# for clustered designs runs replications in a process pool with
+# SeedSequence-spawned streams, reproducible for any number of workers.
+
+GRID_PARAMETERS = ['n_clusters', 'cluster_size', 'icc', 'treatment_share', 'r2']
+
+PARAMETER_LABELS = {
+	'n_clusters': 'Number of clusters',
+	'cluster_size': 'Units per cluster',
+	'icc': 'Intraclass correlation',
+	'treatment_share': 'Share treated',
+	'r2': 'R-squared from covariates',
+}
+
+PowerSurface = namedtuple('PowerSurface', ['kind', 'axes', 'values'])
+SimulatedPower = namedtuple('SimulatedPower', ['power', 'std_error', 'replications', 'analytical'])
+
+_SIMULATION_BATCH = 100
+
+# Largest design (clusters x units per cluster) simulate_power accepts. Each
+# replication holds about ten float arrays of this length, so a million
+# units is roughly 80 MB per worker.
+MAX_SIMULATED_UNITS = 1_000_000
+
+
+def _t_cdf(x, df):
+	if _stats is not None:
+		return _stats.t.cdf(x, df)
+	return 0.5 * (1.0 + np.vectorize(erf)(np.asarray(x) / sqrt(2.0)))
+
+
+def _t_ppf(q, df):
+	if _stats is not None:
+		return _stats.t.ppf(q, df)
+	return np.vectorize(NormalDist().inv_cdf)(np.broadcast_to(q, np.shape(df)))
+
+
+def _degrees_of_freedom(n_clusters):
+	return np.maximum(np.asarray(n_clusters, dtype=float) - 2, 1)
+
+
+# Function to compute the standard error of the treatment effect (in units
+# of the outcome standard deviation unless sd is given)
+def standard_error(n_clusters, cluster_size=1, icc=0.0, treatment_share=0.5, r2=0.0, sd=1.0):
+	n_clusters, cluster_size, icc, treatment_share, r2 = np.broadcast_arrays(
+		*[np.asarray(v, dtype=float) for v in (n_clusters, cluster_size, icc, treatment_share, r2)])
+	design_effect = icc + (1.0 - icc) / cluster_size
+	return sd * np.sqrt(design_effect * (1.0 - r2) / (treatment_share * (1.0 - treatment_share) * n_clusters))
+
+
+# Function to compute the minimum detectable effect at the given power
+def mde(n_clusters, cluster_size=1, icc=0.0, treatment_share=0.5, r2=0.0, sd=1.0, alpha=0.05, power=0.8):
+	se = standard_error(n_clusters, cluster_size, icc, treatment_share, r2, sd)
+	df = _degrees_of_freedom(np.broadcast_to(n_clusters, se.shape))
+	return (_t_ppf(1 - alpha / 2, df) + _t_ppf(power, df)) * se
+
+
+# Function to compute the power to detect an effect (two-sided test)
+def power(effect, n_clusters, cluster_size=1, icc=0.0, treatment_share=0.5, r2=0.0, sd=1.0, alpha=0.05):
+	se = standard_error(n_clusters, cluster_size, icc, treatment_share, r2, sd)
+	df = _degrees_of_freedom(np.broadcast_to(n_clusters, se.shape))
+	critical = _t_ppf(1 - alpha / 2, df)
+	ncp = np.abs(np.asarray(effect, dtype=float)) / se
+	return _t_cdf(ncp - critical, df) + _t_cdf(-ncp - critical, df)
+
+
+# Function to compute the number of clusters needed to detect an effect,
+# iterating on the degrees of freedom of the t distribution
+def required_clusters(effect, cluster_size=1, icc=0.0, treatment_share=0.5, r2=0.0, sd=1.0,
+					  alpha=0.05, power=0.8):
+	unit_se = standard_error(1.0, cluster_size, icc, treatment_share, r2, sd)
+	clusters = np.full(unit_se.shape, 1e6) if unit_se.ndim else 1e6
+	for _ in range(20):
+		df = _degrees_of_freedom(clusters)
+		multiplier = _t_ppf(1 - alpha / 2, df) + _t_ppf(power, df)
+		clusters = np.maximum((multiplier * unit_se / np.abs(effect)) ** 2, 3.0)
+	return np.ceil(clusters)
+
+
+# Function to evaluate power or the MDE over a grid in one broadcast: each
+# parameter given as an array becomes one axis of the result, in the order
+# of GRID_PARAMETERS; scalars are held fixed
+def evaluate_grid(kind='mde', effect=None, alpha=0.05, target_power=0.8, sd=1.0, **parameters):
+	defaults = {'n_clusters': 100, 'cluster_size': 1, 'icc': 0.0, 'treatment_share': 0.5, 'r2': 0.0}
+	unknown = set(parameters) - set(defaults)
+	if unknown:
+		raise ValueError(f"Unknown parameters {sorted(unknown)}; choose from {GRID_PARAMETERS}")
+	values = {**defaults, **parameters}
+	axes = {name: np.asarray(values[name], dtype=float) for name in GRID_PARAMETERS if np.ndim(values[name]) > 0}
+	shaped = {}
+	for name in GRID_PARAMETERS:
+		value = np.asarray(values[name], dtype=float)
+		if name in axes:
+			shape = [1] * len(axes)
+			shape[list(axes).index(name)] = len(value)
+			value = value.reshape(shape)
+		shaped[name] = value
+
+	if kind == 'mde':
+		result = mde(sd=sd, alpha=alpha, power=target_power, **shaped)
+	elif kind == 'power':
+		if effect is None:
+			raise ValueError("Power surfaces need an effect size")
+		result = power(effect, sd=sd, alpha=alpha, **shaped)
+	else:
+		raise ValueError(f"Unknown kind {kind!r}; choose 'mde' or 'power'")
+	return PowerSurface(kind, axes, np.broadcast_to(result, tuple(len(v) for v in axes.values())))
+
+
+# Function to draw a contour plot of a two-parameter surface
+def plot_surface(surface, ax=None, effect=None, target_power=0.8):
+	if len(surface.axes) != 2:
+		raise ValueError("Contour plots need exactly two grid parameters")
+	if ax is None:
+		fig, ax = plt.subplots(figsize=(8, 6))
+	else:
+		fig = ax.figure
+	(y_name, y_values), (x_name, x_values) = surface.axes.items()
+	label = 'Minimum detectable effect (SD)' if surface.kind == 'mde' else 'Power'
+	filled = ax.contourf(x_values, y_values, surface.values, levels=20, cmap='viridis')
+	fig.colorbar(filled, ax=ax, label=label)
+	# Highlight the conventional targets: 80% power, or the effect of interest
+	level = target_power if surface.kind == 'power' else effect
+	if level is not None and surface.values.min() < level < surface.values.max():
+		line = ax.contour(x_values, y_values, surface.values, levels=[level], colors='white', linewidths=2)
+		ax.clabel(line, fmt={level: f'{level:g}'})
+	ax.set_xlabel(PARAMETER_LABELS[x_name])
+	ax.set_ylabel(PARAMETER_LABELS[y_name])
+	ax.set_title(label)
+	fig.tight_layout()
+	return fig
+
+
+# Function to render a contour plot to PNG bytes, cached per parameter grid
+# (all arguments must be hashable: tuples for the grid axes)
+@lru_cache(maxsize=128)
+def render_surface(kind, y_name, y_values, x_name, x_values, fixed, effect=None, alpha=0.05, target_power=0.8):
+	surface = evaluate_grid(kind, effect=effect, alpha=alpha, target_power=target_power,
+							**{y_name: list(y_values), x_name: list(x_values)}, **dict(fixed))
+	# Axes come back in GRID_PARAMETERS order; rows must follow y_name
+	if list(surface.axes) != [y_name, x_name]:
+		surface = PowerSurface(kind, {y_name: surface.axes[y_name], x_name: surface.axes[x_name]}, surface.values.T)
+	fig = plot_surface(surface, effect=effect, target_power=target_power)
+	buffer = io.BytesIO()
+	fig.savefig(buffer, format='png', dpi=100)
+	plt.close(fig)
+	return buffer.getvalue()
+
+
+def _simulate_batch(task):
+	design, effect, alpha, replications, seed = task
+	rng = np.random.default_rng(seed)
+	J, m = int(design['n_clusters']), int(design['cluster_size'])
+	icc, share, r2 = design['icc'], design['treatment_share'], design['r2']
+	n = J * m
+	cluster = np.repeat(np.arange(J), m)
+	df = J - 2
+	critical = float(_t_ppf(1 - alpha / 2, df))
+	n_treated = min(max(int(round(share * J)), 1), J - 1)
+	rejections = 0
+	for _ in range(replications):
+		treated = np.zeros(J)
+		treated[rng.choice(J, n_treated, replace=False)] = 1.0
+		# Covariate and error share the same cluster structure, so the
+		# residual ICC stays rho after the covariate absorbs R^2
+		x = np.sqrt(icc) * rng.standard_normal(J)[cluster] + np.sqrt(1 - icc) * rng.standard_normal(n)
+		u = np.sqrt(icc) * rng.standard_normal(J)[cluster] + np.sqrt(1 - icc) * rng.standard_normal(n)
+		y = effect * treated[cluster] + np.sqrt(r2) * x + np.sqrt(1 - r2) * u
+
+		X = np.column_stack([np.ones(n), treated[cluster], x])
+		XtX_inv = np.linalg.inv(X.T @ X)
+		beta = XtX_inv @ (X.T @ y)
+		resid = y - X @ beta
+		scores = np.column_stack([np.bincount(cluster, weights=X[:, j] * resid, minlength=J) for j in range(3)])
+		cov = XtX_inv @ (scores.T @ scores) @ XtX_inv * (J / (J - 1)) * ((n - 1) / (n - 3))
+		rejections += abs(beta[1]) / np.sqrt(cov[1, 1]) > critical
+	return rejections
+
+
+# Function to estimate power by simulation for several designs (dicts of
+# GRID_PARAMETERS). All (design, batch) pairs share one process pool; batch
+# b of every design draws from its own SeedSequence child, so results do not
+# depend on n_jobs. Designs above MAX_SIMULATED_UNITS raise ValueError.
+def simulate_power(effect, designs, replications=1000, alpha=0.05, seed=0, n_jobs=1):
+	single = isinstance(designs, dict)
+	designs = [designs] if single else list(designs)
+	defaults = {'cluster_size': 1, 'icc': 0.0, 'treatment_share': 0.5, 'r2': 0.0}
+	designs = [{**defaults, **design} for design in designs]
+	for design in designs:
+		units = int(design['n_clusters']) * int(design['cluster_size'])
+		if units > MAX_SIMULATED_UNITS:
+			raise ValueError(f"A design of {units:,} units is too large to simulate; "
+							 f"the limit is {MAX_SIMULATED_UNITS:,}")
+
+	tasks, owners = [], []
+	streams = np.random.SeedSequence(seed).spawn(len(designs))
+	for index, (design, stream) in enumerate(zip(designs, streams)):
+		sizes = [min(_SIMULATION_BATCH, replications - start) for start in range(0, replications, _SIMULATION_BATCH)]
+		for size, child in zip(sizes, stream.spawn(len(sizes))):
+			tasks.append((design, effect, alpha, size, child))
+			owners.append(index)
+
+	if n_jobs == 1:
+		counts = [_simulate_batch(task) for task in tasks]
+	else:
+		with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+			counts = list(pool.map(_simulate_batch, tasks, chunksize=max(1, len(tasks) // (4 * n_jobs))))
+
+	rejections = np.bincount(owners, weights=counts, minlength=len(designs))
+	results = []
+	for design, rejected in zip(designs, rejections):
+		share = float(rejected / replications)
+		analytical = float(power(effect, alpha=alpha, **design))
+		results.append(SimulatedPower(share, np.sqrt(share * (1 - share) / replications), replications, analytical))
+	return results[0] if single else results
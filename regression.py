@@ -0,0 +1,292 @@
+from collections import namedtuple
+from math import erfc, sqrt
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+try:
+	from scipy import stats as _stats
+	from scipy import linalg as _linalg
+except ImportError:
+	_stats = None
+	_linalg = None
+
+# OLS estimation for the "8. Results" page. Coefficients are solved from a
+# Cholesky factorization of the (column-equilibrated) X'X, falling back to
+# QR when the cross-product matrix is ill-conditioned. With a constant, the
+# cross-products are taken after shifting every column by its first row (as
+# in out_of_core.accumulate_moments), so regressors with large means do not
+# lose precision to cancellation; only the intercept is mapped back.
+# Residual-based quantities are accumulated over row chunks, so besides X
+# and y only O(chunk * k) temporaries are allocated.
+
+SOLVERS = ['cholesky', 'qr']
+COV_TYPES = ['classical', 'HC0', 'HC1', 'HC2', 'HC3', 'cluster']
+
+OLSResult = namedtuple('OLSResult', [
+	'names', 'params', 'bse', 'cov', 'nobs', 'df_resid', 'rsquared', 'ssr', 'cov_type', 'n_clusters'
+])
+
+_CHUNK_ROWS = 1 << 16
+
+
+def _chunks(n, size=None):
+	size = size or _CHUNK_ROWS
+	for start in range(0, n, size):
+		yield slice(start, min(start + size, n))
+
+
+# Function to compute (X'X)^-1 and beta from the cross-products via Cholesky
+def solve_cholesky(XtX, Xty):
+	d = np.sqrt(np.diag(XtX))
+	d[d == 0] = 1.0
+	A = XtX / np.outer(d, d)
+	L = np.linalg.cholesky(A)
+	# Pivots near zero mean (numerically) collinear regressors
+	if np.min(np.diag(L)) < 1e-7:
+		raise np.linalg.LinAlgError("Cross-product matrix is numerically singular")
+	if _linalg is not None:
+		beta = _linalg.cho_solve((L, True), Xty / d) / d
+		XtX_inv = _linalg.cho_solve((L, True), np.eye(len(d))) / np.outer(d, d)
+	else:
+		beta = np.linalg.solve(A, Xty / d) / d
+		XtX_inv = np.linalg.solve(A, np.eye(len(d))) / np.outer(d, d)
+	return beta, XtX_inv
+
+
+def _solve_qr(X, y):
+	Q, R = np.linalg.qr(X, mode='reduced')
+	diag = np.abs(np.diag(R))
+	if diag.min() <= 1e-10 * diag.max():
+		raise ValueError("Regressors are perfectly collinear; drop redundant columns")
+	R_inv = np.linalg.inv(R)
+	return R_inv @ (Q.T @ y), R_inv @ R_inv.T
+
+
+# Function to compute the covariance matrix from X'X^-1 and residuals;
+# df_resid defaults to n - k and can be lowered for absorbed fixed effects.
+# With a shift, X'X^-1 and the result refer to the columns X - shift.
+def sandwich_cov(X, resid, XtX_inv, cov_type='HC1', clusters=None, df_resid=None, shift=None):
+	n, k = X.shape
+	df_resid = df_resid or n - k
+	shift = np.zeros(k) if shift is None else shift
+	if cov_type == 'classical':
+		return XtX_inv * (resid @ resid) / df_resid, None
+
+	if cov_type == 'cluster':
+		if clusters is None:
+			raise ValueError("cov_type='cluster' requires cluster identifiers")
+		codes, uniques = pd.factorize(np.asarray(clusters), use_na_sentinel=False)
+		n_clusters = len(uniques)
+		if n_clusters < 2:
+			raise ValueError("Clustered standard errors need at least two clusters")
+		# Cluster scores: one bincount per regressor instead of a dense n x G map
+		scores = np.empty((n_clusters, k))
+		for j in range(k):
+			scores[:, j] = np.bincount(codes, weights=(X[:, j] - shift[j]) * resid, minlength=n_clusters)
+		meat = scores.T @ scores
+		scale = n_clusters / (n_clusters - 1) * (n - 1) / df_resid
+		return scale * XtX_inv @ meat @ XtX_inv, n_clusters
+
+	if cov_type not in ('HC0', 'HC1', 'HC2', 'HC3'):
+		raise ValueError(f"Unknown cov_type {cov_type!r}; choose one of {COV_TYPES}")
+
+	meat = np.zeros((k, k))
+	for rows in _chunks(n):
+		Xc = X[rows] - shift
+		weight = resid[rows] ** 2
+		if cov_type in ('HC2', 'HC3'):
+			leverage = np.einsum('ij,ij->i', Xc @ XtX_inv, Xc)
+			weight = weight / (1.0 - leverage) ** (1 if cov_type == 'HC2' else 2)
+		meat += (Xc * weight[:, None]).T @ Xc
+	cov = XtX_inv @ meat @ XtX_inv
+	if cov_type == 'HC1':
+		cov *= n / df_resid
+	return cov, None
+
+
+# Function to fit OLS on arrays; X must already contain the constant if wanted
+def ols(y, X, names=None, cov_type='HC1', clusters=None, solver='cholesky', has_constant=True):
+	X = np.asarray(X, dtype=float)
+	y = np.asarray(y, dtype=float).ravel()
+	n, k = X.shape
+	if n <= k:
+		raise ValueError(f"Need more observations ({n}) than regressors ({k})")
+	names = list(names) if names is not None else [f'x{j}' for j in range(k)]
+	if solver not in SOLVERS:
+		raise ValueError(f"Unknown solver {solver!r}; choose one of {SOLVERS}")
+
+	# Shift by the first row when a constant column is present (T maps the
+	# shifted coefficients back: only the intercept changes)
+	constant = np.flatnonzero((X[0] == 1.0) & (X.min(axis=0) == X.max(axis=0)))[:1] if has_constant else []
+	shift, y_shift = np.zeros(k), 0.0
+	if len(constant):
+		shift, y_shift = X[0].copy(), float(y[0])
+		shift[constant] = 0.0
+	T = np.eye(k)
+	T[constant, :] -= shift
+
+	beta_s = None
+	if solver == 'cholesky':
+		XtX, Xty = np.zeros((k, k)), np.zeros(k)
+		for rows in _chunks(n):
+			Xc = X[rows] - shift
+			XtX += Xc.T @ Xc
+			Xty += Xc.T @ (y[rows] - y_shift)
+		try:
+			beta_s, XtX_inv_s = solve_cholesky(XtX, Xty)
+		except np.linalg.LinAlgError:
+			pass
+	if beta_s is None:
+		# QR is stable on the unshifted columns
+		shift, y_shift, T = np.zeros(k), 0.0, np.eye(k)
+		beta_s, XtX_inv_s = _solve_qr(X, y)
+
+	resid = np.empty(n)
+	for rows in _chunks(n):
+		resid[rows] = (y[rows] - y_shift) - (X[rows] - shift) @ beta_s
+	ssr = float(resid @ resid)
+	tss = float(((y - y.mean()) ** 2).sum()) if has_constant else float(y @ y)
+
+	beta = T @ beta_s
+	beta[constant] += y_shift
+	cov_s, n_clusters = sandwich_cov(X, resid, XtX_inv_s, cov_type, clusters, shift=shift)
+	cov = T @ cov_s @ T.T
+	return OLSResult(
+		names=names,
+		params=beta,
+		bse=np.sqrt(np.diag(cov)),
+		cov=cov,
+		nobs=n,
+		df_resid=n - k,
+		rsquared=1.0 - ssr / tss if tss > 0 else np.nan,
+		ssr=ssr,
+		cov_type=cov_type,
+		n_clusters=n_clusters
+	)
+
+
+# Function to build the design matrix from DataFrame columns (listwise
+# deletion of missing values, constant appended last as in the results table)
+def design_matrix(data, outcome, regressors, cluster=None, add_constant=True):
+	# A cluster variable may also be a regressor (or the outcome)
+	columns = list(dict.fromkeys([outcome] + list(regressors) + ([cluster] if cluster else [])))
+	sample = data[columns].dropna()
+	k = len(regressors) + int(add_constant)
+	X = np.empty((len(sample), k), order='F')
+	for j, name in enumerate(regressors):
+		X[:, j] = sample[name].to_numpy(dtype=float)
+	names = list(regressors)
+	if add_constant:
+		X[:, -1] = 1.0
+		names.append('Constant')
+	y = sample[outcome].to_numpy(dtype=float)
+	clusters = sample[cluster].to_numpy() if cluster else None
+	return y, X, names, clusters
+
+
+# Function to fit OLS on DataFrame columns
+def fit_ols(data, outcome, regressors, cov_type='HC1', cluster=None, add_constant=True, solver='cholesky'):
+	y, X, names, clusters = design_matrix(data, outcome, regressors, cluster, add_constant)
+	return ols(y, X, names, cov_type=cov_type, clusters=clusters, solver=solver, has_constant=add_constant)
+
+
+def _inference_df(result):
+	return result.n_clusters - 1 if result.n_clusters else result.df_resid
+
+
+# Function to compute two-sided p-values (t distribution when scipy is
+# available, normal approximation otherwise)
+def p_values(result):
+	t = np.abs(result.params / result.bse)
+	if _stats is not None:
+		return 2 * _stats.t.sf(t, _inference_df(result))
+	return np.array([erfc(v / sqrt(2)) for v in t])
+
+
+def _critical_value(result, alpha):
+	if _stats is not None:
+		return _stats.t.ppf(1 - alpha / 2, _inference_df(result))
+	return {0.1: 1.645, 0.05: 1.96, 0.01: 2.576}.get(alpha, 1.96)
+
+
+# Function to return the coefficient table for one model
+def coefficient_table(result, alpha=0.05):
+	crit = _critical_value(result, alpha)
+	return pd.DataFrame({
+		'Variable': result.names,
+		'Coefficient': result.params,
+		'Std. Error': result.bse,
+		't': result.params / result.bse,
+		'p-value': p_values(result),
+		'CI Low': result.params - crit * result.bse,
+		'CI High': result.params + crit * result.bse
+	})
+
+
+# Function to convert a p-value into significance stars
+def stars(p):
+	if p < 0.01:
+		return '***'
+	if p < 0.05:
+		return '**'
+	if p < 0.1:
+		return '*'
+	return ''
+
+
+# Function to lay out fitted models like the "Sample Economics Results
+# Table": one column per model, 'coef***<br>(se)' cells, then a blank row,
+# Observations, R-squared and any extra rows (e.g. Controls, Fixed Effects)
+def results_table(results, model_names=None, labels=None, extra_rows=None, digits=3, line_break='<br>'):
+	model_names = model_names or [f'Model {i}' for i in range(1, len(results) + 1)]
+	labels = labels or {}
+	variables = []
+	for result in results:
+		for name in result.names:
+			if name not in variables and name != 'Constant':
+				variables.append(name)
+	if any('Constant' in result.names for result in results):
+		variables.append('Constant')
+
+	table = {'Variable': [labels.get(v, v) for v in variables] + ['', 'Observations', 'R-squared']}
+	for model, result in zip(model_names, results):
+		lookup = dict(zip(result.names, zip(result.params, result.bse, p_values(result))))
+		cells = []
+		for v in variables:
+			if v in lookup:
+				coef, se, p = lookup[v]
+				cells.append(f'{coef:.{digits}f}{stars(p)}{line_break}({se:.{digits}f})')
+			else:
+				cells.append('')
+		cells += ['', f'{result.nobs:,}', f'{result.rsquared:.{digits}f}']
+		table[model] = cells
+
+	for row, values in (extra_rows or {}).items():
+		table['Variable'].append(row)
+		for model, value in zip(model_names, values):
+			table[model].append(value)
+	return pd.DataFrame(table)
+
+
+# Function to plot one coefficient across models with confidence intervals,
+# in the style of "Treatment Effect Across Specifications"
+def plot_coefficients(results, variable, labels=None, alpha=0.05, ax=None, title='Treatment Effect Across Specifications'):
+	if ax is None:
+		fig, ax = plt.subplots(figsize=(8, 6))
+	else:
+		fig = ax.figure
+	labels = labels or [f'Model {i}' for i in range(1, len(results) + 1)]
+	for label, result in zip(labels, results):
+		j = result.names.index(variable)
+		crit = _critical_value(result, alpha)
+		coef, se = result.params[j], result.bse[j]
+		ax.scatter(coef, label, s=80, color='steelblue')
+		ax.plot([coef - crit * se, coef + crit * se], [label, label], color='steelblue', alpha=0.8)
+	ax.axvline(x=0, color='red', linestyle='--', alpha=0.5)
+	ax.set_xlabel('Coefficient Estimate')
+	ax.set_title(title)
+	ax.grid(axis='x', linestyle='--', alpha=0.7)
+	fig.tight_layout()
+	return fig
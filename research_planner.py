@@ -0,0 +1,440 @@
+import io
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from workspace import put_frame, get_frame, names, DEFAULT_WORKSPACE
+
+# Project planner behind the "Timeline Planning for Economics Research"
+# chart in "2. Preliminary Research". A plan is a table of tasks, one row
+# each, with the project it belongs to, a duration in weeks and the names
+# of the tasks (in the same project) it depends on, comma separated.
+# Several projects can share a table, so a whole portfolio of papers is
+# scheduled at once.
+#
+# The critical-path method (CPM) runs on arrays: tasks are sorted
+# topologically into levels (Kahn's algorithm, one frontier at a time), and
+# the forward and backward passes handle a whole level at once, one numpy
+# call per predecessor (successor) rank, so thousands of tasks cost a few
+# numpy calls per level. Each project's Gantt chart is rendered to PNG and
+# memoized on its rows, so editing one task only redraws that project.
+#
+# Durations can also be uncertain: a task may carry optimistic and
+# pessimistic estimates around its duration (the most likely value), and
+# forecast() draws whole schedules from beta-PERT distributions. The passes
+# take a (tasks, samples) array, so 100,000 schedules are the same few numpy
+# calls per level, each gathering whole contiguous rows, run in batches that
+# fit a memory budget. Per-task finish quantiles come from histograms
+# accumulated over every batch.
+#
+# Plans are saved in the user's workspace (see workspace.py).
+
+TASK_COLUMNS = ['Project', 'Task', 'Duration (weeks)', 'Depends On', 'Optimistic (weeks)', 'Pessimistic (weeks)']
+
+SCHEDULE_COLUMNS = ['Project', 'Task', 'Duration (weeks)', 'Earliest Start', 'Earliest Finish', 'Latest Start',
+					'Latest Finish', 'Slack', 'Critical']
+
+DEFAULT_PROJECT = 'My Paper'
+
+# Task graph in compressed form: predecessors and successors as CSR arrays,
+# and the topological levels (level 0 holds the tasks without predecessors)
+TaskGraph = namedtuple('TaskGraph', ['tasks', 'pred_ptr', 'pred_idx', 'succ_ptr', 'succ_idx', 'levels', 'project'])
+
+# Monte Carlo forecast: the deterministic schedule extended with criticality
+# indices and finish quantiles per task, the completion quantiles of each
+# project, and the simulated project finish times (samples x projects)
+Forecast = namedtuple('Forecast', ['table', 'completion', 'finish', 'projects', 'samples'])
+
+FORECAST_QUANTILES = (0.1, 0.5, 0.9)
+
+# Weight of the most likely value in the beta-PERT distribution
+PERT_LAMBDA = 4.0
+
+_TOLERANCE = 1e-9
+
+_MEMORY_BUDGET = 256 * 1024 ** 2
+
+# Most task durations (tasks x samples) drawn for an interactive forecast
+INTERACTIVE_DRAWS = 50_000_000
+
+# Most histogram bins per task for the finish quantiles
+_BAND_BINS = 512
+
+
+# Function to turn the stages of a fixed timeline into a chain of tasks,
+# each depending on the one before. Optimistic and pessimistic estimates
+# default to the duration itself (no uncertainty).
+def chain_tasks(stages, durations, project=DEFAULT_PROJECT, optimistic=None, pessimistic=None):
+	stages = list(stages)
+	durations = np.asarray(durations, dtype=float)
+	return pd.DataFrame({
+		'Project': project,
+		'Task': stages,
+		'Duration (weeks)': durations,
+		'Depends On': [''] + stages[:-1],
+		'Optimistic (weeks)': durations if optimistic is None else np.asarray(optimistic, dtype=float),
+		'Pessimistic (weeks)': durations if pessimistic is None else np.asarray(pessimistic, dtype=float),
+	})
+
+
+# Function to split a "Depends On" cell into task names
+def split_dependencies(cell):
+	if cell is None or (isinstance(cell, float) and np.isnan(cell)):
+		return []
+	return [name.strip() for name in str(cell).split(',') if name.strip()]
+
+
+def _csr(sources, targets, n):
+	order = np.argsort(targets, kind='stable')
+	ptr = np.zeros(n + 1, dtype=np.int64)
+	np.cumsum(np.bincount(targets, minlength=n), out=ptr[1:])
+	return ptr, sources[order]
+
+
+# Function to validate a task table and build its graph. Raises ValueError
+# for duplicate or unknown task names, negative durations and cycles.
+def build_graph(tasks):
+	tasks = tasks.dropna(subset=['Task']).copy()
+	tasks['Project'] = tasks['Project'].fillna(DEFAULT_PROJECT).astype(str).str.strip().replace('', DEFAULT_PROJECT)
+	tasks['Task'] = tasks['Task'].astype(str).str.strip()
+	tasks = tasks[tasks['Task'] != ''].reset_index(drop=True)
+	durations = pd.to_numeric(tasks['Duration (weeks)'], errors='coerce')
+	if durations.isna().any() or (durations < 0).any():
+		bad = tasks.loc[durations.isna() | (durations < 0), 'Task'].tolist()
+		raise ValueError(f"Durations must be non-negative numbers: {bad}")
+	tasks['Duration (weeks)'] = durations.astype(float)
+
+	keys = list(zip(tasks['Project'], tasks['Task']))
+	duplicated = tasks.duplicated(['Project', 'Task'])
+	if duplicated.any():
+		raise ValueError(f"Duplicate tasks: {[f'{p}: {t}' for p, t in np.array(keys, dtype=object)[duplicated]]}")
+	position = {key: i for i, key in enumerate(keys)}
+
+	sources, targets, unknown = [], [], []
+	for i, (project, cell) in enumerate(zip(tasks['Project'], tasks.get('Depends On', pd.Series('', index=tasks.index)))):
+		for name in split_dependencies(cell):
+			j = position.get((project, name))
+			if j is None:
+				unknown.append(f"{project}: {name}")
+			else:
+				sources.append(j)
+				targets.append(i)
+	if unknown:
+		raise ValueError(f"Unknown dependencies: {unknown}")
+
+	n = len(tasks)
+	sources, targets = np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64)
+	pred_ptr, pred_idx = _csr(sources, targets, n)
+	succ_ptr, succ_idx = _csr(targets, sources, n)
+
+	# Kahn's algorithm, a whole frontier at a time
+	remaining = np.diff(pred_ptr).copy()
+	frontier = np.flatnonzero(remaining == 0)
+	levels, done = [], 0
+	while len(frontier):
+		levels.append(frontier)
+		done += len(frontier)
+		successors = succ_idx[_segments(succ_ptr, frontier)]
+		np.subtract.at(remaining, successors, 1)
+		frontier = np.unique(successors[remaining[successors] == 0])
+	if done < n:
+		cyclic = tasks.loc[remaining > 0, 'Task'].tolist()
+		raise ValueError(f"Dependencies form a cycle among: {cyclic}")
+
+	project, _ = pd.factorize(tasks['Project'])
+	return TaskGraph(tasks, pred_ptr, pred_idx, succ_ptr, succ_idx, levels, project)
+
+
+def _segments(ptr, nodes):
+	# Positions of the CSR entries of `nodes`, concatenated in node order
+	starts, ends = ptr[nodes], ptr[nodes + 1]
+	lengths = ends - starts
+	if lengths.sum() == 0:
+		return np.zeros(0, dtype=np.int64)
+	offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+	return np.arange(lengths.sum()) + offsets
+
+
+def _reduce_neighbours(ufunc, ptr, idx, nodes, values):
+	# Reduce the rows of `values` at each node's neighbours with `ufunc`;
+	# nodes must all have at least one neighbour. Nodes are sorted by degree
+	# (returned in that order), so the r-th neighbours of the nodes that have
+	# one are a prefix and each step combines whole contiguous rows.
+	degree = ptr[nodes + 1] - ptr[nodes]
+	order = np.argsort(-degree, kind='stable')
+	nodes, degree = nodes[order], degree[order]
+	first = ptr[nodes]
+	reduced = values[idx[first]]
+	for r in range(1, int(degree[0])):
+		count = np.count_nonzero(degree > r)
+		ufunc(reduced[:count], values[idx[first[:count] + r]], out=reduced[:count])
+	return nodes, reduced
+
+
+# Function to run the forward and backward passes for durations of shape
+# (n,) or (n, samples). Returns earliest start, latest finish and each
+# project's finish (projects first, then samples).
+def passes(graph, durations):
+	durations = np.asarray(durations, dtype=float)
+	start = np.zeros_like(durations)
+	finish = durations.copy()
+	for level in graph.levels[1:]:
+		level, earliest = _reduce_neighbours(np.maximum, graph.pred_ptr, graph.pred_idx, level, finish)
+		start[level] = earliest
+		finish[level] = start[level] + durations[level]
+
+	n_projects = int(graph.project.max()) + 1 if len(graph.project) else 0
+	project_finish = np.full((n_projects,) + durations.shape[1:], 0.0)
+	for p in range(n_projects):
+		project_finish[p] = finish[graph.project == p].max(axis=0)
+
+	# The finish array is reused for the latest starts
+	latest_finish = project_finish[graph.project]
+	latest_start = np.subtract(latest_finish, durations, out=finish)
+	has_successors = np.diff(graph.succ_ptr) > 0
+	for level in reversed(graph.levels):
+		nodes = level[has_successors[level]]
+		if len(nodes):
+			nodes, latest = _reduce_neighbours(np.minimum, graph.succ_ptr, graph.succ_idx, nodes, latest_start)
+			latest_finish[nodes] = latest
+			latest_start[nodes] = latest_finish[nodes] - durations[nodes]
+	return start, latest_finish, project_finish
+
+
+# Function to compute the CPM schedule of a task table: earliest and latest
+# start and finish of every task, its slack and whether it is critical
+def schedule(tasks):
+	graph = build_graph(tasks)
+	durations = graph.tasks['Duration (weeks)'].to_numpy()
+	start, latest_finish, _ = passes(graph, durations)
+	slack = latest_finish - durations - start
+	table = graph.tasks[['Project', 'Task', 'Duration (weeks)']].copy()
+	table['Earliest Start'] = start
+	table['Earliest Finish'] = start + durations
+	table['Latest Start'] = latest_finish - durations
+	table['Latest Finish'] = latest_finish
+	table['Slack'] = np.where(np.abs(slack) < _TOLERANCE, 0.0, slack)
+	table['Critical'] = table['Slack'] == 0
+	return table
+
+
+# Function to list the critical path of each project, in schedule order
+def critical_path(table):
+	critical = table[table['Critical']].sort_values(['Project', 'Earliest Start', 'Earliest Finish'])
+	return {project: rows['Task'].tolist() for project, rows in critical.groupby('Project', sort=False)}
+
+
+# Function to draw a Gantt chart of one project's schedule rows (tuples of
+# task, earliest start, duration, slack, critical): critical tasks in red,
+# slack as a light extension. Bands (tuples of low, median and high finish,
+# in row order) are drawn as a range over each bar.
+def plot_gantt(rows, title='Project Timeline', bands=None):
+	tasks, starts, durations, slacks, critical = (list(column) for column in zip(*rows)) if rows else ([],) * 5
+	fig, ax = plt.subplots(figsize=(10, max(3, 0.35 * len(tasks) + 1.5)))
+	positions = np.arange(len(tasks))
+	colors = ['indianred' if c else 'skyblue' for c in critical]
+	ax.barh(positions, durations, left=starts, color=colors)
+	ax.barh(positions, slacks, left=np.add(starts, durations), color='lightgray', alpha=0.6)
+	if bands:
+		low, median, high = (np.array(column) for column in zip(*bands))
+		ax.hlines(positions, low, high, color='black', linewidth=1.5, label='Finish, 10th-90th percentile')
+		ax.plot(median, positions, 'k|', markersize=10, label='Median finish')
+		ax.legend(loc='upper right')
+	ax.set_yticks(positions)
+	ax.set_yticklabels(tasks)
+	ax.invert_yaxis()
+	ax.set_xlabel('Weeks')
+	ax.set_title(title)
+	ax.grid(axis='x', linestyle='--', alpha=0.7)
+	fig.tight_layout()
+	return fig
+
+
+# Function to render a Gantt chart to PNG bytes, memoized on the rows and
+# bands (tuples of tuples), so unchanged projects are not redrawn
+@lru_cache(maxsize=256)
+def render_gantt(rows, title='Project Timeline', bands=None):
+	fig = plot_gantt(rows, title, bands)
+	buffer = io.BytesIO()
+	fig.savefig(buffer, format='png', dpi=100)
+	plt.close(fig)
+	return buffer.getvalue()
+
+
+# Function to return the hashable Gantt rows of one project
+def gantt_rows(table, project):
+	rows = table[table['Project'] == project].sort_values(['Earliest Start', 'Earliest Finish'], kind='stable')
+	return tuple(zip(rows['Task'], rows['Earliest Start'].round(6), rows['Duration (weeks)'],
+					 rows['Slack'].round(6), rows['Critical']))
+
+
+# Function to return the finish bands of one project of a forecast table,
+# in the same order as gantt_rows
+def gantt_bands(table, project):
+	rows = table[table['Project'] == project].sort_values(['Earliest Start', 'Earliest Finish'], kind='stable')
+	columns = [f'Finish P{round(q * 100)}' for q in FORECAST_QUANTILES]
+	return tuple(tuple(row) for row in rows[columns].round(6).itertuples(index=False))
+
+
+# Function to read the optimistic, likely and pessimistic durations of a
+# graph's tasks; missing estimates fall back to the likely duration.
+# Raises ValueError unless optimistic <= likely <= pessimistic.
+def pert_estimates(graph):
+	likely = graph.tasks['Duration (weeks)'].to_numpy(dtype=float)
+	estimates = []
+	for column in ['Optimistic (weeks)', 'Pessimistic (weeks)']:
+		values = pd.to_numeric(graph.tasks.get(column, pd.Series(np.nan, index=graph.tasks.index)), errors='coerce')
+		estimates.append(np.where(values.isna(), likely, values.to_numpy(dtype=float)))
+	optimistic, pessimistic = estimates
+	bad = (optimistic > likely + _TOLERANCE) | (likely > pessimistic + _TOLERANCE) | (optimistic < 0)
+	if bad.any():
+		raise ValueError(f"Estimates must satisfy 0 <= optimistic <= duration <= pessimistic: "
+						 f"{graph.tasks.loc[bad, 'Task'].tolist()}")
+	return optimistic, likely, pessimistic
+
+
+# Function to draw durations (tasks x samples) from beta-PERT distributions;
+# tasks with optimistic == pessimistic are fixed
+def sample_durations(rng, optimistic, likely, pessimistic, samples, weight=PERT_LAMBDA):
+	spread = pessimistic - optimistic
+	uncertain = spread > _TOLERANCE
+	durations = np.broadcast_to(likely[:, None], (len(likely), samples)).copy()
+	if uncertain.any():
+		a, m, b, width = (values[uncertain, None] for values in (optimistic, likely, pessimistic, spread))
+		alpha = 1 + weight * (m - a) / width
+		beta = 1 + weight * (b - m) / width
+		durations[uncertain] = a + width * rng.beta(alpha, beta, size=(len(a), samples))
+	return durations
+
+
+def _histogram_quantiles(counts, low, high, quantiles):
+	# Quantiles per row of binned counts over [low, high], interpolating
+	# linearly inside the bin that holds each quantile
+	bins = counts.shape[1]
+	cumulative = counts.cumsum(axis=1)
+	total = cumulative[:, -1:]
+	rows = np.arange(len(counts))
+	values = []
+	for q in quantiles:
+		target = q * total
+		j = (cumulative < target).sum(axis=1).clip(0, bins - 1)
+		before = np.where(j > 0, cumulative[rows, j - 1], 0)
+		inside = (target[:, 0] - before) / np.maximum(counts[rows, j], 1)
+		values.append(low + (high - low) * (j + inside.clip(0, 1)) / bins)
+	return values
+
+
+@lru_cache(maxsize=32)
+def _forecast(records, columns, samples, seed, memory):
+	tasks = pd.DataFrame(list(records), columns=list(columns))
+	graph = build_graph(tasks)
+	optimistic, likely, pessimistic = pert_estimates(graph)
+	n = len(likely)
+	projects = list(pd.unique(graph.tasks['Project']))
+
+	# Earliest finishes are monotone in the durations, so the all-optimistic
+	# and all-pessimistic schedules bound every task's finish; each task's
+	# histogram spans that range
+	low, _, _ = passes(graph, optimistic)
+	low += optimistic
+	high, _, _ = passes(graph, pessimistic)
+	high += pessimistic
+	bins = int(min(_BAND_BINS, max(16, memory // (4 * 8 * max(n, 1)))))
+	scale = np.where(high - low > _TOLERANCE, bins / np.maximum(high - low, _TOLERANCE), 0.0)[:, None]
+	offsets = (np.arange(n) * bins)[:, None]
+	histogram = np.zeros(n * bins, dtype=np.int64)
+
+	# About seven (tasks x batch) arrays are alive inside passes() and the
+	# histogram update, plus two (level x batch) temporaries for the widest
+	# level
+	widest = max([len(level) for level in graph.levels] + [0])
+	batch = int(min(samples, max(1, memory // (8 * (7 * n + 2 * widest) + 1))))
+	sizes = [min(batch, samples - start) for start in range(0, samples, batch)]
+	critical_counts = np.zeros(n)
+	finish = np.empty((samples, len(projects)), dtype=np.float32)
+	position = 0
+	for size, child in zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))):
+		durations = sample_durations(np.random.default_rng(child), optimistic, likely, pessimistic, size)
+		start, latest_finish, project_finish = passes(graph, durations)
+		critical_counts += (np.abs(latest_finish - durations - start) < _TOLERANCE).sum(axis=1)
+		finish[position:position + size] = project_finish.T
+		position += size
+		start += durations
+		cells = ((start - low[:, None]) * scale).astype(np.int64).clip(0, bins - 1) + offsets
+		histogram += np.bincount(cells.ravel(), minlength=n * bins)
+	band_samples = _histogram_quantiles(histogram.reshape(n, bins), low, high, FORECAST_QUANTILES)
+
+	table = schedule(tasks)
+	table['Optimistic (weeks)'] = optimistic
+	table['Pessimistic (weeks)'] = pessimistic
+	table['Expected Duration'] = (optimistic + PERT_LAMBDA * likely + pessimistic) / (PERT_LAMBDA + 2)
+	table['Criticality Index'] = critical_counts / samples
+	for q, values in zip(FORECAST_QUANTILES, band_samples):
+		table[f'Finish P{round(q * 100)}'] = values
+
+	planned = table.groupby('Project', sort=False)['Earliest Finish'].max().reindex(projects)
+	quantiles = np.quantile(finish, FORECAST_QUANTILES, axis=0)
+	completion = pd.DataFrame({
+		'Project': projects,
+		'Planned Finish': planned.to_numpy(),
+		'Mean Finish': finish.mean(axis=0),
+		**{f'P{round(q * 100)} Finish': values for q, values in zip(FORECAST_QUANTILES, quantiles)},
+		'P(On Plan)': (finish <= planned.to_numpy()[None, :] + _TOLERANCE).mean(axis=0),
+	})
+	return Forecast(table, completion, finish, projects, samples)
+
+
+# Function to forecast a task table by Monte Carlo: durations are drawn from
+# beta-PERT distributions, the CPM passes run on all samples at once (in
+# batches under `memory` bytes), and the result gives each task's
+# criticality index (share of samples in which it is on the critical path)
+# and finish quantiles, and each project's completion quantiles. Results are
+# memoized on the table, so reruns with the same inputs are free; do not
+# modify the returned frames.
+def forecast(tasks, samples=100_000, seed=0, memory=_MEMORY_BUDGET):
+	if samples < 1:
+		raise ValueError("Draw at least one sample")
+	tasks = tasks.astype(object).where(tasks.notna(), None)
+	records = tuple(tuple(row) for row in tasks.itertuples(index=False))
+	return _forecast(records, tuple(tasks.columns), int(samples), seed, int(memory))
+
+
+# Function to plot the distribution of each project's finish time
+def plot_completion(result, ax=None):
+	if ax is None:
+		fig, ax = plt.subplots(figsize=(10, 5))
+	else:
+		fig = ax.figure
+	for p, project in enumerate(result.projects):
+		ax.hist(result.finish[:, p], bins=60, alpha=0.6, density=True, label=project)
+	for column, style in [('P50 Finish', '--'), ('P90 Finish', ':')]:
+		for value in result.completion[column]:
+			ax.axvline(value, color='black', linestyle=style, linewidth=1)
+	ax.set_xlabel('Weeks to Finish (dashed: P50, dotted: P90)')
+	ax.set_ylabel('Density')
+	ax.set_title('Simulated Completion Times')
+	ax.legend()
+	ax.grid(axis='y', linestyle='--', alpha=0.7)
+	fig.tight_layout()
+	return fig
+
+
+# Function to save a task table under a name in a workspace
+def save_project(name, tasks, workspace=DEFAULT_WORKSPACE):
+	put_frame(workspace, 'plan', name, tasks)
+
+
+# Function to load a saved task table (KeyError when there is none)
+def load_project(name, workspace=DEFAULT_WORKSPACE):
+	tasks = get_frame(workspace, 'plan', name)
+	if tasks is None:
+		raise KeyError(f"No saved plan {name!r}")
+	return tasks
+
+
+# Function to list the names of a workspace's saved plans
+def list_projects(workspace=DEFAULT_WORKSPACE):
+	return names(workspace, 'plan')
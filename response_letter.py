@@ -0,0 +1,227 @@
+import re
+import hashlib
+import zipfile
+from io import BytesIO
+from functools import lru_cache
+from xml.sax.saxutils import escape as xml_escape
+
+# Response-letter generator for the "13. Responding to Reviewers" page.
+# The letter follows the "Response to Reviewers Template" in
+# "14. Resources & Templates": introduction, point-by-point responses per
+# reviewer, "Additional Changes" and closing.
+#
+# The letter is first assembled as a tuple of blocks; each block is rendered
+# through a per-format template compiled once at import. Rendering is
+# memoized per block, so editing one reply only re-renders that reply.
+
+LETTER_FORMATS = ['Markdown', 'LaTeX', 'DOCX']
+
+DEFAULT_RESPONSE = "We thank the reviewer for this comment. [Describe the action taken.]"
+
+
+# Function to give each comment a stable key so replies survive re-parsing
+# and reordering of the referee reports. Identical comments from the same
+# reviewer are told apart by their index among those duplicates.
+def comment_key(reviewer, text, index=0):
+	key = reviewer + ':' + hashlib.sha1(' '.join(text.split()).encode('utf-8')).hexdigest()[:12]
+	return f'{key}:{index}' if index else key
+
+
+# Function to key every comment of a triage table, in row order
+def comment_keys(reviewers, texts):
+	seen = {}
+	keys = []
+	for reviewer, text in zip(reviewers, texts):
+		base = comment_key(reviewer, text)
+		seen[base] = seen.get(base, -1) + 1
+		keys.append(comment_key(reviewer, text, seen[base]))
+	return keys
+
+
+_LATEX_SPECIAL = re.compile(r'([\\&%$#_{}~^])')
+_LATEX_REPLACE = {
+	'\\': r'\textbackslash{}',
+	'~': r'\textasciitilde{}',
+	'^': r'\textasciicircum{}',
+}
+
+
+# Function to escape LaTeX special characters in plain text (shared with
+# the summary-statistics export)
+def latex_escape(text):
+	return _LATEX_SPECIAL.sub(lambda m: _LATEX_REPLACE.get(m.group(1), '\\' + m.group(1)), text)
+
+
+def _md_escape(text):
+	return text.replace('*', r'\*').replace('_', r'\_')
+
+
+def _docx_run(text, bold=False, italic=False):
+	props = ('<w:b/>' if bold else '') + ('<w:i/>' if italic else '')
+	props = f'<w:rPr>{props}</w:rPr>' if props else ''
+	return f'<w:r>{props}<w:t xml:space="preserve">{xml_escape(text)}</w:t></w:r>'
+
+
+def _docx_paragraph(*runs, style=None):
+	ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+	return f'<w:p>{ppr}{"".join(runs)}</w:p>'
+
+
+# Compiled templates: one renderer per (format, block kind)
+_TEMPLATES = {
+	'Markdown': {
+		'title': lambda text: f'# {_md_escape(text)}\n',
+		'heading': lambda text: f'## {_md_escape(text)}\n',
+		'meta': lambda label, value: f'**{label}:** {_md_escape(value)}  \n',
+		'para': lambda text: f'{_md_escape(text)}\n',
+		'comment': lambda label, text: f'**{label}:** "{_md_escape(text)}"\n',
+		'response': lambda text: f'*Response:* {_md_escape(text)}\n',
+		'item': lambda number, text: f'{number}. {_md_escape(text)}\n',
+	},
+	'LaTeX': {
+		'title': lambda text: f'\\section*{{{latex_escape(text)}}}\n',
+		'heading': lambda text: f'\\subsection*{{{latex_escape(text)}}}\n',
+		'meta': lambda label, value: f'\\noindent\\textbf{{{label}:}} {latex_escape(value)}\\\\\n',
+		'para': lambda text: f'{latex_escape(text)}\n',
+		'comment': lambda label, text: f'\\noindent\\textbf{{{latex_escape(label)}:}} ``{latex_escape(text)}\'\'\n',
+		'response': lambda text: f'\\noindent\\textit{{Response:}} {latex_escape(text)}\n',
+		'item': lambda number, text: f'\\noindent {number}. {latex_escape(text)}\n',
+	},
+	'DOCX': {
+		'title': lambda text: _docx_paragraph(_docx_run(text, bold=True), style='Title'),
+		'heading': lambda text: _docx_paragraph(_docx_run(text, bold=True), style='Heading1'),
+		'meta': lambda label, value: _docx_paragraph(_docx_run(label + ': ', bold=True), _docx_run(value)),
+		'para': lambda text: _docx_paragraph(_docx_run(text)),
+		'comment': lambda label, text: _docx_paragraph(_docx_run(label + ': ', bold=True), _docx_run(f'"{text}"')),
+		'response': lambda text: _docx_paragraph(_docx_run('Response: ', italic=True), _docx_run(text)),
+		'item': lambda number, text: _docx_paragraph(_docx_run(f'{number}. {text}')),
+	},
+}
+
+_LATEX_PREAMBLE = '\\documentclass[11pt]{article}\n\\usepackage[margin=1in]{geometry}\n\\begin{document}\n\n'
+_LATEX_END = '\n\\end{document}\n'
+
+_DOCX_CONTENT_TYPES = (
+	'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+	'<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+	'<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+	'<Default Extension="xml" ContentType="application/xml"/>'
+	'<Override PartName="/word/document.xml" '
+	'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+	'<Override PartName="/word/styles.xml" '
+	'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+	'</Types>'
+)
+_DOCX_RELS = (
+	'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+	'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+	'<Relationship Id="rId1" '
+	'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+	'Target="word/document.xml"/>'
+	'</Relationships>'
+)
+_DOCX_DOCUMENT_RELS = (
+	'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+	'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+	'<Relationship Id="rId1" '
+	'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+	'Target="styles.xml"/>'
+	'</Relationships>'
+)
+# The Title and Heading1 styles used by the title and heading blocks
+_DOCX_STYLES = (
+	'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+	'<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+	'<w:docDefaults><w:rPrDefault><w:rPr><w:sz w:val="22"/></w:rPr></w:rPrDefault>'
+	'<w:pPrDefault><w:pPr><w:spacing w:after="160"/></w:pPr></w:pPrDefault></w:docDefaults>'
+	'<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>'
+	'<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/>'
+	'<w:next w:val="Normal"/><w:pPr><w:spacing w:after="240"/><w:jc w:val="center"/></w:pPr>'
+	'<w:rPr><w:b/><w:sz w:val="36"/></w:rPr></w:style>'
+	'<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>'
+	'<w:next w:val="Normal"/><w:pPr><w:keepNext/><w:spacing w:before="240" w:after="120"/><w:outlineLvl w:val="0"/>'
+	'</w:pPr><w:rPr><w:b/><w:sz w:val="28"/></w:rPr></w:style>'
+	'</w:styles>'
+)
+_DOCX_DOCUMENT = (
+	'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+	'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+	'<w:body>{body}<w:sectPr/></w:body></w:document>'
+)
+
+
+@lru_cache(maxsize=8192)
+def _render_block(fmt, block):
+	return _TEMPLATES[fmt][block[0]](*block[1:])
+
+
+# Function to assemble the letter as a tuple of blocks. `replies` maps
+# comment_keys() to a dict with 'Response' and optional 'Location'.
+def build_letter_blocks(triaged, replies, title='[Title]', manuscript_number='[Number]',
+						editor='[Editor Name]', journal='[Journal Name]', authors='[Authors]',
+						editorial_focus='', additional_changes=()):
+	blocks = [
+		('title', 'Response to Reviewers'),
+		('meta', 'Manuscript', title),
+		('meta', 'Manuscript Number', manuscript_number),
+		('para', f'Dear {editor},'),
+		('para', 'We thank you for the opportunity to revise our manuscript. We appreciate the constructive '
+				 'feedback from you and the reviewers, which has helped us significantly improve the paper. '
+				 'We have addressed all comments and suggestions as detailed below.'),
+	]
+	if editorial_focus:
+		blocks.append(('para', f'In response to your editorial guidance, we have particularly focused on {editorial_focus}.'))
+	blocks.append(('para', "Below, we provide point-by-point responses to each reviewer's comments. The changes in "
+						   'the manuscript are highlighted in blue text for easy identification.'))
+
+	# Editor first, then reviewers in numeric order
+	reviewers = sorted(triaged['Reviewer'].unique(),
+					   key=lambda r: (r != 'Editor', int(r.split()[-1]) if r.split()[-1].isdigit() else 0))
+	triaged = triaged.assign(Key=comment_keys(triaged['Reviewer'], triaged['Text']))
+	for reviewer in reviewers:
+		heading = 'Editor' if reviewer == 'Editor' else f'Reviewer #{reviewer.split()[-1]}'
+		blocks.append(('heading', heading + ':'))
+		rows = triaged[triaged['Reviewer'] == reviewer]
+		for number, text, key in zip(rows['Comment'], rows['Text'], rows['Key']):
+			reply = replies.get(key, {})
+			response = (reply.get('Response') or DEFAULT_RESPONSE).strip()
+			location = (reply.get('Location') or '').strip()
+			if location:
+				response += f' This change appears on {location} of the revised manuscript.'
+			blocks.append(('comment', f'Comment {number}', text))
+			blocks.append(('response', response))
+
+	additional_changes = [c.strip() for c in additional_changes if c and c.strip()]
+	if additional_changes:
+		blocks.append(('heading', 'Additional Changes:'))
+		blocks.append(('para', "Beyond the reviewers' suggestions, we have made the following improvements to the manuscript:"))
+		for i, change in enumerate(additional_changes, start=1):
+			blocks.append(('item', i, change))
+
+	blocks += [
+		('para', 'We believe these revisions have substantially strengthened the paper, and we hope that the '
+				 f'manuscript is now suitable for publication in {journal}. We remain open to any additional '
+				 'suggestions for improvement.'),
+		('para', 'Sincerely,'),
+		('para', authors),
+	]
+	return tuple(blocks)
+
+
+# Function to render letter blocks as Markdown or LaTeX text, or DOCX bytes
+def render_letter(blocks, fmt='Markdown'):
+	if fmt not in _TEMPLATES:
+		raise ValueError(f"Unknown letter format {fmt!r}; choose one of {LETTER_FORMATS}")
+	parts = [_render_block(fmt, block) for block in blocks]
+	if fmt == 'Markdown':
+		return '\n'.join(parts)
+	if fmt == 'LaTeX':
+		return _LATEX_PREAMBLE + '\n'.join(parts) + _LATEX_END
+	buffer = BytesIO()
+	with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as docx:
+		docx.writestr('[Content_Types].xml', _DOCX_CONTENT_TYPES)
+		docx.writestr('_rels/.rels', _DOCX_RELS)
+		docx.writestr('word/_rels/document.xml.rels', _DOCX_DOCUMENT_RELS)
+		docx.writestr('word/styles.xml', _DOCX_STYLES)
+		docx.writestr('word/document.xml', _DOCX_DOCUMENT.format(body=''.join(parts)))
+	return buffer.getvalue()
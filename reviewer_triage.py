@@ -0,0 +1,176 @@
+import re
+from functools import lru_cache
+
+import pandas as pd
+import matplotlib.pyplot as plt
+
+# Reviewer-comment triage for the "13. Responding to Reviewers" page.
+# Referee reports are split into individual comments and placed on the
+# Critical/Effort matrix of the Comment Classification Framework.
+
+QUADRANTS = [
+	'Critical / High Effort',
+	'Critical / Low Effort',
+	'Non-Critical / High Effort',
+	'Non-Critical / Low Effort'
+]
+
+TRIAGE_COLUMNS = ['Reviewer', 'Comment', 'Section', 'Text', 'Importance', 'Effort', 'Quadrant']
+
+_REVIEWER_HEADER = re.compile(
+	r'^\s*(?:(?:reviewer|referee)\s*#?\s*(\d+)|(editor)(?:\'s)?(?:\s+comments?)?)\s*[:.\-]?\s*$',
+	re.IGNORECASE | re.MULTILINE
+)
+_SECTION_HEADER = re.compile(r'^\s*(major|minor|other|additional|general|specific)\s+(?:comments?|issues?|points?|concerns?)\s*:?\s*$', re.IGNORECASE)
+_ITEM_START = re.compile(r'^\s*(?:comment\s*(\d+)\s*[:.]|(\d+)\s*[.)]|\((\d+)\)|[-•*]\s+)', re.IGNORECASE)
+
+# Keyword rules as (compiled regex, weight) on the lower-cased comment
+_IMPORTANCE_RULES = [
+	(re.compile(r'\b(?:identification|identify|endogene\w*|causal\w*|exogene\w*|selection bias|omitted variable|reverse causality|confound\w*)\b'), 3.0),
+	(re.compile(r'\b(?:main (?:result|finding|contribution)|contribution|novel\w*|core|central|fundamental|crucial|serious|major)\b'), 2.0),
+	(re.compile(r'\b(?:invalid|biased|wrong|incorrect|flaw\w*|not convinc\w*|unconvinc\w*|concern\w*|doubt\w*|problem\w*)\b'), 1.5),
+	(re.compile(r'\b(?:standard errors?|clustering|inference|mechanism|external validity|theory|model)\b'), 1.0),
+	(re.compile(r'\b(?:typo\w*|grammar|wording|font|formatting|minor|footnote|spelling|label\w*|caption)\b'), -2.5),
+	(re.compile(r'\b(?:perhaps|might consider|could consider|optional|small point|nitpick)\b'), -1.0),
+]
+_EFFORT_RULES = [
+	(re.compile(r'\b(?:new data|collect\w*|survey|re-?estimat\w*|instrument\w*|structural|simulation\w*|monte carlo|field experiment)\b'), 3.0),
+	(re.compile(r'\b(?:additional (?:analys[ie]s|regressions?|specifications?|tests?)|robustness|heterogeneity|placebo|alternative (?:measures?|specifications?|samples?)|event study|extend\w*|model)\b'), 2.0),
+	(re.compile(r'\b(?:rewrit\w*|restructur\w*|reframe\w*|reorganiz\w*|derive|proof|theor\w*)\b'), 1.5),
+	(re.compile(r'\b(?:identification|endogene\w*|selection bias|omitted variable|reverse causality)\b'), 1.0),
+	(re.compile(r'\b(?:clarif\w*|explain|typo\w*|cite|citation|references?|wording|define|discuss\w*|footnote|mention|label\w*|caption)\b'), -1.5),
+]
+_SECTION_IMPORTANCE = {'major': 2.0, 'minor': -2.0}
+
+
+def _score(rules, text, base=5.0):
+	score = base
+	for regex, weight in rules:
+		if regex.search(text):
+			score += weight
+	return max(0.0, min(10.0, score))
+
+
+# Function to classify a single comment; cached on (text, section) so
+# unchanged comments are never reclassified across reruns
+@lru_cache(maxsize=16384)
+def classify_comment(text, section=''):
+	lowered = text.lower()
+	importance = _score(_IMPORTANCE_RULES, lowered) + _SECTION_IMPORTANCE.get(section, 0.0)
+	importance = max(0.0, min(10.0, importance))
+	effort = _score(_EFFORT_RULES, lowered)
+	# Comments without any signal stay at the neutral midpoint and count as
+	# non-critical, low-effort items
+	quadrant = ('Critical' if importance > 5 else 'Non-Critical') + ' / ' + ('High Effort' if effort > 5 else 'Low Effort')
+	return importance, effort, quadrant
+
+
+# Function to split one reviewer's report into (section, text) comments.
+# In numbered reports, prose before the first item (e.g. an opening
+# summary) is kept as general comments, one per paragraph.
+@lru_cache(maxsize=256)
+def segment_report(text):
+	comments = []
+	section = ''
+	current = []
+	current_section = ''
+	numbered = any(_ITEM_START.match(line) for line in text.splitlines())
+	started = False
+
+	def flush():
+		body = ' '.join(' '.join(current).split())
+		if body:
+			comments.append((current_section, body))
+		current.clear()
+
+	for line in text.splitlines():
+		header = _SECTION_HEADER.match(line)
+		if header:
+			flush()
+			section = header.group(1).lower()
+			continue
+		if numbered and (started or _ITEM_START.match(line)):
+			if _ITEM_START.match(line):
+				flush()
+				started = True
+				current_section = section
+				current.append(_ITEM_START.sub('', line, count=1))
+			elif current:
+				current.append(line)
+		else:
+			# Plain prose: one comment per paragraph
+			if line.strip():
+				if not current:
+					current_section = section or ('general' if numbered else '')
+				current.append(line)
+			else:
+				flush()
+	flush()
+	return tuple(comments)
+
+
+# Function to split a pasted block into per-reviewer reports
+def split_reviewers(text):
+	matches = list(_REVIEWER_HEADER.finditer(text))
+	if not matches:
+		return [('Reviewer 1', text)]
+	reports = []
+	preamble = text[:matches[0].start()].strip()
+	if preamble:
+		reports.append(('Editor', preamble))
+	for i, match in enumerate(matches):
+		end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+		name = f'Reviewer {match.group(1)}' if match.group(1) else 'Editor'
+		reports.append((name, text[match.end():end]))
+	return reports
+
+
+# Function to triage one or more pasted referee reports into a DataFrame
+def triage_reports(text):
+	rows = []
+	for reviewer, report in split_reviewers(text):
+		for number, (section, body) in enumerate(segment_report(report.strip()), start=1):
+			importance, effort, quadrant = classify_comment(body, section)
+			rows.append((reviewer, number, section.title(), body, importance, effort, quadrant))
+	return pd.DataFrame(rows, columns=TRIAGE_COLUMNS)
+
+
+# Function to plot triaged comments on the 2x2 Critical/Effort matrix
+def plot_triage_matrix(triaged, ax=None, max_labels=60):
+	if ax is None:
+		fig, ax = plt.subplots(figsize=(8, 8))
+	else:
+		fig = ax.figure
+
+	ax.plot([0, 10, 10, 0, 0], [0, 0, 10, 10, 0], 'k-', linewidth=2)
+	ax.plot([5, 5], [0, 10], 'k-', linewidth=1.5)
+	ax.plot([0, 10], [5, 5], 'k-', linewidth=1.5)
+
+	ax.text(2.5, 9.5, 'Critical\nHigh Effort', ha='center', va='top', fontsize=11, alpha=0.6)
+	ax.text(7.5, 9.5, 'Critical\nLow Effort', ha='center', va='top', fontsize=11, alpha=0.6)
+	ax.text(2.5, 0.5, 'Non-Critical\nHigh Effort', ha='center', va='bottom', fontsize=11, alpha=0.6)
+	ax.text(7.5, 0.5, 'Non-Critical\nLow Effort', ha='center', va='bottom', fontsize=11, alpha=0.6)
+
+	ax.text(5, -0.5, 'Effort Required', ha='center', va='center', fontsize=14)
+	ax.text(-0.5, 5, 'Importance', ha='center', va='center', rotation=90, fontsize=14)
+
+	if len(triaged):
+		# High effort sits on the left of the framework, so flip the effort axis;
+		# a small deterministic jitter keeps tied comments visible
+		jitter = (triaged['Comment'].to_numpy() % 7 - 3) * 0.08
+		x = (10 - triaged['Effort'].to_numpy()).clip(0.3, 9.7) + jitter
+		y = triaged['Importance'].to_numpy().clip(0.3, 9.7) - jitter
+		reviewers = triaged['Reviewer'].astype('category')
+		ax.scatter(x, y, c=reviewers.cat.codes, cmap='tab10', vmin=0, vmax=9, s=40, alpha=0.8)
+		if len(triaged) <= max_labels:
+			for xi, yi, reviewer, number in zip(x, y, triaged['Reviewer'], triaged['Comment']):
+				tag = 'E' if reviewer == 'Editor' else 'R' + reviewer.split()[-1]
+				ax.annotate(f'{tag}.{number}', (xi, yi), textcoords='offset points', xytext=(4, 3), fontsize=8)
+
+	ax.set_xlim(-1, 10.5)
+	ax.set_ylim(-1, 10.5)
+	ax.set_xticks([])
+	ax.set_yticks([])
+	ax.set_title('Comment Classification Framework')
+	fig.tight_layout()
+	return fig
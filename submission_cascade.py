@@ -0,0 +1,222 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+# Monte Carlo model of a paper moving down a ladder of journals, combining
+# the figures of "12. Submission Process": the journal acceptance rates, the
+# decision frequencies in `decision_types` (desk reject 40-60%, R&R 10-15%),
+# the stage lengths of the `timelines` chart (first decision at 4 months,
+# revision by 7, second decision by 11, acceptance at 12) and the R&R
+# success rates.
+#
+# At each journal a submission is desk rejected, rejected after review, or
+# gets an R&R that is then accepted or rejected. The R&R probability is set
+# so that P(R&R) * P(success | R&R) equals the journal's acceptance rate.
+# A rejected paper goes to the next journal after a short reformatting gap.
+# Paper quality enters as a shift on the log-odds of an R&R, drawn once per
+# path, so a strong paper is strong everywhere.
+#
+# Paths are simulated in batches of numpy arrays, one rung of the ladder at
+# a time. Each rung costs one uniform draw (the outcome, a four-way split)
+# and one gamma draw per active path: stage lengths are gamma distributed
+# with a common scale, so the length of a whole branch (review + revision +
+# second decision, ...) is a single gamma variate.
+
+JOURNAL_TIERS = ['Top-5', 'General Excellence', 'Top Field', 'Solid Field', 'Regional/Specialized']
+
+# Defaults by tier, used when a journal has no figure of its own
+_TIER_DEFAULTS = {
+	'Top-5': (0.06, 0.55, 0.55),
+	'General Excellence': (0.10, 0.45, 0.60),
+	'Top Field': (0.12, 0.40, 0.65),
+	'Solid Field': (0.18, 0.35, 0.70),
+	'Regional/Specialized': (0.30, 0.30, 0.75),
+}
+
+# Journals of the `journal_tiers` table (plus JHR from the R&R chart);
+# acceptance and R&R success rates follow the "Journal Acceptance Rates" and
+# "Revise and Resubmit Success Rates" charts where those give a figure
+_JOURNALS = [
+	('American Economic Review', 'Top-5', 0.07, 0.60),
+	('Quarterly Journal of Economics', 'Top-5', 0.04, 0.55),
+	('Journal of Political Economy', 'Top-5', 0.05, 0.58),
+	('Econometrica', 'Top-5', 0.09, 0.50),
+	('Review of Economic Studies', 'Top-5', 0.06, 0.52),
+	('Journal of Economic Literature', 'General Excellence', 0.12, None),
+	('Journal of Economic Perspectives', 'General Excellence', None, None),
+	('Economic Journal', 'General Excellence', None, None),
+	('Review of Economics and Statistics', 'General Excellence', None, None),
+	('Journal of the European Economic Association', 'General Excellence', None, None),
+	('American Economic Journal: Applied', 'General Excellence', 0.10, 0.65),
+	('Journal of Finance', 'Top Field', None, None),
+	('Journal of Labor Economics', 'Top Field', None, None),
+	('Journal of Human Resources', 'Top Field', None, 0.68),
+	('Journal of Development Economics', 'Top Field', 0.15, 0.70),
+	('Journal of Public Economics', 'Top Field', None, None),
+	('Journal of International Economics', 'Top Field', None, None),
+	('Journal of Urban Economics', 'Solid Field', None, None),
+	('Economic Development and Cultural Change', 'Solid Field', None, None),
+	('Journal of Environmental Economics and Management', 'Solid Field', None, None),
+	('China Economic Review', 'Regional/Specialized', None, None),
+	('Eastern Economic Journal', 'Regional/Specialized', None, None),
+	('Journal of African Economies', 'Regional/Specialized', None, None),
+]
+
+JOURNAL_PROFILES = pd.DataFrame([
+	{
+		'Journal': journal,
+		'Tier': tier,
+		'Acceptance Rate': acceptance if acceptance is not None else _TIER_DEFAULTS[tier][0],
+		'Desk Reject Rate': _TIER_DEFAULTS[tier][1],
+		'R&R Success Rate': success if success is not None else _TIER_DEFAULTS[tier][2],
+	}
+	for journal, tier, acceptance, success in _JOURNALS
+])
+
+# Stage lengths in months, from the `timelines` chart
+Timing = namedtuple('Timing', ['desk', 'review', 'revision', 'second_decision', 'acceptance', 'resubmission'])
+DEFAULT_TIMING = Timing(desk=1.0, review=4.0, revision=3.0, second_decision=4.0, acceptance=1.0, resubmission=1.0)
+
+# Scale of the stage-length gamma distributions (months): variance = mean * scale
+DEFAULT_DISPERSION = 1.0
+
+CascadeResult = namedtuple('CascadeResult', ['ladder', 'tiers', 'months', 'accepted_at', 'submissions'])
+
+NOT_ACCEPTED = 'Not accepted'
+
+_BATCH = 1 << 20
+
+
+def _logit(p):
+	return np.log(p / (1 - p))
+
+
+# Function to return the outcome probabilities of every journal on a ladder
+# as an array of (desk reject, R&R, R&R success) rows
+def ladder_parameters(ladder, profiles=None):
+	profiles = JOURNAL_PROFILES if profiles is None else profiles
+	table = profiles.set_index('Journal')
+	missing = [journal for journal in ladder if journal not in table.index]
+	if missing:
+		raise ValueError(f"No profile for {missing}")
+	rows = table.loc[list(ladder)]
+	desk = rows['Desk Reject Rate'].to_numpy(dtype=float)
+	success = rows['R&R Success Rate'].to_numpy(dtype=float)
+	rr = rows['Acceptance Rate'].to_numpy(dtype=float) / success
+	if np.any(rr > 1 - desk):
+		raise ValueError("Acceptance rate too high for the desk-reject and R&R success rates")
+	return np.column_stack([desk, rr, success]), rows['Tier'].tolist()
+
+
+def _simulate_batch(rng, parameters, timing, dispersion, quality, quality_sd, n):
+	months = np.zeros(n, dtype=np.float32)
+	accepted_at = np.full(n, -1, dtype=np.int16)
+	submissions = np.zeros(n, dtype=np.int16)
+	shift = quality + quality_sd * rng.standard_normal(n, dtype=np.float32) if quality_sd > 0 else quality
+
+	review_reject = timing.review + timing.resubmission
+	rr_reject = timing.review + timing.revision + timing.second_decision + timing.resubmission
+	rr_accept = timing.review + timing.revision + timing.second_decision + timing.acceptance
+	branch_months = np.array([timing.desk + timing.resubmission, review_reject, rr_reject, rr_accept],
+							 dtype=np.float32)
+
+	active = np.arange(n)
+	for rung, (desk, rr, success) in enumerate(parameters):
+		if len(active) == 0:
+			break
+		rr_path = np.float32(rr)
+		if quality_sd > 0 or quality != 0:
+			# R&R odds among reviewed papers move with quality
+			path_shift = shift[active] if quality_sd > 0 else shift
+			rr_path = ((1 - desk) / (1 + np.exp(-(_logit(rr / (1 - desk)) + path_shift)))).astype(np.float32)
+		# One uniform splits into desk reject / reject after review /
+		# R&R rejected / R&R accepted
+		u = rng.random(len(active), dtype=np.float32)
+		branch = (u >= desk).astype(np.int8)
+		branch += u >= 1 - rr_path
+		branch += u >= 1 - rr_path * success
+		mean = branch_months[branch]
+		months[active] += rng.standard_gamma(mean / dispersion, dtype=np.float32) * dispersion
+		submissions[active] += 1
+		accepted = branch == 3
+		accepted_at[active[accepted]] = rung
+		active = active[~accepted]
+	return months, accepted_at, submissions
+
+
+# Function to simulate n_paths papers submitted down the ladder (a list of
+# journal names, first choice first). Quality is the mean shift on the
+# log-odds of an R&R (0 = a typical submission); quality_sd > 0 draws it per
+# path. Months are NaN for papers never accepted.
+def simulate_cascade(ladder, n_paths=1_000_000, quality=0.0, quality_sd=0.0, timing=DEFAULT_TIMING,
+					 dispersion=DEFAULT_DISPERSION, profiles=None, seed=0):
+	if not ladder:
+		raise ValueError("Choose at least one journal")
+	parameters, tiers = ladder_parameters(ladder, profiles)
+	sizes = [min(_BATCH, n_paths - start) for start in range(0, n_paths, _BATCH)]
+	results = [_simulate_batch(np.random.default_rng(child), parameters, timing, dispersion, quality, quality_sd, size)
+			   for size, child in zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes)))]
+	months, accepted_at, submissions = (np.concatenate(parts) for parts in zip(*results))
+	months = np.where(accepted_at >= 0, months, np.nan).astype(np.float32)
+	return CascadeResult(list(ladder), tiers, months, accepted_at, submissions)
+
+
+# Function to tabulate where papers end up: per journal, the share accepted
+# there and the months to acceptance (mean and quartiles)
+def cascade_table(result):
+	n = len(result.accepted_at)
+	counts = np.bincount(result.accepted_at + 1, minlength=len(result.ladder) + 1)
+	rows = []
+	for rung, journal in enumerate(result.ladder):
+		months = result.months[result.accepted_at == rung]
+		rows.append({
+			'Journal': journal,
+			'Tier': result.tiers[rung],
+			'Share Accepted Here': counts[rung + 1] / n,
+			'Mean Months': months.mean() if len(months) else np.nan,
+			'Median Months': np.median(months) if len(months) else np.nan,
+		})
+	rows.append({'Journal': NOT_ACCEPTED, 'Tier': '', 'Share Accepted Here': counts[0] / n,
+				 'Mean Months': np.nan, 'Median Months': np.nan})
+	return pd.DataFrame(rows)
+
+
+# Function to tabulate the distribution of the final tier
+def tier_table(result):
+	tiers = np.array(result.tiers + [NOT_ACCEPTED], dtype=object)[result.accepted_at]
+	shares = pd.Series(tiers).value_counts(normalize=True)
+	order = [tier for tier in JOURNAL_TIERS + [NOT_ACCEPTED] if tier in shares.index]
+	return shares.reindex(order).rename_axis('Final Tier').reset_index(name='Share')
+
+
+# Function to summarize the time to acceptance (months) among accepted papers
+def time_quantiles(result, quantiles=(0.1, 0.25, 0.5, 0.75, 0.9)):
+	months = result.months[~np.isnan(result.months)]
+	if len(months) == 0:
+		return pd.DataFrame({'Quantile': list(quantiles), 'Months': np.nan})
+	return pd.DataFrame({'Quantile': list(quantiles), 'Months': np.quantile(months, quantiles)})
+
+
+# Function to plot the distribution of time to acceptance and the final tier
+def plot_cascade(result):
+	fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+	months = result.months[~np.isnan(result.months)]
+	if len(months):
+		ax1.hist(months, bins=np.arange(0, np.ceil(months.max()) + 2), color='steelblue', alpha=0.8, density=True)
+		ax1.axvline(np.median(months), color='red', linestyle='--', label=f'Median {np.median(months):.0f} months')
+		ax1.legend()
+	ax1.set_xlabel('Months from First Submission to Acceptance')
+	ax1.set_ylabel('Share of Accepted Papers')
+	ax1.set_title('Time to Acceptance')
+	ax1.grid(axis='y', linestyle='--', alpha=0.7)
+
+	tiers = tier_table(result)
+	ax2.barh(tiers['Final Tier'], tiers['Share'] * 100, color='steelblue')
+	ax2.invert_yaxis()
+	ax2.set_xlabel('Share of Papers (%)')
+	ax2.set_title('Where the Paper Ends Up')
+	ax2.grid(axis='x', linestyle='--', alpha=0.7)
+	fig.tight_layout()
+	return fig
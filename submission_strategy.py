@@ -0,0 +1,220 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from submission_cascade import JOURNAL_PROFILES, DEFAULT_TIMING, DEFAULT_DISPERSION, ladder_parameters
+
+# Submission-order optimizer for the "portfolio strategy with backup
+# journals" advice in "12. Submission Process". It uses the same model as
+# submission_cascade.py: at journal j a paper of quality q (a shift on the
+# log-odds of an R&R) is accepted with probability p_j(q), and every branch
+# of the process takes a gamma-distributed number of months with a common
+# scale. Outcomes are valued at the tier weight of the accepting journal,
+# discounted by the time to acceptance: value = E[w * delta ** years].
+#
+# For a fixed quality the value of a ladder j1, j2, ... is
+#   a_1 + b_1 (a_2 + b_2 (a_3 + ...))
+# with a_j = w_j p_j E[discount | accepted] and b_j = E[discount; rejected]
+# (gamma Laplace transforms, so both are exact). The quality prior is a
+# Gauss-Hermite mixture, and the weight c_q(S) = pi_q prod_{j in S} b_jq of
+# each quality node after a set S of rejections does not depend on their
+# order. So the best continuation after S is a function of S alone, and the
+# optimizer is a dynamic program over sets of journals already tried:
+#
+# - subproblems are memoized on the set, with journals that share a profile
+#   collapsed into one class (the state is a count per class);
+# - branches are pruned with an upper bound: knowing q is worth at least as
+#   much as the prior, and for known q the best ladder orders the remaining
+#   journals by a_j / (1 - b_j), so sum_q c_q(S) * (that value) bounds any
+#   continuation.
+#
+# Candidates are explored best-first by the mixture index, so the first
+# branch is usually the optimum and the rest are pruned.
+
+TIER_WEIGHTS = {
+	'Top-5': 1.0,
+	'General Excellence': 0.6,
+	'Top Field': 0.45,
+	'Solid Field': 0.25,
+	'Regional/Specialized': 0.1,
+}
+
+DEFAULT_DISCOUNT = 0.85
+
+Strategy = namedtuple('Strategy', ['ladder', 'value', 'acceptance', 'expected_months', 'timeline', 'states'])
+
+_QUADRATURE_NODES = 15
+
+
+def _discount(months, rate, dispersion):
+	# E[exp(-rate * X)] for X ~ Gamma(months / dispersion, dispersion)
+	return (1.0 + rate * dispersion) ** (-np.asarray(months, dtype=float) / dispersion)
+
+
+def _quality_nodes(quality, quality_sd):
+	if quality_sd <= 0:
+		return np.array([float(quality)]), np.array([1.0])
+	nodes, weights = np.polynomial.hermite_e.hermegauss(_QUADRATURE_NODES)
+	return quality + quality_sd * nodes, weights / weights.sum()
+
+
+def _journal_terms(parameters, weights, nodes, timing, dispersion, rate):
+	# Per journal and quality node: acceptance probability, a, b and the
+	# expected months of a rejection (for the timeline)
+	desk, rr, success = (parameters[:, [i]] for i in range(3))
+	reviewed = rr / (1 - desk)
+	rr_q = (1 - desk) / (1 + np.exp(-(np.log(reviewed / (1 - reviewed)) + nodes[None, :])))
+	review_reject = 1 - desk - rr_q
+	rr_reject = rr_q * (1 - success)
+	accept = rr_q * success
+
+	months = {
+		'desk': timing.desk + timing.resubmission,
+		'review': timing.review + timing.resubmission,
+		'rr_reject': timing.review + timing.revision + timing.second_decision + timing.resubmission,
+		'accept': timing.review + timing.revision + timing.second_decision + timing.acceptance,
+	}
+	L = {name: _discount(value, rate, dispersion) for name, value in months.items()}
+	a = weights[:, None] * accept * L['accept']
+	b = desk * L['desk'] + review_reject * L['review'] + rr_reject * L['rr_reject']
+	reject_months = desk * months['desk'] + review_reject * months['review'] + rr_reject * months['rr_reject']
+	return accept, a, b, reject_months, months['accept']
+
+
+def _known_quality_value(a, b):
+	# Best ladder value per quality node when q is known: all journals in
+	# decreasing order of a / (1 - b), evaluated back to front
+	index = a / np.maximum(1 - b, 1e-300)
+	order = np.argsort(-index, axis=0)
+	a_sorted = np.take_along_axis(a, order, axis=0)
+	b_sorted = np.take_along_axis(b, order, axis=0)
+	value = np.zeros(a.shape[1])
+	for k in range(a.shape[0] - 1, -1, -1):
+		value = a_sorted[k] + b_sorted[k] * value
+	return value
+
+
+# Function to find the ladder (a sequence drawn from `journals`, at most
+# max_submissions long) that maximizes the expected discounted tier weight.
+# The quality prior is normal with mean `quality` and sd `quality_sd` on
+# the log-odds of an R&R; `discount` is the value of an acceptance one year
+# later relative to one today.
+def optimize_ladder(journals=None, quality=0.0, quality_sd=0.5, discount=DEFAULT_DISCOUNT, tier_weights=None,
+					max_submissions=None, timing=DEFAULT_TIMING, dispersion=DEFAULT_DISPERSION, profiles=None):
+	profiles = JOURNAL_PROFILES if profiles is None else profiles
+	journals = list(journals) if journals is not None else profiles['Journal'].tolist()
+	if not journals:
+		raise ValueError("Choose at least one journal")
+	if not 0 < discount <= 1:
+		raise ValueError("The discount factor must be in (0, 1]")
+	tier_weights = {**TIER_WEIGHTS, **(tier_weights or {})}
+	max_submissions = min(max_submissions or len(journals), len(journals))
+
+	parameters, tiers = ladder_parameters(journals, profiles)
+	weights = np.array([tier_weights[tier] for tier in tiers])
+	nodes, prior = _quality_nodes(quality, quality_sd)
+	rate = -np.log(discount) / 12.0
+	accept, a, b, reject_months, accept_months = _journal_terms(parameters, weights, nodes, timing, dispersion, rate)
+
+	# Journals with identical terms are interchangeable: one class each
+	keys = [tuple(np.round(np.concatenate([a[j], b[j]]), 12)) for j in range(len(journals))]
+	classes = list(dict.fromkeys(keys))
+	members = [[j for j in range(len(journals)) if keys[j] == key] for key in classes]
+	class_a = np.array([a[m[0]] for m in members])
+	class_b = np.array([b[m[0]] for m in members])
+	sizes = np.array([len(m) for m in members])
+
+	memo = {}
+
+	def expanded(state):
+		# Terms of every remaining journal (with multiplicity) for the bound
+		remaining = np.repeat(np.arange(len(members)), sizes - np.array(state))
+		return class_a[remaining], class_b[remaining]
+
+	def best(state, weight, depth):
+		# Best value-to-go and first class from a state, given the current
+		# node weights c_q(S); returns (value, next class or None)
+		if depth == max_submissions or sum(state) == len(journals):
+			return 0.0, None
+		if state in memo:
+			return memo[state]
+		available = [k for k in range(len(members)) if state[k] < sizes[k]]
+		immediate = {k: float(weight @ class_a[k]) for k in available}
+		index = {k: float(weight @ class_a[k]) / max(float(weight @ (1 - class_b[k])), 1e-300) for k in available}
+		best_value, best_class = -1.0, None
+		for k in sorted(available, key=lambda k: -index[k]):
+			child = state[:k] + (state[k] + 1,) + state[k + 1:]
+			child_weight = weight * class_b[k]
+			if best_class is not None:
+				rest_a, rest_b = expanded(child)
+				bound = float(child_weight @ _known_quality_value(rest_a, rest_b)) if len(rest_a) else 0.0
+				if immediate[k] + bound <= best_value * (1 + 1e-12):
+					continue
+			value = immediate[k] + best(child, child_weight, depth + 1)[0]
+			if value > best_value:
+				best_value, best_class = value, k
+		memo[state] = (best_value, best_class)
+		return memo[state]
+
+	# Walk the memoized decisions from the empty set
+	state, weight, used, ladder = (0,) * len(members), prior.copy(), [0] * len(members), []
+	value = best(state, weight, 0)[0]
+	for depth in range(max_submissions):
+		_, k = best(state, weight, depth)
+		if k is None:
+			break
+		ladder.append(members[k][used[k]])
+		used[k] += 1
+		weight = weight * class_b[k]
+		state = state[:k] + (state[k] + 1,) + state[k + 1:]
+
+	timeline = ladder_timeline(ladder, journals, tiers, accept, reject_months, accept_months, prior)
+	acceptance = float(timeline['P(Accepted Here)'].sum())
+	expected_months = float((timeline['P(Accepted Here)'] * timeline['Expected Acceptance Month']).sum() / acceptance) \
+		if acceptance > 0 else np.nan
+	return Strategy([journals[j] for j in ladder], value, acceptance, expected_months, timeline, len(memo))
+
+
+# Function to lay out the expected timeline of a ladder (positions into
+# `journals`): the chance of reaching each journal, of being accepted there,
+# and the expected months at submission and, for papers accepted there, at
+# acceptance
+def ladder_timeline(ladder, journals, tiers, accept, reject_months, accept_months, prior):
+	rows = []
+	reach = prior.copy()
+	elapsed = np.zeros_like(prior)
+	for step, j in enumerate(ladder, start=1):
+		p_reach = float(reach.sum())
+		p_accept = float(reach @ accept[j])
+		rows.append({
+			'Step': step,
+			'Journal': journals[j],
+			'Tier': tiers[j],
+			'P(Reach)': p_reach,
+			'P(Accepted Here)': p_accept,
+			'Expected Submission Month': float(reach @ elapsed) / p_reach if p_reach > 0 else np.nan,
+			# Papers accepted here lean towards high quality, so their
+			# submission month is averaged with acceptance weights
+			'Expected Acceptance Month': float((reach * accept[j]) @ elapsed) / p_accept + accept_months
+			if p_accept > 0 else np.nan,
+		})
+		rejected = 1 - accept[j]
+		elapsed = elapsed + reject_months[j] / np.maximum(rejected, 1e-300)
+		reach = reach * rejected
+	return pd.DataFrame(rows)
+
+
+# Function to evaluate the value of a given ladder under the same model
+# (for comparing a hand-picked order with the optimum)
+def ladder_value(ladder, quality=0.0, quality_sd=0.5, discount=DEFAULT_DISCOUNT, tier_weights=None,
+				 timing=DEFAULT_TIMING, dispersion=DEFAULT_DISPERSION, profiles=None):
+	tier_weights = {**TIER_WEIGHTS, **(tier_weights or {})}
+	parameters, tiers = ladder_parameters(ladder, profiles)
+	weights = np.array([tier_weights[tier] for tier in tiers])
+	nodes, prior = _quality_nodes(quality, quality_sd)
+	_, a, b, _, _ = _journal_terms(parameters, weights, nodes, timing, dispersion, -np.log(discount) / 12.0)
+	value = np.zeros(len(prior))
+	for k in range(len(ladder) - 1, -1, -1):
+		value = a[k] + b[k] * value
+	return float(prior @ value)
@@ -0,0 +1,187 @@
+import sys
+import argparse
+from collections import namedtuple
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from out_of_core import iter_chunks, prefetch, file_columns, DEFAULT_CHUNKSIZE
+from response_letter import latex_escape
+
+# Summary statistics in the layout of the "Example Summary Statistics Table"
+# in "7. Methodology" (Mean, Std. Dev., Min, Max, N per variable). Data are
+# read in chunks; each chunk is reduced to count, mean, sum of squared
+# deviations (M2), min and max per column, and chunks are combined with
+# Chan et al.'s pairwise update, so the result is numerically stable, needs
+# one pass over the data and never holds more than a chunk in memory.
+# Accumulators for different files (or cores) merge the same way.
+
+Accumulator = namedtuple('Accumulator', ['columns', 'n', 'mean', 'm2', 'minimum', 'maximum'])
+
+SUMMARY_COLUMNS = ['Variable', 'Mean', 'Std. Dev.', 'Min', 'Max', 'N']
+
+ALL_OBSERVATIONS = 'All'
+
+
+# Function to reduce a block of values (rows x columns) to an accumulator,
+# ignoring missing values column by column
+def block_accumulator(values, columns):
+	values = np.asarray(values, dtype=float)
+	valid = ~np.isnan(values)
+	n = valid.sum(axis=0)
+	safe_n = np.maximum(n, 1)
+	mean = np.where(valid, values, 0.0).sum(axis=0) / safe_n
+	m2 = (np.where(valid, values - mean, 0.0) ** 2).sum(axis=0)
+	minimum = np.where(valid, values, np.inf).min(axis=0, initial=np.inf)
+	maximum = np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf)
+	return Accumulator(list(columns), n.astype(np.int64), mean, m2, minimum, maximum)
+
+
+# Function to combine two accumulators over the same columns (Chan et al.)
+def merge(a, b):
+	if a is None:
+		return b
+	if b is None:
+		return a
+	n = a.n + b.n
+	safe_n = np.maximum(n, 1)
+	delta = b.mean - a.mean
+	return Accumulator(
+		a.columns,
+		n,
+		a.mean + delta * b.n / safe_n,
+		a.m2 + b.m2 + delta ** 2 * a.n * b.n / safe_n,
+		np.minimum(a.minimum, b.minimum),
+		np.maximum(a.maximum, b.maximum)
+	)
+
+
+# Function to merge dictionaries of accumulators (one per panel)
+def merge_panels(a, b):
+	merged = dict(a)
+	for group, accumulator in b.items():
+		merged[group] = merge(merged.get(group), accumulator)
+	return merged
+
+
+def _chunk_panels(chunk, columns, by):
+	values = chunk[columns].apply(pd.to_numeric, errors='coerce')
+	panels = {ALL_OBSERVATIONS: block_accumulator(values.to_numpy(dtype=float), columns)}
+	if by is not None:
+		for group, rows in values.groupby(chunk[by], sort=False):
+			panels[group] = block_accumulator(rows.to_numpy(dtype=float), columns)
+	return panels
+
+
+# Function to accumulate panels over an iterable of DataFrame chunks
+def accumulate(chunks, columns, by=None):
+	panels = {}
+	for chunk in chunks:
+		panels = merge_panels(panels, _chunk_panels(chunk, list(columns), by))
+	return panels
+
+
+def _accumulate_file(task):
+	path, columns, by, chunksize = task
+	needed = list(columns) + ([by] if by and by not in columns else [])
+	with closing(prefetch(iter_chunks(path, needed, chunksize))) as chunks:
+		return accumulate(chunks, columns, by)
+
+
+# Function to summarize a DataFrame or one or more CSV/Parquet files. Files
+# are processed in parallel with n_jobs > 1 and their accumulators merged.
+# Returns a dictionary of panels: 'All' plus one per value of `by`.
+def summarize(source, columns=None, by=None, chunksize=DEFAULT_CHUNKSIZE, n_jobs=1):
+	if isinstance(source, pd.DataFrame):
+		columns = list(columns) if columns is not None else \
+			[c for c in source.select_dtypes('number').columns if c != by]
+		chunks = (source.iloc[start:start + chunksize] for start in range(0, len(source), chunksize))
+		return accumulate(chunks, columns, by)
+
+	paths = [source] if isinstance(source, str) else list(source)
+	if columns is None:
+		columns = [c for c in file_columns(paths[0]) if c != by]
+	tasks = [(path, list(columns), by, chunksize) for path in paths]
+	if n_jobs == 1 or len(tasks) == 1:
+		results = [_accumulate_file(task) for task in tasks]
+	else:
+		with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+			results = list(pool.map(_accumulate_file, tasks))
+	panels = {}
+	for result in results:
+		panels = merge_panels(panels, result)
+	return panels
+
+
+# Function to lay out one accumulator like the example table; variables
+# without any numeric value are dropped
+def summary_table(accumulator, labels=None, digits=2):
+	labels = labels or {}
+	n = accumulator.n
+	with np.errstate(invalid='ignore', divide='ignore'):
+		sd = np.sqrt(accumulator.m2 / (n - 1))
+	table = pd.DataFrame({
+		'Variable': [labels.get(c, c) for c in accumulator.columns],
+		'Mean': accumulator.mean,
+		'Std. Dev.': np.where(n > 1, sd, np.nan),
+		'Min': accumulator.minimum,
+		'Max': accumulator.maximum,
+		'N': n
+	})
+	table = table[n > 0].reset_index(drop=True)
+	return table.round({'Mean': digits, 'Std. Dev.': digits, 'Min': digits, 'Max': digits})
+
+
+# Function to stack the by-group panels into one table with a Panel column
+def panel_table(panels, labels=None, digits=2):
+	frames = []
+	for group, accumulator in panels.items():
+		table = summary_table(accumulator, labels, digits)
+		table.insert(0, 'Panel', str(group))
+		frames.append(table)
+	return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Panel'] + SUMMARY_COLUMNS)
+
+
+# Function to export a summary or panel table to a LaTeX (booktabs) table
+def to_latex(table, caption='Summary Statistics', label='tab:summary', digits=2):
+	lines = [
+		r'\begin{table}[htbp]', r'\centering', f'\\caption{{{latex_escape(caption)}}}', f'\\label{{{label}}}',
+		r'\begin{tabular}{lrrrrr}', r'\toprule',
+		' & '.join(SUMMARY_COLUMNS) + r' \\', r'\midrule'
+	]
+	panels = list(table.groupby('Panel', sort=False)) if 'Panel' in table.columns else [(None, table)]
+	for number, (panel, rows) in enumerate(panels):
+		if panel is not None:
+			if number:
+				lines.append(r'\addlinespace')
+			lines.append(f'\\multicolumn{{6}}{{l}}{{\\textit{{Panel {chr(65 + number % 26)}: {latex_escape(panel)}}}}} \\\\')
+		for variable, *statistics, n in rows[SUMMARY_COLUMNS].itertuples(index=False, name=None):
+			cells = [latex_escape(str(variable))] + [f'{value:,.{digits}f}' for value in statistics] + [f'{n:,}']
+			lines.append(' & '.join(cells) + r' \\')
+	lines += [r'\bottomrule', r'\end{tabular}', r'\end{table}']
+	return '\n'.join(lines)
+
+
+# CLI: python summary_statistics.py data.csv [more.csv ...] [--by region] [--latex]
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Summary statistics for CSV/Parquet files of any size.")
+	parser.add_argument('paths', nargs='+')
+	parser.add_argument('--columns', nargs='+')
+	parser.add_argument('--by')
+	parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+	parser.add_argument('--jobs', type=int, default=1)
+	parser.add_argument('--latex', action='store_true')
+	args = parser.parse_args(argv)
+
+	panels = summarize(args.paths, args.columns, args.by, args.chunksize, args.jobs)
+	table = panel_table(panels) if args.by else summary_table(panels[ALL_OBSERVATIONS])
+	if args.latex:
+		print(to_latex(table))
+	else:
+		table.to_csv(sys.stdout, index=False)
+
+
+if __name__ == '__main__':
+	main()
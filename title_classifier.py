@@ -0,0 +1,161 @@
+import re
+import sys
+import argparse
+from functools import lru_cache
+
+import pandas as pd
+
+# Title pattern classifier for the "4. Title & Abstract" page.
+# Pattern names match the rows of `title_patterns_df` in acad1.py so results
+# can be joined back onto that table.
+
+TITLE_PATTERNS = [
+	'Question Format',
+	'Main Finding',
+	'Causal Relationship',
+	'Geographic Focus',
+	'Methodological Signal',
+	'Theoretical Framing',
+	'Dual-Part with Colon'
+]
+
+# Each rule is (compiled regex, weight). Regexes are case-insensitive except
+# where they need the title's case ("US" the country, not the word "us").
+_RULES = {
+	'Question Format': [
+		(re.compile(r'\?\s*$', re.IGNORECASE), 0.7),
+		(re.compile(r'^(?:does|do|did|is|are|was|were|can|could|should|will|why|how|what|when|who|which)\b', re.IGNORECASE), 0.4),
+	],
+	'Main Finding': [
+		(re.compile(r'^the\s+(?:declining|rising|growing|falling|increasing|decreasing|changing|persistent|missing|hidden|great)\b', re.IGNORECASE), 0.6),
+		(re.compile(r'\b(?:rise|decline|fall|growth|collapse|persistence|puzzle)\s+(?:of|in)\b', re.IGNORECASE), 0.4),
+		(re.compile(r'\b(?:reduces?|increases?|raises?|lowers?|matters?|explains?|drives?)\b', re.IGNORECASE), 0.3),
+	],
+	'Causal Relationship': [
+		(re.compile(r'\b(?:effects?|impacts?|consequences?|influence)\s+of\b.*\bon\b', re.IGNORECASE), 0.8),
+		(re.compile(r'\b(?:affects?|causes?|shapes?|determines?)\b', re.IGNORECASE), 0.5),
+		(re.compile(r'\b(?:effects?|impacts?|causal)\b', re.IGNORECASE), 0.3),
+	],
+	'Geographic Focus': [
+		(re.compile(r'\b(?:in|across|from)\s+(?:the\s+)?(?:developing|emerging|advanced|oecd|african|asian|european|latin|rural|urban)\b', re.IGNORECASE), 0.6),
+		(re.compile(r'\b(?:china|india|brazil|mexico|africa|europe|asia|united states|uk|germany|france|japan|kenya|indonesia|countries|regions?|counties|states)\b|(?<!\w)(?-i:U\.S\.|US)(?!\w)', re.IGNORECASE), 0.5),
+	],
+	'Methodological Signal': [
+		(re.compile(r'\b(?:regression discontinuity|difference[- ]in[- ]differences?|instrumental variables?|synthetic control|natural experiment|field experiment|randomi[sz]ed|structural estimation|event study|machine learning|bunching)\b', re.IGNORECASE), 0.8),
+		(re.compile(r'\b(?:evidence from|an? (?:\w+ )?(?:analysis|approach|estimator|test)|estimating|identification)\b', re.IGNORECASE), 0.4),
+	],
+	'Theoretical Framing': [
+		(re.compile(r'^(?:toward|towards)\b', re.IGNORECASE), 0.6),
+		(re.compile(r'\b(?:a theory of|theory|model of|equilibrium|optimal|welfare theorem|framework)\b', re.IGNORECASE), 0.5),
+	],
+	'Dual-Part with Colon': [
+		(re.compile(r'^[^:]{2,}:\s*\S', re.IGNORECASE), 0.9),
+	],
+}
+
+# Vague openers flagged in the caution box on the same page
+_BROAD_TITLE = re.compile(r'^(?:an?\s+(?:analysis|study|examination)\s+of|essays?\s+(?:on|in)|some\s+(?:notes|thoughts)\s+on)\b')
+_TOKEN = re.compile(r"[a-z][a-z'\-]*")
+
+
+# Function to compute token-level features used in ranking
+def title_features(title):
+	text = title.strip()
+	tokens = _TOKEN.findall(text.lower())
+	n_words = len(text.split())
+	return {
+		'words': n_words,
+		'chars': len(text),
+		'has_colon': ':' in text,
+		'is_question': text.endswith('?'),
+		'acronyms': sum(1 for w in text.split() if len(w) > 1 and w.isupper()),
+		'broad': bool(_BROAD_TITLE.match(text.lower())),
+		'unique_ratio': len(set(tokens)) / len(tokens) if tokens else 0.0,
+	}
+
+
+@lru_cache(maxsize=4096)
+def _scores(title):
+	out = []
+	for pattern in TITLE_PATTERNS:
+		score = 0.0
+		for regex, weight in _RULES[pattern]:
+			if regex.search(title):
+				score += weight
+		out.append(min(score, 1.0))
+	return tuple(out)
+
+
+# Function to score a title against every pattern (0-1 per pattern)
+def score_title(title):
+	return dict(zip(TITLE_PATTERNS, _scores(title.strip())))
+
+
+# Function to assign the best matching pattern to a title
+def classify_title(title, threshold=0.3):
+	scores = _scores(title.strip())
+	best = max(range(len(scores)), key=scores.__getitem__)
+	if scores[best] < threshold:
+		return None, scores[best]
+	return TITLE_PATTERNS[best], scores[best]
+
+
+# Function to classify a batch of titles at once
+def classify_titles(titles, threshold=0.3):
+	titles = list(titles)
+	rows = [_scores(t.strip()) for t in titles]
+	df = pd.DataFrame(rows, columns=TITLE_PATTERNS)
+	best = df.idxmax(axis=1)
+	confidence = df.max(axis=1)
+	df.insert(0, 'Title', titles)
+	df.insert(1, 'Pattern', best.where(confidence >= threshold, None))
+	df.insert(2, 'Confidence', confidence)
+	return df
+
+
+# Function to give a title an overall quality score following the page's
+# guidance: 10-15 words, clear pattern, no jargon or broad openers
+def quality_score(title):
+	feats = title_features(title)
+	_, confidence = classify_title(title, threshold=0.0)
+	words = feats['words']
+	if 10 <= words <= 15:
+		length_score = 1.0
+	elif words < 10:
+		length_score = max(0.0, 1.0 - (10 - words) * 0.12)
+	else:
+		length_score = max(0.0, 1.0 - (words - 15) * 0.1)
+	score = 0.45 * length_score + 0.4 * confidence + 0.15 * feats['unique_ratio']
+	score -= 0.1 * min(feats['acronyms'], 3)
+	if feats['broad']:
+		score -= 0.3
+	return max(0.0, min(1.0, score))
+
+
+# Function to rank alternative phrasings of the same title
+def rank_titles(alternatives):
+	alternatives = [t.strip() for t in alternatives if t and t.strip()]
+	df = classify_titles(alternatives)[['Title', 'Pattern', 'Confidence']]
+	df['Words'] = [len(t.split()) for t in alternatives]
+	df['Score'] = [quality_score(t) for t in alternatives]
+	return df.sort_values('Score', ascending=False, kind='stable').reset_index(drop=True)
+
+
+# Batch CLI: python title_classifier.py titles.txt [-o out.csv] [--rank]
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Classify paper titles into the title patterns of top economics journals.")
+	parser.add_argument('infile', nargs='?', default='-', help="File with one title per line ('-' for stdin)")
+	parser.add_argument('-o', '--output', help="Write CSV here instead of stdout")
+	parser.add_argument('--rank', action='store_true', help="Rank the titles as alternative phrasings")
+	args = parser.parse_args(argv)
+
+	stream = sys.stdin if args.infile == '-' else open(args.infile, encoding='utf-8')
+	with stream:
+		titles = [line.strip() for line in stream if line.strip()]
+
+	df = rank_titles(titles) if args.rank else classify_titles(titles)
+	df.to_csv(args.output or sys.stdout, index=False)
+
+
+if __name__ == '__main__':
+	main()
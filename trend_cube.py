@@ -0,0 +1,253 @@
+import os
+import hashlib
+from collections import namedtuple
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+try:
+	import pyarrow.feather as _feather
+except ImportError:
+	_feather = None
+
+from out_of_core import iter_chunks, prefetch, DEFAULT_CHUNKSIZE
+from journal_fit import JEL_AREAS
+
+# Research-trend explorer for "Trends in Economics Research" in "1. Finding
+# Research Ideas". A publication-metadata dump (CSV or Parquet, one row per
+# paper with its year, JEL codes and citation count) is streamed once in
+# chunks and reduced to a cube with one row per research area and year:
+# papers, total citations and the sum of the papers' citation percentiles
+# (each paper ranked among all papers of its year, so old papers do not
+# dominate). Areas are JEL fields (E), categories (E5) or codes (E52); a
+# paper with several codes in an area counts once there.
+#
+# Cubes are stored as Feather files in ~/.cache/acad_trends (or
+# ACAD_TREND_CACHE), keyed on the dump's path, size and modification time,
+# so they are built once. Every plot is drawn from the cube: growth is the
+# log-linear trend of an area's paper count over the chosen years, impact
+# its mean citation percentile. Seaborn draws small scatters; larger ones
+# fall back to a plain scatter and then to a hexbin density.
+
+CACHE_DIR = os.environ.get('ACAD_TREND_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'acad_trends'))
+
+# Characters of the JEL code that define an area at each level
+LEVELS = {'Field': 1, 'Category': 2, 'Code': 3}
+
+ALL_AREAS = 'All'
+
+CUBE_COLUMNS = ['Area', 'Year', 'Papers', 'Citations', 'Percentile Sum']
+
+# Most points drawn with seaborn (with a legend / without), then hexbin
+HUE_LIMIT = 20
+SCATTER_LIMIT = 2000
+
+TrendCube = namedtuple('TrendCube', ['level', 'table', 'path', 'papers'])
+
+_MEMO = {}
+
+
+def _cube_path(source, level, columns):
+	stat = os.stat(source)
+	key = f'{os.path.abspath(source)}|{stat.st_size}|{stat.st_mtime_ns}|{level}|{"|".join(columns)}'
+	return os.path.join(CACHE_DIR, f'{hashlib.sha1(key.encode()).hexdigest()[:16]}.feather')
+
+
+def _chunk_areas(chunk, year_column, jel_column, citation_column, width):
+	chunk = chunk.dropna(subset=[year_column])
+	years = chunk[year_column].to_numpy(dtype=np.int64)
+	citations = np.maximum(pd.to_numeric(chunk[citation_column], errors='coerce').fillna(0).to_numpy(), 0).astype(np.int64)
+	codes = chunk[jel_column].fillna('').astype(str).str.upper().str.findall(r'\b[A-Z]\d{0,2}\b')
+	exploded = codes.explode().dropna()
+	exploded = exploded[exploded.str.len() >= width]
+	rows = pd.DataFrame({'paper': chunk.index.get_indexer(exploded.index), 'Area': exploded.str[:width].to_numpy()})
+	rows = rows.drop_duplicates()
+	areas = pd.DataFrame({'Area': rows['Area'].to_numpy(), 'Year': years[rows['paper']],
+						  'Cited': citations[rows['paper']]})
+	papers = pd.DataFrame({'Year': years, 'Cited': citations})
+	return (areas.value_counts().rename('Papers').reset_index(), papers.value_counts().rename('Papers').reset_index())
+
+
+# Function to build the area x year cube of a publication dump in one
+# streaming pass. Citation percentiles are exact mid-ranks within each year.
+def build_cube(source, level='Category', year_column='Year', jel_column='JEL Codes', citation_column='Citations',
+			   chunksize=DEFAULT_CHUNKSIZE):
+	if level not in LEVELS:
+		raise ValueError(f"Unknown level {level!r}; choose from {list(LEVELS)}")
+	width = LEVELS[level]
+	area_parts, paper_parts = [], []
+	with closing(prefetch(iter_chunks(source, [year_column, jel_column, citation_column], chunksize))) as chunks:
+		for chunk in chunks:
+			areas, papers = _chunk_areas(chunk.reset_index(drop=True), year_column, jel_column, citation_column, width)
+			area_parts.append(areas)
+			paper_parts.append(papers)
+	if not paper_parts:
+		raise ValueError("The file has no rows")
+
+	# Per (year, citations) counts of papers, then mid-rank percentiles
+	papers = pd.concat(paper_parts).groupby(['Year', 'Cited'], as_index=False)['Papers'].sum()
+	papers = papers.sort_values(['Year', 'Cited'], kind='stable')
+	total = papers.groupby('Year')['Papers'].transform('sum')
+	below = papers.groupby('Year')['Papers'].cumsum() - papers['Papers']
+	papers['Percentile'] = 100.0 * (below + 0.5 * papers['Papers']) / total
+
+	areas = pd.concat(area_parts).groupby(['Area', 'Year', 'Cited'], as_index=False)['Papers'].sum()
+	areas = areas.merge(papers[['Year', 'Cited', 'Percentile']], on=['Year', 'Cited'], how='left')
+	everything = papers.assign(Area=ALL_AREAS)
+	cells = pd.concat([areas, everything[['Area', 'Year', 'Cited', 'Papers', 'Percentile']]], ignore_index=True)
+	cells['Citations'] = cells['Cited'] * cells['Papers']
+	cells['Percentile Sum'] = cells['Percentile'] * cells['Papers']
+	return cells.groupby(['Area', 'Year'], as_index=False)[['Papers', 'Citations', 'Percentile Sum']].sum()[CUBE_COLUMNS]
+
+
+# Function to load the cube of a dump: per-process memo, then the Feather
+# cache, and only on first use a pass over the dump
+def load_cube(source, level='Category', year_column='Year', jel_column='JEL Codes', citation_column='Citations'):
+	columns = [year_column, jel_column, citation_column]
+	path = _cube_path(source, level, columns)
+	if path not in _MEMO:
+		if os.path.exists(path):
+			table = _feather.read_feather(path) if _feather is not None else pd.read_pickle(path)
+		else:
+			table = build_cube(source, level, year_column, jel_column, citation_column)
+			try:
+				os.makedirs(CACHE_DIR, exist_ok=True)
+				temporary = f'{path}.{os.getpid()}.tmp'
+				if _feather is not None:
+					_feather.write_feather(table, temporary, compression='uncompressed')
+				else:
+					table.to_pickle(temporary)
+				os.replace(temporary, path)
+			except OSError:
+				# Read-only cache location: keep the cube for this process
+				pass
+		_MEMO[path] = table
+	table = _MEMO[path]
+	return TrendCube(level, table, path, int(table.loc[table['Area'] == ALL_AREAS, 'Papers'].sum()))
+
+
+# Function to label an area with its JEL field name
+def area_label(area):
+	field = JEL_AREAS.get(area[:1], '')
+	return f'{area} - {field}' if len(area) == 1 and field else area
+
+
+def _log_trend(counts, years):
+	# Slope of log(1 + papers) on year for every row of counts, as a yearly
+	# growth rate in percent
+	centered = years - years.mean()
+	denominator = (centered ** 2).sum()
+	if denominator == 0:
+		return np.full(len(counts), np.nan)
+	slope = np.log1p(counts) @ centered / denominator
+	return 100.0 * np.expm1(slope)
+
+
+# Function to summarize a cube over years start..end: papers, share of all
+# papers, yearly growth and mean citation percentile per area, and the
+# percentile ranks of publication volume and growth among areas
+def trend_summary(cube, start=None, end=None):
+	table = cube.table
+	start = table['Year'].min() if start is None else start
+	end = table['Year'].max() if end is None else end
+	window = table[(table['Year'] >= start) & (table['Year'] <= end)]
+	total = window.loc[window['Area'] == ALL_AREAS, 'Papers'].sum()
+	window = window[window['Area'] != ALL_AREAS]
+	if window.empty:
+		return pd.DataFrame(columns=['Area', 'Label', 'Papers', 'Share (%)', 'Annual Growth (%)', 'Citation Percentile',
+									 'Mean Citations', 'Publication Percentile', 'Growth Percentile'])
+
+	years = np.arange(start, end + 1)
+	counts = window.pivot_table(index='Area', columns='Year', values='Papers', aggfunc='sum', fill_value=0)
+	counts = counts.reindex(columns=years, fill_value=0)
+	sums = window.groupby('Area')[['Papers', 'Citations', 'Percentile Sum']].sum().reindex(counts.index)
+
+	summary = pd.DataFrame({
+		'Area': counts.index,
+		'Label': [area_label(area) for area in counts.index],
+		'Papers': sums['Papers'].to_numpy(),
+		'Share (%)': 100.0 * sums['Papers'].to_numpy() / max(total, 1),
+		'Annual Growth (%)': _log_trend(counts.to_numpy(dtype=float), years.astype(float)),
+		'Citation Percentile': (sums['Percentile Sum'] / sums['Papers']).to_numpy(),
+		'Mean Citations': (sums['Citations'] / sums['Papers']).to_numpy(),
+	})
+	summary['Publication Percentile'] = 100.0 * summary['Papers'].rank(pct=True)
+	summary['Growth Percentile'] = 100.0 * summary['Annual Growth (%)'].rank(pct=True)
+	return summary.sort_values('Papers', ascending=False).reset_index(drop=True)
+
+
+# Function to return one point per area and year: the year-on-year growth
+# of its paper count and the mean citation percentile of that year's papers.
+# Years an area has no papers count as zero, so growth is always measured
+# against the previous calendar year (and is undefined after an empty year).
+def yearly_points(cube, start=None, end=None):
+	table = cube.table[cube.table['Area'] != ALL_AREAS]
+	years = range(int(table['Year'].min()), int(table['Year'].max()) + 1) if len(table) else []
+	grid = pd.MultiIndex.from_product([table['Area'].unique(), years], names=['Area', 'Year'])
+	table = table.set_index(['Area', 'Year'])[['Papers', 'Percentile Sum']].reindex(grid, fill_value=0)
+	table = table.sort_index().reset_index()
+	previous = table.groupby('Area')['Papers'].shift().replace(0, np.nan)
+	points = pd.DataFrame({
+		'Area': table['Area'].to_numpy(),
+		'Year': table['Year'].to_numpy(),
+		'Papers': table['Papers'].to_numpy(),
+		'Annual Growth (%)': (100.0 * (table['Papers'] / previous - 1)).to_numpy(),
+		'Citation Percentile': (table['Percentile Sum'] / table['Papers'].replace(0, np.nan)).to_numpy(),
+	})
+	if start is not None:
+		points = points[points['Year'] >= start]
+	if end is not None:
+		points = points[points['Year'] <= end]
+	return points.dropna().reset_index(drop=True)
+
+
+# Function to plot growth against citation percentile. Up to HUE_LIMIT
+# points get a seaborn scatter with a legend, up to SCATTER_LIMIT a seaborn
+# scatter sized by papers with the largest areas labelled, and beyond that
+# a hexbin of paper counts.
+def plot_trends(points, x='Annual Growth (%)', y='Citation Percentile', title='Growth and Impact of Research Areas'):
+	fig, ax = plt.subplots(figsize=(10, 6))
+	points = points.dropna(subset=[x, y])
+	if len(points) <= HUE_LIMIT:
+		sns.scatterplot(data=points, x=x, y=y, size='Papers', sizes=(60, 600), hue='Label' if 'Label' in points else 'Area',
+						ax=ax, legend='brief')
+		ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize='small')
+	elif len(points) <= SCATTER_LIMIT:
+		sns.scatterplot(data=points, x=x, y=y, size='Papers', sizes=(10, 300), color='steelblue', alpha=0.6,
+						ax=ax, legend=False)
+		for _, row in points.nlargest(10, 'Papers').iterrows():
+			ax.annotate(row['Area'], (row[x], row[y]), fontsize=8, xytext=(3, 3), textcoords='offset points')
+	else:
+		binned = ax.hexbin(points[x], points[y], C=points['Papers'], reduce_C_function=np.sum, gridsize=40,
+						   cmap='viridis', mincnt=1, bins='log')
+		fig.colorbar(binned, ax=ax, label='Papers')
+	ax.axhline(50, color='gray', linestyle='--', alpha=0.6)
+	ax.axvline(0, color='gray', linestyle='--', alpha=0.6)
+	ax.set_xlabel(x)
+	ax.set_ylabel(y)
+	ax.set_title(title)
+	fig.tight_layout()
+	return fig
+
+
+# Function to plot the yearly paper counts of selected areas
+def plot_area_series(cube, areas, start=None, end=None):
+	table = cube.table[cube.table['Area'].isin(list(areas))]
+	if start is not None:
+		table = table[table['Year'] >= start]
+	if end is not None:
+		table = table[table['Year'] <= end]
+	fig, ax = plt.subplots(figsize=(10, 5))
+	for area, rows in table.groupby('Area'):
+		ax.plot(rows['Year'], rows['Papers'], marker='o', label=area_label(area))
+	ax.set_xlabel('Year')
+	ax.set_ylabel('Papers')
+	ax.set_title('Papers per Year')
+	ax.grid(linestyle='--', alpha=0.7)
+	if len(areas):
+		ax.legend(fontsize='small')
+	fig.tight_layout()
+	return fig
@@ -0,0 +1,327 @@
+import os
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import sqlite3
+import threading
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Per-user workspace store so that work typed into the app (drafts, idea
+# lists, checklists, bibliographies, project plans) survives a refresh. A
+# workspace is a name chosen in the sidebar; each stores JSON values under
+# (kind, name) keys, e.g. ('plan', 'My Paper') or ('draft', 'title').
+#
+# The store is one SQLite database in WAL mode, so readers never wait for
+# the writer and the writer never waits for readers:
+#
+# - reads borrow a connection from a small pool (connections are reused
+#   across reruns and sessions instead of opened per call);
+# - writes never touch the database on the caller's thread. put() records
+#   the value in a pending map (a later value for the same key replaces an
+#   earlier one) and returns; one writer thread per database waits
+#   DEBOUNCE_SECONDS after the first pending write, then commits everything
+#   pending in a single transaction on its own connection.
+#
+# The writer remembers the values it committed and skips writing them
+# again. That memory is only a hint: SQLite's data_version on the writer's
+# connection changes whenever another connection (another process sharing
+# the file) commits, and the writer then forgets everything it remembered.
+# A rerun that re-puts unchanged values therefore costs a dictionary lookup
+# and, at most, one PRAGMA, never a write.
+#
+# Reads see pending values and the batch being committed, so a session
+# always reads its own writes. Pending writes are flushed at exit; flush()
+# forces them out earlier.
+#
+# The database lives at ~/.acad_workspace/workspace.sqlite3 (or
+# ACAD_WORKSPACE_DB).
+
+DATABASE_PATH = os.environ.get('ACAD_WORKSPACE_DB', os.path.join(os.path.expanduser('~'), '.acad_workspace',
+																	 'workspace.sqlite3'))
+
+DEFAULT_WORKSPACE = 'default'
+
+# Kinds of values the app stores
+KINDS = ['draft', 'ideas', 'checklist', 'bibliography', 'plan']
+
+DEBOUNCE_SECONDS = 0.5
+
+POOL_SIZE = 8
+
+BUSY_TIMEOUT_MS = 10_000
+
+# Most keys whose stored value is remembered to skip unchanged puts
+WRITTEN_LIMIT = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+	workspace TEXT NOT NULL,
+	kind TEXT NOT NULL,
+	name TEXT NOT NULL,
+	value TEXT NOT NULL,
+	updated REAL NOT NULL,
+	PRIMARY KEY (workspace, kind, name)
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO items (workspace, kind, name, value, updated) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (workspace, kind, name) DO UPDATE SET value = excluded.value, updated = excluded.updated
+"""
+
+# A database: its path, the pool of idle reader connections, the pending
+# writes ({key: JSON text or None for a delete}), the batch being committed
+# (same form), the values this process committed per key (least recently
+# used first, at most WRITTEN_LIMIT keys), the lock guarding the three maps,
+# the lock held while a batch is committed, the writer's wake-up event, the
+# writer's connection and the data_version the remembered values belong to
+# (a one-element list)
+Store = namedtuple('Store', ['path', 'pool', 'pending', 'inflight', 'written', 'lock', 'commit_lock', 'wake',
+							 'writer', 'version'])
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+_DELETED = None
+
+# Marks a key whose stored value is not known
+_UNKNOWN = object()
+
+_LOG = logging.getLogger(__name__)
+
+
+def _connect(path):
+	connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False, isolation_level=None)
+	connection.execute('PRAGMA synchronous=NORMAL')
+	connection.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+	return connection
+
+
+# Function to return the store of a database, creating the file, the
+# schema and the writer thread on first use
+def open_store(path=None):
+	path = os.path.abspath(path or DATABASE_PATH)
+	with _STORES_LOCK:
+		if path not in _STORES:
+			os.makedirs(os.path.dirname(path), exist_ok=True)
+			connection = _connect(path)
+			# WAL mode is a property of the file, set once
+			connection.execute('PRAGMA journal_mode=WAL')
+			connection.execute(_SCHEMA)
+			store = Store(path, queue.LifoQueue(), {}, {}, OrderedDict(), threading.Lock(), threading.Lock(),
+						  threading.Event(), _connect(path), [None])
+			store.pool.put(connection)
+			threading.Thread(target=_writer, args=(store,), daemon=True, name='workspace-writer').start()
+			_STORES[path] = store
+		return _STORES[path]
+
+
+@contextmanager
+def _borrow(store):
+	# A pooled connection; new ones are opened when all are busy and only
+	# up to POOL_SIZE are kept idle
+	try:
+		connection = store.pool.get_nowait()
+	except queue.Empty:
+		connection = _connect(store.path)
+	try:
+		yield connection
+	finally:
+		if store.pool.qsize() < POOL_SIZE:
+			store.pool.put(connection)
+		else:
+			connection.close()
+
+
+def _commit(store, batch):
+	# Runs under store.commit_lock, on the writer's own connection
+	now = time.time()
+	connection = store.writer
+	connection.execute('BEGIN IMMEDIATE')
+	try:
+		connection.executemany(_UPSERT, [(*key, value, now) for key, value in batch.items() if value is not _DELETED])
+		connection.executemany('DELETE FROM items WHERE workspace = ? AND kind = ? AND name = ?',
+							   [key for key, value in batch.items() if value is _DELETED])
+		connection.execute('COMMIT')
+	except BaseException:
+		connection.execute('ROLLBACK')
+		raise
+
+
+def _commit_pending(store):
+	# Commit everything pending as one batch. The batch stays readable in
+	# store.inflight until COMMIT returns; on failure it is put back into
+	# pending unless newer values arrived meanwhile. Batches are committed
+	# one at a time, so a later value never lands before an earlier one.
+	# Values this process already committed are skipped, unless another
+	# connection has committed since (data_version changed).
+	with store.commit_lock:
+		with store.lock:
+			batch = dict(store.pending)
+			store.inflight.update(batch)
+			store.pending.clear()
+			store.wake.clear()
+		if not batch:
+			return
+		try:
+			version = store.writer.execute('PRAGMA data_version').fetchone()[0]
+			with store.lock:
+				if version != store.version[0]:
+					store.written.clear()
+					store.version[0] = version
+				changes = {key: value for key, value in batch.items() if store.written.get(key, _UNKNOWN) != value}
+			if changes:
+				_commit(store, changes)
+			with store.lock:
+				for key, value in changes.items():
+					_remember(store, key, value)
+		except BaseException:
+			with store.lock:
+				for key, value in batch.items():
+					store.pending.setdefault(key, value)
+				store.wake.set()
+			raise
+		finally:
+			with store.lock:
+				store.inflight.clear()
+
+
+def _writer(store):
+	while True:
+		store.wake.wait()
+		time.sleep(DEBOUNCE_SECONDS)
+		try:
+			_commit_pending(store)
+		except Exception:
+			# Keep the thread alive: the batch is pending again and is
+			# retried after the next wait
+			_LOG.exception('Could not write workspace changes to %s', store.path)
+			time.sleep(DEBOUNCE_SECONDS)
+
+
+# Function to write all pending values now (the writer thread does this on
+# its own after DEBOUNCE_SECONDS)
+def flush(path=None):
+	_commit_pending(open_store(path))
+
+
+def _remember(store, key, text):
+	# Record a value this process committed (caller holds store.lock)
+	store.written[key] = text
+	store.written.move_to_end(key)
+	if len(store.written) > WRITTEN_LIMIT:
+		store.written.popitem(last=False)
+
+
+def _unsaved(store):
+	# Values not yet in the database: the batch being committed overlaid
+	# with pending writes (caller holds store.lock)
+	return {**store.inflight, **store.pending}
+
+
+@atexit.register
+def _flush_all():
+	for path in list(_STORES):
+		try:
+			flush(path)
+		except Exception:
+			_LOG.exception('Could not write workspace changes to %s', path)
+
+
+# Function to store a JSON-serializable value; returns at once, the write
+# is batched by the writer thread (which skips values it already stored)
+def put(workspace, kind, name, value, path=None):
+	store = open_store(path)
+	key = (workspace, kind, name)
+	text = json.dumps(value, sort_keys=True, default=str)
+	with store.lock:
+		if store.pending.get(key, store.inflight.get(key, _UNKNOWN)) == text:
+			return
+		store.pending[key] = text
+		store.wake.set()
+
+
+# Function to delete a value (batched like put)
+def delete(workspace, kind, name, path=None):
+	store = open_store(path)
+	key = (workspace, kind, name)
+	with store.lock:
+		store.pending[key] = _DELETED
+		store.wake.set()
+
+
+# Function to read a value (pending writes included); default when missing
+def get(workspace, kind, name, default=None, path=None):
+	store = open_store(path)
+	key = (workspace, kind, name)
+	with store.lock:
+		for unsaved in (store.pending, store.inflight):
+			if key in unsaved:
+				text = unsaved[key]
+				return default if text is _DELETED else json.loads(text)
+	with _borrow(store) as connection:
+		row = connection.execute('SELECT value FROM items WHERE workspace = ? AND kind = ? AND name = ?', key).fetchone()
+	if row is None:
+		return default
+	return json.loads(row[0])
+
+
+# Function to read every value of one kind in a workspace as {name: value}
+# (unsaved values are taken before the query, so a batch committed during
+# it is seen either in the database or in that snapshot)
+def get_all(workspace, kind, path=None):
+	store = open_store(path)
+	with store.lock:
+		unsaved = _unsaved(store)
+	with _borrow(store) as connection:
+		rows = connection.execute('SELECT name, value FROM items WHERE workspace = ? AND kind = ?',
+								  (workspace, kind)).fetchall()
+	values = {name: json.loads(text) for name, text in rows}
+	for (unsaved_workspace, unsaved_kind, name), text in unsaved.items():
+		if unsaved_workspace == workspace and unsaved_kind == kind:
+			if text is _DELETED:
+				values.pop(name, None)
+			else:
+				values[name] = json.loads(text)
+	return values
+
+
+# Function to list the names stored under one kind in a workspace
+def names(workspace, kind, path=None):
+	return sorted(get_all(workspace, kind, path))
+
+
+# Function to make up a workspace name for a new session, so users do not
+# share one by default
+def new_workspace_name():
+	return f'workspace-{uuid.uuid4().hex[:12]}'
+
+
+# Function to list the workspaces that hold any value
+def workspaces(path=None):
+	store = open_store(path)
+	with store.lock:
+		unsaved = _unsaved(store)
+	with _borrow(store) as connection:
+		stored = {row[0] for row in connection.execute('SELECT DISTINCT workspace FROM items')}
+	stored |= {key[0] for key, text in unsaved.items() if text is not _DELETED}
+	return sorted(stored)
+
+
+# Function to store a DataFrame (as split-oriented records)
+def put_frame(workspace, kind, name, frame, path=None):
+	put(workspace, kind, name, json.loads(frame.to_json(orient='split', index=False)), path)
+
+
+# Function to read a DataFrame stored with put_frame (default when missing)
+def get_frame(workspace, kind, name, default=None, path=None):
+	value = get(workspace, kind, name, None, path)
+	if value is None:
+		return default
+	return pd.DataFrame(value['data'], columns=value['columns'])